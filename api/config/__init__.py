@@ -1,3 +1,6 @@
 from .settings import settings
 from .celery_config import celery
-from .database import get_mongo_collection
+from .database import (
+    get_async_mongo_collection, get_async_mongo_client, close_mongo_client, get_pool_stats,
+)
+from .redis_client import get_async_redis_client, close_async_redis_client
@@ -1,8 +1,56 @@
-from pymongo import MongoClient
+import threading
+
+from typing import Optional
+from motor.motor_asyncio import AsyncIOMotorClient
+from shared.mongo_pool import PoolStatsListener
 from config.settings import settings
 
 
-def get_mongo_collection(collection_name: str):
-    client = MongoClient(settings.database_url)
-    db = client[settings.MONGO_INITDB_ROOT_DBNAME]
+pool_stats = PoolStatsListener()
+
+_async_client: Optional[AsyncIOMotorClient] = None
+_client_lock = threading.Lock()
+
+
+def _client_options() -> dict:
+    return dict(
+        maxPoolSize=settings.MONGO_MAX_POOL_SIZE,
+        minPoolSize=settings.MONGO_MIN_POOL_SIZE,
+        maxIdleTimeMS=settings.MONGO_MAX_IDLE_TIME_MS,
+        waitQueueTimeoutMS=settings.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        connectTimeoutMS=settings.MONGO_CONNECT_TIMEOUT_MS,
+        socketTimeoutMS=settings.MONGO_SOCKET_TIMEOUT_MS,
+        serverSelectionTimeoutMS=settings.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        event_listeners=[pool_stats],
+    )
+
+
+def get_async_mongo_client() -> AsyncIOMotorClient:
+    """Cliente Motor do processo, usado pelos handlers async sem ocupar o threadpool."""
+    global _async_client
+    if _async_client is None:
+        with _client_lock:
+            if _async_client is None:
+                _async_client = AsyncIOMotorClient(settings.database_url, **_client_options())
+    return _async_client
+
+
+def close_mongo_client() -> None:
+    global _async_client
+    with _client_lock:
+        if _async_client is not None:
+            _async_client.close()
+            _async_client = None
+
+
+def get_pool_stats() -> dict:
+    return {
+        **pool_stats.stats(),
+        "max_pool_size": settings.MONGO_MAX_POOL_SIZE,
+        "min_pool_size": settings.MONGO_MIN_POOL_SIZE,
+    }
+
+
+def get_async_mongo_collection(collection_name: str):
+    db = get_async_mongo_client()[settings.MONGO_INITDB_ROOT_DBNAME]
     return db.get_collection(collection_name)
@@ -0,0 +1,20 @@
+import redis.asyncio as redis
+
+from typing import Optional
+from config.celery_config import broker_url
+
+_redis_client: Optional[redis.Redis] = None
+
+
+def get_async_redis_client() -> redis.Redis:
+    global _redis_client
+    if _redis_client is None:
+        _redis_client = redis.Redis.from_url(broker_url, decode_responses=True)
+    return _redis_client
+
+
+async def close_async_redis_client() -> None:
+    global _redis_client
+    if _redis_client is not None:
+        await _redis_client.aclose()
+        _redis_client = None
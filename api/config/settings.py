@@ -1,4 +1,7 @@
+import os
+
 from pathlib import Path
+from typing import Optional
 from pydantic_settings import BaseSettings
 
 BASE_DIR = Path(__file__).parent.parent.parent.resolve()
@@ -16,6 +19,34 @@ class Settings(BaseSettings):
     MONGO_INITDB_ROOT_DBNAME: str
     MONGO_INITDB_ROOT_USERNAME: str
     MONGO_INITDB_ROOT_PASSWORD: str
+    VECTOR_INDEX_DIR: Optional[str] = None
+    EMBED_QUERY_TIMEOUT: float = 30.0
+    IVF_NPROBE: int = 16
+    PROGRESS_HEARTBEAT_SECONDS: float = 15.0
+    LOGS_COUNT_LIMIT: int = 10_000
+    LOGS_EXPORT_BATCH_SIZE: int = 500
+    BLOB_STORE_DIR: Optional[str] = None
+    BLOB_REFERENCE_TTL_SECONDS: int = 7 * 24 * 3600
+    BLOB_DELETE_TIMEOUT_SECONDS: int = 60
+    UPLOAD_CHUNK_SIZE: int = 1024 * 1024
+    UPLOAD_MAX_FILE_BYTES: int = 20 * 1024 * 1024
+    UPLOAD_MAX_REQUEST_BYTES: int = 100 * 1024 * 1024
+    UPLOAD_MAX_FILES: int = 50
+    MONGO_MAX_POOL_SIZE: int = 50
+    MONGO_MIN_POOL_SIZE: int = 0
+    MONGO_MAX_IDLE_TIME_MS: int = 60_000
+    MONGO_WAIT_QUEUE_TIMEOUT_MS: int = 5_000
+    MONGO_CONNECT_TIMEOUT_MS: int = 5_000
+    MONGO_SOCKET_TIMEOUT_MS: int = 30_000
+    MONGO_SERVER_SELECTION_TIMEOUT_MS: int = 5_000
+
+    @property
+    def blob_store_dir(self) -> str:
+        return self.BLOB_STORE_DIR or os.path.join(self.STORAGE, "blobs")
+
+    @property
+    def vector_index_dir(self) -> str:
+        return self.VECTOR_INDEX_DIR or os.path.join(self.STORAGE, "vector_index")
 
     @property
     def database_url(self) -> str:
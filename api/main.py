@@ -1,13 +1,29 @@
 import uvicorn
 
-from fastapi import FastAPI
-from routers import analyzer, logs
+from http import HTTPStatus
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from contextlib import asynccontextmanager
+from repositories import LogRepositoryMotor
+from config import settings, get_async_mongo_client, close_mongo_client, get_pool_stats, close_async_redis_client
+from config import get_async_mongo_collection
+from routers import analyzer, candidates, logs, progress
 from fastapi.security import HTTPBasic
 from fastapi.middleware.cors import CORSMiddleware
 
 
 security = HTTPBasic()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    get_async_mongo_client()
+    await LogRepositoryMotor(get_async_mongo_collection('logs')).ensure_indexes()
+    yield
+    close_mongo_client()
+    await close_async_redis_client()
+
+
 app = FastAPI(
     title='ANALISADOR DE CURRÍCULOS',
     description=(
@@ -16,10 +32,13 @@ app = FastAPI(
         "extrair resumos detalhados e identificar o candidato mais adequado a partir de critérios fornecidos."
     ),
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 app.include_router(analyzer, prefix='/api/v1', tags=['analyzer'])
 app.include_router(logs, prefix='/api/v1', tags=['logs'])
+app.include_router(candidates, prefix='/api/v1', tags=['candidates'])
+app.include_router(progress, prefix='/api/v1', tags=['progress'])
 
 app.add_middleware(
     CORSMiddleware,
@@ -30,9 +49,27 @@ app.add_middleware(
 )
 
 
+@app.middleware("http")
+async def reject_oversized_requests(request: Request, call_next):
+    # Recusa pelo Content-Length antes de o corpo multipart ser lido; a folga de um bloco
+    # cobre os cabeçalhos e campos do formulário. O limite exato é aplicado na gravação.
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and \
+            int(content_length) > settings.UPLOAD_MAX_REQUEST_BYTES + settings.UPLOAD_CHUNK_SIZE:
+        return JSONResponse(
+            status_code=HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+            content={"detail": f"A requisição excede o limite de {settings.UPLOAD_MAX_REQUEST_BYTES} bytes"})
+    return await call_next(request)
+
+
 @app.get("/health")
 async def health_check():
     return {"status": "ok"}
 
+
+@app.get("/health/database")
+async def database_pool_stats():
+    return get_pool_stats()
+
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -1,7 +1,7 @@
 from bson import ObjectId
 from datetime import datetime
-from typing import Annotated, Optional
-from schemas import AnalysisOutputSchema, Status
+from typing import Annotated, List, Optional
+from schemas import AnalysisOutputSchema, CacheStatsSchema, FileResultSchema, Status
 from pydantic import BaseModel, Field, BeforeValidator
 
 
@@ -17,6 +17,8 @@ class LogModel(BaseModel):
     status: Status
     result: Optional[AnalysisOutputSchema] = None
     feedback: Optional[bool] = None
+    summary_cache: Optional[CacheStatsSchema] = None
+    partial_results: List[FileResultSchema] = []
 
     class Config:
         populate_by_name = True
@@ -1,2 +1,5 @@
-from .logs_repository_mongo import *
+from .logs_repository_motor import *
+from .blob_repository_motor import *
 from .base_repository import *
+from .log_query import *
+from .candidate_vector_repository import *
@@ -0,0 +1,59 @@
+import anyio
+
+from typing import List
+from pymongo.errors import DuplicateKeyError
+from datetime import datetime, timedelta, timezone
+
+# Intervalo entre tentativas de registrar um blob que o GC está removendo.
+TOUCH_RETRY_INTERVAL = 0.05
+
+
+class BlobRepositoryMotor:
+    """
+    Referências dos blobs na coleção `blobs`, compartilhada com o GC dos workers: cada documento
+    guarda os logs que ainda precisam do arquivo e quando ele foi tocado pela última vez.
+    """
+
+    def __init__(self, collection, reference_ttl_seconds: int, delete_timeout_seconds: int):
+        self.collection = collection
+        self.reference_ttl = timedelta(seconds=reference_ttl_seconds)
+        self.delete_timeout = timedelta(seconds=delete_timeout_seconds)
+
+    async def touch(self, file_hash: str, size: int, content_type: str) -> None:
+        """
+        Registra o blob antes de movê-lo para o lugar definitivo, adiando o GC.
+
+        Documentos com `deleting_at` estão com o arquivo sendo apagado pelo GC e não são
+        reaproveitados: o upsert falha com chave duplicada até o GC remover o documento (ou a
+        marca ficar mais velha que BLOB_DELETE_TIMEOUT_SECONDS), e o arquivo é gravado depois.
+        """
+        while True:
+            now = datetime.now(timezone.utc)
+            try:
+                await self.collection.update_one(
+                    {"_id": file_hash, "$or": [
+                        {"deleting_at": {"$exists": False}},
+                        {"deleting_at": {"$lt": now - self.delete_timeout}},
+                    ]},
+                    {
+                        "$set": {"updated_at": now},
+                        # Referências expiradas tornariam o blob coletável antes de add_references.
+                        "$max": {"expires_at": now + self.reference_ttl},
+                        "$unset": {"deleting_at": ""},
+                        "$setOnInsert": {"refs": [], "size": size, "content_type": content_type, "created_at": now},
+                    },
+                    upsert=True,
+                )
+                return
+            except DuplicateKeyError:
+                await anyio.sleep(TOUCH_RETRY_INTERVAL)
+
+    async def add_references(self, file_hashes: List[str], log_id: str) -> None:
+        now = datetime.now(timezone.utc)
+        await self.collection.update_many(
+            {"_id": {"$in": list(set(file_hashes))}},
+            {
+                "$addToSet": {"refs": log_id},
+                "$set": {"updated_at": now, "expires_at": now + self.reference_ttl},
+            },
+        )
@@ -0,0 +1,123 @@
+import os
+import re
+import json
+import threading
+import numpy as np
+
+from config import settings
+from typing import Dict, List, Optional, Tuple
+from shared.similarity import select_top_k
+from shared.ivf_index import IVFIndex, IVFLists, ivf_search
+
+
+class CandidateVectorRepository:
+    """
+    Leitura do índice vetorial de currículos gravado pelos workers.
+
+    Os vetores e os offsets dos metadados são abertos via mmap, então carregar o índice
+    não lê nada do disco além do header; só os metadados dos top-k são lidos por busca.
+    """
+
+    HEADER = "header.json"
+    VECTORS = "vectors.f32"
+    METADATA = "metadata.jsonl"
+    OFFSETS = "metadata.idx"
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._count = 0
+        self._header: dict = {}
+        self._vectors: Optional[np.ndarray] = None
+        self._offsets: Optional[np.ndarray] = None
+        self._ivf = IVFIndex(path)
+        self._ivf_key: Optional[tuple] = None
+        self._ivf_lists: Optional[Tuple[dict, IVFLists]] = None
+        self._lock = threading.Lock()
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def _refresh(self) -> dict:
+        try:
+            with open(self._file(self.HEADER)) as f:
+                header = json.load(f)
+        except FileNotFoundError:
+            return {"count": 0}
+
+        with self._lock:
+            if header["count"] != self._count:
+                self._vectors = np.memmap(self._file(self.VECTORS), dtype=np.float32, mode="r",
+                                          shape=(header["count"], header["dim"]))
+                self._offsets = np.memmap(self._file(self.OFFSETS), dtype=np.uint64, mode="r",
+                                          shape=(header["count"],))
+                self._count = header["count"]
+            self._header = header
+        return header
+
+    @property
+    def total(self) -> int:
+        return self._refresh()["count"]
+
+    def _read_metadata(self, rows: List[int]) -> List[dict]:
+        metadata = []
+        end_of_file = self._header["metadata_bytes"]
+        with open(self._file(self.METADATA), "rb") as f:
+            for row in rows:
+                start = int(self._offsets[row])
+                end = int(self._offsets[row + 1]) if row + 1 < self._count else end_of_file
+                f.seek(start)
+                metadata.append(json.loads(f.read(end - start)))
+        return metadata
+
+    def _load_ivf(self) -> Optional[Tuple[dict, IVFLists]]:
+        """Listas da geração IVF atual, reabertas só quando a geração ou a contagem mudam."""
+        meta = self._ivf.read_meta()
+        if not meta:
+            return None
+
+        with self._lock:
+            key = (meta["generation"], self._count)
+            if key != self._ivf_key:
+                self._ivf_lists = self._ivf.load(self._count)
+                self._ivf_key = key if self._ivf_lists else None
+            return self._ivf_lists
+
+    def search(self, query: np.ndarray, k: int = 10, threshold: float = 0.0, nprobe: Optional[int] = None) -> List[dict]:
+        """
+        Retorna os k currículos mais similares à query, com score e metadados.
+
+        Com um índice IVF construído, só as nprobe partições mais próximas são comparadas;
+        caso contrário a busca percorre todos os vetores.
+        """
+        if not self._refresh()["count"]:
+            return []
+
+        query = np.asarray(query, dtype=np.float32)
+        query = query / (np.linalg.norm(query) or 1.0)
+
+        ivf = self._load_ivf()
+        if ivf:
+            meta, lists = ivf
+            found = ivf_search(query, self._vectors, lists, meta["built_count"], k,
+                               nprobe or settings.IVF_NPROBE, threshold)
+        else:
+            scores = self._vectors @ query
+            found = [(int(i), float(scores[i])) for i in select_top_k(scores, k, threshold)]
+
+        return [
+            {**metadata, "score": score}
+            for (_, score), metadata in zip(found, self._read_metadata([row for row, _ in found]))
+        ]
+
+
+_repositories: Dict[str, CandidateVectorRepository] = {}
+_repositories_lock = threading.Lock()
+
+
+def get_candidate_vector_repository(backend: str, model: str) -> CandidateVectorRepository:
+    path = os.path.join(settings.vector_index_dir,
+                        re.sub(r"[^\w.-]", "_", f"{backend}-{model}"))
+    with _repositories_lock:
+        if path not in _repositories:
+            _repositories[path] = CandidateVectorRepository(path)
+        return _repositories[path]
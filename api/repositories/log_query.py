@@ -0,0 +1,132 @@
+import json
+import base64
+import binascii
+import pymongo
+
+from enum import Enum
+from bson import ObjectId
+from bson.errors import InvalidId
+from datetime import datetime
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+# Ordem usada por todas as listagens: mais recentes primeiro, _id desempata timestamps iguais.
+LOG_SORT = [("timestamp", pymongo.DESCENDING), ("_id", pymongo.DESCENDING)]
+
+LOG_INDEXES = [
+    LOG_SORT,
+    [("user_id", pymongo.ASCENDING), *LOG_SORT],
+    [("status", pymongo.ASCENDING), *LOG_SORT],
+    [("request_id", pymongo.ASCENDING)],
+]
+
+# Um log por (usuário, requisição): reenvios da mesma requisição reaproveitam a análise existente.
+LOG_REQUEST_INDEX = [("user_id", pymongo.ASCENDING), ("request_id", pymongo.ASCENDING)]
+
+
+# Campos de primeiro nível que podem ser pedidos em `fields`.
+LOG_FIELDS = (
+    "request_id", "user_id", "timestamp", "query", "status",
+    "result", "feedback", "summary_cache", "partial_results",
+)
+
+# Visão `summary`: o suficiente para uma tabela de logs, sem resultado nem resultados parciais.
+SUMMARY_FIELDS = ("request_id", "user_id", "timestamp", "query", "status", "feedback")
+
+
+class TotalMode(str, Enum):
+    NONE = "none"
+    ESTIMATED = "estimated"
+    EXACT = "exact"
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+class InvalidFieldsError(ValueError):
+    pass
+
+
+def parse_fields(fields: str) -> Tuple[str, ...]:
+    """Valida a lista separada por vírgulas de `fields`, mantendo a ordem e sem repetições."""
+    names = tuple(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+    unknown = [name for name in names if name not in LOG_FIELDS and name not in ("id", "_id")]
+    if unknown:
+        raise InvalidFieldsError(f"Campos desconhecidos: {', '.join(unknown)}")
+    return tuple(name for name in names if name not in ("id", "_id"))
+
+
+def build_projection(fields: Tuple[str, ...]) -> dict:
+    """Projeção Mongo dos campos pedidos; timestamp e _id sempre vêm por serem a chave do cursor."""
+    projection = {name: 1 for name in fields}
+    projection["timestamp"] = 1
+    return projection
+
+
+@dataclass
+class LogFilters:
+    user_id: Optional[str] = None
+    status: Optional[str] = None
+    request_id: Optional[str] = None
+    since: Optional[datetime] = None
+    until: Optional[datetime] = None
+
+    def to_query(self) -> dict:
+        query = {}
+        for field in ("user_id", "status", "request_id"):
+            value = getattr(self, field)
+            if value is not None:
+                query[field] = value
+        if self.since or self.until:
+            query["timestamp"] = {}
+            if self.since:
+                query["timestamp"]["$gte"] = self.since
+            if self.until:
+                query["timestamp"]["$lt"] = self.until
+        return query
+
+
+@dataclass
+class KeysetPage:
+    limit: int
+    data: List
+    next_cursor: Optional[str]
+    total: Optional[int] = None
+    total_is_estimate: bool = False
+
+
+def encode_cursor(timestamp: datetime, id: ObjectId) -> str:
+    raw = json.dumps({"t": timestamp.isoformat(), "id": str(id)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, ObjectId]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        return datetime.fromisoformat(data["t"]), ObjectId(data["id"])
+    except (binascii.Error, ValueError, KeyError, TypeError, InvalidId) as e:
+        raise InvalidCursorError("Cursor de paginação inválido") from e
+
+
+def keyset_query(filters: LogFilters, cursor: Optional[str]) -> dict:
+    """Filtro do próximo bloco: documentos estritamente depois de (timestamp, _id) do cursor."""
+    query = filters.to_query()
+    if not cursor:
+        return query
+
+    timestamp, id = decode_cursor(cursor)
+    after_cursor = {"$or": [
+        {"timestamp": {"$lt": timestamp}},
+        {"timestamp": timestamp, "_id": {"$lt": id}},
+    ]}
+    return {"$and": [query, after_cursor]} if query else after_cursor
+
+
+def split_page(docs: List[dict], limit: int) -> Tuple[List[dict], Optional[str]]:
+    """Recebe limit + 1 documentos e devolve a página e o cursor do próximo bloco, se houver."""
+    if len(docs) <= limit:
+        return docs, None
+    page = docs[:limit]
+    return page, encode_cursor(page[-1]["timestamp"], page[-1]["_id"])
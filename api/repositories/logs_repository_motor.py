@@ -0,0 +1,135 @@
+import logging
+
+from bson import ObjectId
+from models import LogModel
+from typing import AsyncIterator, Optional, List
+from pymongo import ReturnDocument
+from config import settings
+from pymongo.errors import OperationFailure
+from schemas import LogCreateSchema, LogUpdateSchema, Status
+from repositories.base_repository import AsyncCRUDRepository
+from repositories.log_query import (
+    LOG_INDEXES, LOG_REQUEST_INDEX, LOG_SORT, KeysetPage, LogFilters, TotalMode, keyset_query, split_page)
+
+
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+
+class LogRepositoryMotor(AsyncCRUDRepository[LogModel, LogCreateSchema, LogUpdateSchema, str]):
+    def __init__(self, collection):
+        self.collection = collection
+
+    async def create(self, obj_in: LogCreateSchema) -> LogModel:
+        doc = obj_in.model_dump()
+        result = await self.collection.insert_one(doc)
+        return LogModel(**{**doc, "_id": result.inserted_id})
+
+    async def find_one(self, id: str) -> Optional[LogModel]:
+        doc = await self.collection.find_one({"_id": ObjectId(id)})
+        return LogModel(**doc) if doc else None
+
+    async def find_one_projected(self, id: str, projection: dict) -> Optional[dict]:
+        return await self.collection.find_one({"_id": ObjectId(id)}, projection)
+
+    async def find_by_request(self, user_id: str, request_id: str) -> Optional[LogModel]:
+        doc = await self.collection.find_one({"user_id": user_id, "request_id": request_id})
+        return LogModel(**doc) if doc else None
+
+    async def reopen_failed(self, user_id: str, request_id: str) -> Optional[LogModel]:
+        """
+        Volta para PROCESSING o log da requisição se ele estiver em PROCESSING_FAILED. A troca é
+        atômica, então só um entre reenvios simultâneos reabre a análise. Os resultados parciais
+        com falha são descartados para que o worker possa registrar os da nova tentativa.
+        """
+        doc = await self.collection.find_one_and_update(
+            {"user_id": user_id, "request_id": request_id, "status": Status.PROCESSING_FAILED.value},
+            {
+                "$set": {"status": Status.PROCESSING.value, "result": None},
+                "$pull": {"partial_results": {"status": "FAILED"}},
+            },
+            return_document=ReturnDocument.AFTER,
+        )
+        return LogModel(**doc) if doc else None
+
+    async def find_all(self) -> List[LogModel]:
+        cursor = self.collection.find({})
+        return [LogModel(**doc) async for doc in cursor]
+
+    async def ensure_indexes(self) -> None:
+        for keys in LOG_INDEXES:
+            await self.collection.create_index(keys)
+        try:
+            await self.collection.create_index(LOG_REQUEST_INDEX, unique=True)
+        except OperationFailure as e:
+            # Logs duplicados anteriores ao índice impedem criá-lo; a API segue sem a garantia.
+            logger.error(f"Falha ao criar o índice único de (user_id, request_id): {e}")
+
+    async def count(self, filters: LogFilters, mode: TotalMode) -> tuple:
+        """Retorna (total, é_estimativa) conforme o modo pedido, evitando contagens caras."""
+        if mode == TotalMode.NONE:
+            return None, False
+        query = filters.to_query()
+        if mode == TotalMode.EXACT:
+            return await self.collection.count_documents(query), False
+        if not query:
+            return await self.collection.estimated_document_count(), True
+        total = await self.collection.count_documents(query, limit=settings.LOGS_COUNT_LIMIT)
+        return total, total >= settings.LOGS_COUNT_LIMIT
+
+    async def find_page(
+        self,
+        filters: LogFilters,
+        limit: int = 10,
+        cursor: Optional[str] = None,
+        total_mode: TotalMode = TotalMode.NONE,
+        projection: Optional[dict] = None,
+    ) -> KeysetPage:
+        """
+        Página por keyset em (timestamp, _id): o custo não cresce com a profundidade.
+
+        Com `projection`, só os campos pedidos saem do Mongo e a página traz os documentos crus,
+        sem montar o LogModel completo.
+        """
+        docs = await (
+            self.collection.find(keyset_query(filters, cursor), projection)
+            .sort(LOG_SORT)
+            .limit(limit + 1)
+            .to_list(length=limit + 1)
+        )
+        page, next_cursor = split_page(docs, limit)
+        total, is_estimate = await self.count(filters, total_mode)
+        return KeysetPage(
+            limit=limit,
+            data=[LogModel(**doc) for doc in page] if projection is None else page,
+            next_cursor=next_cursor,
+            total=total,
+            total_is_estimate=is_estimate,
+        )
+
+    async def iter_page_docs(
+        self,
+        filters: LogFilters,
+        cursor: Optional[str] = None,
+        projection: Optional[dict] = None,
+        batch_size: int = 500,
+    ) -> AsyncIterator[dict]:
+        """Percorre os documentos na ordem da paginação, buscando-os do Mongo em lotes."""
+        docs = (
+            self.collection.find(keyset_query(filters, cursor), projection)
+            .sort(LOG_SORT)
+            .batch_size(batch_size)
+        )
+        async for doc in docs:
+            yield doc
+
+    async def update(self, id: str, obj_in: LogUpdateSchema) -> LogModel:
+        updated = await self.collection.find_one_and_update(
+            {"_id": ObjectId(id)},
+            {"$set": obj_in.model_dump(exclude_unset=True)},
+            return_document=ReturnDocument.AFTER,
+        )
+        return LogModel(**updated)
+
+    async def delete(self, id: str) -> None:
+        await self.collection.delete_one({"_id": ObjectId(id)})
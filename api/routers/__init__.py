@@ -1,2 +1,4 @@
 from .logs import *
 from .analyzer import *
+from .candidates import *
+from .progress import *
@@ -1,15 +1,15 @@
-import os
-import uuid
+import anyio
 import logging
 
 from uuid import UUID
 from http import HTTPStatus
 from typing import List, Optional
 from config import celery, settings
-from config import get_mongo_collection
-from services.log_service import LogService
-from repositories import LogRepositoryMongo
-from fastapi import APIRouter, Depends, Form, HTTPException, UploadFile
+from config import get_async_mongo_collection
+from services.log_service import AsyncLogService
+from services.upload_service import store_uploads
+from repositories import BlobRepositoryMotor, LogRepositoryMotor
+from fastapi import APIRouter, Depends, Form, UploadFile
 from schemas import LogCreateSchema, Status, ResumeAnalysisStartedResponse
 
 
@@ -18,9 +18,14 @@ logger = logging.getLogger(__name__)
 
 analyzer = APIRouter()
 
-def get_log_service() -> LogService:
-    repo = LogRepositoryMongo(get_mongo_collection('logs'))
-    return LogService(repo)
+def get_log_service() -> AsyncLogService:
+    repo = LogRepositoryMotor(get_async_mongo_collection('logs'))
+    return AsyncLogService(repo)
+
+
+def get_blob_repository() -> BlobRepositoryMotor:
+    return BlobRepositoryMotor(
+        get_async_mongo_collection('blobs'), settings.BLOB_REFERENCE_TTL_SECONDS, settings.BLOB_DELETE_TIMEOUT_SECONDS)
 
 
 @analyzer.post(
@@ -28,7 +33,8 @@ def get_log_service() -> LogService:
     status_code=HTTPStatus.OK,
     response_model=ResumeAnalysisStartedResponse,
     summary="Analisar currículos e identificar o melhor candidato",
-    description="Recebe uma lista de arquivos (PDFs ou imagens), armazena-os e inicia uma tarefa para análise dos currículos.")
+    description="Recebe uma lista de arquivos (PDFs ou imagens), armazena-os e inicia uma tarefa para análise dos currículos. "
+                "A requisição é idempotente por (user_id, request_id): reenvios devolvem o log já existente.")
 async def analyze(
     files: List[UploadFile],
     query: Optional[str] = Form(
@@ -36,7 +42,8 @@ async def analyze(
     request_id: UUID = Form(..., description="Identificador da requisição"),
     user_id: UUID = Form(...,
                          description="Identificador do usuário solicitante"),
-    log_service: LogService = Depends(get_log_service)
+    log_service: AsyncLogService = Depends(get_log_service),
+    blobs: BlobRepositoryMotor = Depends(get_blob_repository)
 ):
     """
     Inicia a análise de currículos enviados e retorna o ID do log associado à análise.
@@ -46,38 +53,40 @@ async def analyze(
         query (Optional[str]): Consulta textual para filtrar ou guiar a análise.
         request_id (UUID): ID da requisição.
         user_id (UUID): ID do usuário que fez a requisição.
-        log_service (LogService): Serviço de log injetado via dependência.
+        log_service (AsyncLogService): Serviço de log injetado via dependência.
+        blobs (BlobRepositoryMotor): Referências dos arquivos armazenados, injetadas via dependência.
 
     Raises:
-        HTTPException: Se algum arquivo estiver em formato não suportado.
+        HTTPException: Se algum arquivo estiver em formato não suportado ou exceder os limites de tamanho.
 
     Returns:
-        ResumeAnalysisStartedResponse: Contém o ID do log da análise iniciada.
+        ResumeAnalysisStartedResponse: Contém o ID do log da análise iniciada (ou da já existente).
     """
 
-    filenames: List[str] = []
-
-    for file in files:
-        if file.content_type not in ["application/pdf", "image/jpeg", "image/png"]:
-            raise HTTPException(
-                status_code=400, detail=f"Arquivo não suportado: {file.filename}")
-
-    for file in files:
-        unique_id = uuid.uuid4()
-        filename = f"{unique_id}_{file.filename}"
-        file_location = os.path.join(settings.STORAGE, filename)
-
-        with open(file_location, "wb") as f:
-            content = await file.read()
-            f.write(content)
-
-        filenames.append(filename)
-
-    log = log_service.create(LogCreateSchema(
+    # O log é reservado antes de gravar os arquivos: um reenvio (ou um envio simultâneo) da
+    # mesma requisição recebe o log existente sem gravar arquivos nem enfileirar outra análise,
+    # a menos que ela tenha falhado.
+    log, started = await log_service.create_once(LogCreateSchema(
         request_id=str(request_id),
         user_id=str(user_id),
         query=query,
         status=Status.PROCESSING
     ))
-    celery.send_task("tasks.analyze_resume", args=[log.id, filenames, query])
+    if not started:
+        logger.info(f"[log_id={log.id}] Requisição {request_id} repetida, devolvendo o log existente")
+        return ResumeAnalysisStartedResponse(
+            log_id=log.id, message="A requisição já havia sido recebida", duplicate=True)
+
+    try:
+        uploads = await store_uploads(files, blobs)
+        await blobs.add_references([upload.file_hash for upload in uploads], log.id)
+        celery.send_task("tasks.analyze_resume", args=[
+            log.id, [upload.to_task_arg() for upload in uploads], query])
+    except BaseException:
+        # Sem a tarefa na fila o log ficaria em PROCESSING para sempre; como falho, um reenvio
+        # da mesma requisição o reabre e enfileira a análise de novo.
+        with anyio.CancelScope(shield=True):
+            await log_service.mark_failed(log.id)
+        raise
+
     return ResumeAnalysisStartedResponse(log_id=log.id)
@@ -0,0 +1,60 @@
+import logging
+import numpy as np
+
+from http import HTTPStatus
+from config import celery, settings
+from fastapi import APIRouter, HTTPException
+from celery.exceptions import TimeoutError
+from starlette.concurrency import run_in_threadpool
+from repositories.candidate_vector_repository import get_candidate_vector_repository
+from schemas import CandidateSearchSchema, CandidateSearchResponse, CandidateMatchSchema
+
+
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+candidates = APIRouter()
+
+
+@candidates.post(
+    "/candidates/search",
+    status_code=HTTPStatus.OK,
+    response_model=CandidateSearchResponse,
+    summary="Buscar candidatos em todo o histórico",
+    description="Compara uma descrição de vaga com todos os currículos já processados, sem reenviar arquivos.")
+async def search(body: CandidateSearchSchema):
+    """
+    Busca os candidatos mais similares à query no índice vetorial de currículos.
+
+    Args:
+        body (CandidateSearchSchema): Query, quantidade de resultados, similaridade mínima e nprobe.
+
+    Raises:
+        HTTPException: Se o embedding da query não for gerado dentro do tempo limite (504)
+            ou se a tarefa que o gera falhar (502).
+
+    Returns:
+        CandidateSearchResponse: Candidatos mais similares, em ordem decrescente de score.
+    """
+    task = celery.send_task("tasks.embed_query", args=[body.query])
+    try:
+        payload = await run_in_threadpool(task.get, timeout=settings.EMBED_QUERY_TIMEOUT)
+    except TimeoutError:
+        raise HTTPException(
+            status_code=HTTPStatus.GATEWAY_TIMEOUT,
+            detail="Tempo esgotado ao gerar o embedding da consulta")
+    except Exception as e:
+        # task.get relança a exceção da tarefa (modelo indisponível, worker perdido, ...).
+        logger.error(f"Falha ao gerar o embedding da consulta: {e!r}")
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_GATEWAY,
+            detail="Falha ao gerar o embedding da consulta; tente novamente mais tarde")
+
+    repo = get_candidate_vector_repository(payload["backend"], payload["model"])
+    matches = await run_in_threadpool(
+        repo.search, np.asarray(payload["embedding"], dtype=np.float32), body.k, body.threshold, body.nprobe)
+
+    return CandidateSearchResponse(
+        total_indexed=repo.total,
+        results=[CandidateMatchSchema(**match) for match in matches],
+    )
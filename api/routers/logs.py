@@ -1,12 +1,16 @@
+import zlib
 import logging
 
 from http import HTTPStatus
-from typing import Optional, List
-from config import get_mongo_collection
-from services.log_service import LogService
-from repositories import LogRepositoryMongo
+from datetime import datetime
+from typing import Optional, List, Tuple, Union
+from config import settings, get_async_mongo_collection
+from fastapi.responses import StreamingResponse
+from services.log_service import AsyncLogService, resolve_fields
+from repositories import LogFilters, LogRepositoryMotor, TotalMode
 from fastapi import APIRouter, Depends, Query
-from schemas import LogOutputSchema, PaginatedLogsSchema
+from schemas import (
+    LogOutputSchema, CursorPaginatedLogsSchema, LogFieldsSchema, LogSummarySchema, LogView, Status)
 
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
@@ -14,10 +18,37 @@ logger = logging.getLogger(__name__)
 logs = APIRouter()
 
 
-def get_log_service() -> LogService:
+def get_log_service() -> AsyncLogService:
     """Inicializa e retorna uma instância do serviço de logs."""
-    repo = LogRepositoryMongo(get_mongo_collection('logs'))
-    return LogService(repo)
+    repo = LogRepositoryMotor(get_async_mongo_collection('logs'))
+    return AsyncLogService(repo)
+
+
+def get_log_filters(
+    user_id: Optional[str] = Query(None, description="Filtra pelo usuário solicitante"),
+    status: Optional[Status] = Query(None, description="Filtra pelo status da análise"),
+    request_id: Optional[str] = Query(None, description="Filtra pelo ID da requisição"),
+    since: Optional[datetime] = Query(None, description="Logs a partir deste instante (inclusive)"),
+    until: Optional[datetime] = Query(None, description="Logs anteriores a este instante"),
+) -> LogFilters:
+    """Filtros comuns às listagens de logs."""
+    return LogFilters(
+        user_id=user_id,
+        status=status.value if status else None,
+        request_id=request_id,
+        since=since,
+        until=until,
+    )
+
+
+def get_log_fields(
+    view: LogView = Query(
+        LogView.FULL, description="`summary` traz só id, requisição, usuário, data, consulta, status e feedback"),
+    fields: Optional[str] = Query(
+        None, description="Campos separados por vírgula (ex.: `status,timestamp,feedback`); tem precedência sobre `view`"),
+) -> Optional[Tuple[str, ...]]:
+    """Campos projetados nas respostas de logs; None devolve o log completo."""
+    return resolve_fields(view, fields)
 
 
 @logs.patch(
@@ -26,10 +57,10 @@ def get_log_service() -> LogService:
     summary="Atualizar feedback de log",
     description="Atualiza o campo de feedback (positivo/negativo) de um resultado específico."
 )
-def patch(
+async def patch(
     log_id: str,
     feedback: bool,
-    log_service: LogService = Depends(get_log_service)
+    log_service: AsyncLogService = Depends(get_log_service)
 ):
     """
     Atualiza o campo de feedback de um log específico.
@@ -37,63 +68,131 @@ def patch(
     Args:
         log_id (str): ID do log a ser atualizado.
         feedback (bool): Valor booleano do feedback (True para positivo, False para negativo).
-        log_service (LogService): Serviço de log injetado via dependência.
+        log_service (AsyncLogService): Serviço de log injetado via dependência.
 
     Returns:
         LogOutputSchema: Log atualizado com o novo feedback.
     """
-    return log_service.patch_feedback(log_id, feedback)
+    return await log_service.patch_feedback(log_id, feedback)
 
 
 @logs.get(
     "/logs/paginated",
     status_code=HTTPStatus.OK,
-    response_model=PaginatedLogsSchema,
+    response_model=CursorPaginatedLogsSchema,
     summary="Listar logs com paginação",
-    description="Retorna uma lista paginada de logs."
+    description="Retorna logs do mais recente para o mais antigo, paginados por cursor. "
+                "Use o `next_cursor` da resposta para buscar a próxima página."
 )
-def get_all_paginated(
-    skip: int = Query(0, ge=0, description="Número de registros para pular"),
+async def get_all_paginated(
     limit: int = Query(
         10, ge=1, le=100, description="Número máximo de registros para retornar"),
-    log_service: LogService = Depends(get_log_service)
+    cursor: Optional[str] = Query(
+        None, description="Token `next_cursor` da página anterior"),
+    filters: LogFilters = Depends(get_log_filters),
+    total: TotalMode = Query(
+        TotalMode.NONE, description="Contagem total: none, estimated (barata) ou exact"),
+    fields: Optional[Tuple[str, ...]] = Depends(get_log_fields),
+    log_service: AsyncLogService = Depends(get_log_service)
 ):
     """
-    Lista paginada de logs.
+    Lista paginada de logs por cursor (keyset em timestamp e _id).
 
     Args:
-        skip (int): Quantos registros pular (offset).
         limit (int): Quantos registros retornar (limite).
-        log_service (LogService): Serviço de log injetado via dependência.
+        cursor (Optional[str]): Cursor opaco da página anterior.
+        filters (LogFilters): Filtros por usuário, status, requisição e intervalo de tempo.
+        total (TotalMode): Como calcular o total de registros.
+        fields (Optional[Tuple[str, ...]]): Campos projetados, conforme `view`/`fields`.
+        log_service (AsyncLogService): Serviço de log injetado via dependência.
 
     Returns:
-        PaginatedLogsSchema: logs registrados paginados.
+        CursorPaginatedLogsSchema: logs registrados paginados.
     """
-    return log_service.get_all_paginated(skip=skip, limit=limit)
+    return await log_service.get_page(filters, limit=limit, cursor=cursor, total_mode=total, fields=fields)
+
+
+@logs.get(
+    "/logs/export",
+    status_code=HTTPStatus.OK,
+    summary="Exportar logs em NDJSON",
+    description="Stream de todos os logs que atendem aos filtros, um JSON por linha, do mais recente "
+                "para o mais antigo. Cada linha traz `_cursor` para retomar a exportação a partir dela."
+)
+async def export(
+    cursor: Optional[str] = Query(
+        None, description="`_cursor` da última linha recebida, para retomar a exportação"),
+    compress: bool = Query(False, description="Comprime o stream com gzip"),
+    filters: LogFilters = Depends(get_log_filters),
+    fields: Optional[Tuple[str, ...]] = Depends(get_log_fields),
+    log_service: AsyncLogService = Depends(get_log_service)
+):
+    """
+    Exporta os logs como NDJSON em streaming, com memória constante na API.
+
+    Args:
+        cursor (Optional[str]): Cursor da última linha já recebida.
+        compress (bool): Se o stream deve ser comprimido com gzip.
+        filters (LogFilters): Filtros por usuário, status, requisição e intervalo de tempo.
+        fields (Optional[Tuple[str, ...]]): Campos projetados, conforme `view`/`fields`.
+        log_service (AsyncLogService): Serviço de log injetado via dependência.
+
+    Raises:
+        HTTPException: Se o cursor ou os campos forem inválidos.
+
+    Returns:
+        StreamingResponse: Logs em application/x-ndjson.
+    """
+    log_service.validate_cursor(cursor)
+    lines = log_service.export(filters, cursor, settings.LOGS_EXPORT_BATCH_SIZE, fields)
+    headers = {"Content-Disposition": 'attachment; filename="logs.ndjson"'}
+
+    if not compress:
+        return StreamingResponse(lines, media_type="application/x-ndjson", headers=headers)
+
+    async def gzip_lines():
+        # Um flush por lote mantém o stream fluindo sem acumular o arquivo comprimido em memória.
+        compressor = zlib.compressobj(wbits=31)
+        pending = 0
+        async for line in lines:
+            chunk = compressor.compress(line.encode())
+            pending += 1
+            if pending >= settings.LOGS_EXPORT_BATCH_SIZE:
+                chunk += compressor.flush(zlib.Z_SYNC_FLUSH)
+                pending = 0
+            if chunk:
+                yield chunk
+        yield compressor.flush()
+
+    return StreamingResponse(
+        gzip_lines(), media_type="application/x-ndjson",
+        headers={**headers, "Content-Encoding": "gzip"})
 
 
 @logs.get(
     "/logs/{id}",
     status_code=HTTPStatus.OK,
-    response_model=Optional[LogOutputSchema],
+    response_model=Optional[Union[LogSummarySchema, LogFieldsSchema, LogOutputSchema]],
     summary="Buscar log por ID",
     description="Retorna um log específico com base no ID fornecido."
 )
-def get_one(
+async def get_one(
     id: str,
-    log_service: LogService = Depends(get_log_service)
+    fields: Optional[Tuple[str, ...]] = Depends(get_log_fields),
+    log_service: AsyncLogService = Depends(get_log_service)
 ):
     """
     Retorna um log específico pelo ID.
 
     Args:
         id (str): ID do log no banco de dados.
-        log_service (LogService): Serviço de log injetado via dependência.
+        fields (Optional[Tuple[str, ...]]): Campos projetados, conforme `view`/`fields`.
+        log_service (AsyncLogService): Serviço de log injetado via dependência.
 
     Returns:
         Optional[LogOutputSchema]: Log correspondente ao ID, se existir.
     """
-    return log_service.get(id)
+    return await log_service.get(id, fields)
 
 
 @logs.get(
@@ -101,18 +200,20 @@ def get_one(
     status_code=HTTPStatus.OK,
     response_model=List[LogOutputSchema],
     summary="Listar todos os logs",
-    description="Retorna uma lista de todos os logs armazenados no sistema."
+    description="Retorna uma lista de todos os logs armazenados no sistema. Obsoleto: carrega a coleção "
+                "inteira em memória; use `/logs/export` (NDJSON em streaming) ou `/logs/paginated`.",
+    deprecated=True
 )
-def get_all(
-    log_service: LogService = Depends(get_log_service)
+async def get_all(
+    log_service: AsyncLogService = Depends(get_log_service)
 ):
     """
     Lista todos os logs cadastrados no sistema.
 
     Args:
-        log_service (LogService): Serviço de log injetado via dependência.
+        log_service (AsyncLogService): Serviço de log injetado via dependência.
 
     Returns:
         List[LogOutputSchema]: Lista de logs registrados.
     """
-    return log_service.get_all()
+    return await log_service.get_all()
@@ -0,0 +1,145 @@
+import json
+import logging
+
+from http import HTTPStatus
+from fastapi.responses import StreamingResponse
+from services.log_service import AsyncLogService
+from repositories import LogRepositoryMotor
+from services.progress_service import ProgressService
+from services.justification_service import JustificationService
+from config import get_async_mongo_collection, get_async_redis_client
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, WebSocket, WebSocketDisconnect, status
+
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+progress = APIRouter()
+
+
+def get_log_service() -> AsyncLogService:
+    repo = LogRepositoryMotor(get_async_mongo_collection('logs'))
+    return AsyncLogService(repo)
+
+
+def get_progress_service() -> ProgressService:
+    return ProgressService(get_async_redis_client())
+
+
+@progress.get(
+    "/logs/{log_id}/events",
+    status_code=HTTPStatus.OK,
+    summary="Acompanhar o progresso de uma análise (SSE)",
+    description="Stream Server-Sent Events com o andamento da análise: arquivos extraídos, sumários, "
+                "ranqueamento, fração concluída e tempo estimado restante. Encerra quando a análise termina.")
+async def stream_events(
+    log_id: str,
+    log_service: AsyncLogService = Depends(get_log_service),
+    progress_service: ProgressService = Depends(get_progress_service)
+):
+    """
+    Retorna um stream SSE com os eventos de progresso da análise.
+
+    Args:
+        log_id (str): ID do log da análise.
+        log_service (AsyncLogService): Serviço de log injetado via dependência.
+        progress_service (ProgressService): Serviço de progresso injetado via dependência.
+
+    Raises:
+        HTTPException: Se o ID for inválido ou o log não existir.
+
+    Returns:
+        StreamingResponse: Eventos `progress` em formato text/event-stream.
+    """
+    log = await log_service.get(log_id)
+
+    async def event_stream():
+        async for event in progress_service.events(log):
+            if event is None:
+                yield ": keep-alive\n\n"
+            else:
+                yield f"event: progress\ndata: {json.dumps(event)}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def get_justification_service(
+    log_service: AsyncLogService = Depends(get_log_service)
+) -> JustificationService:
+    return JustificationService(get_async_redis_client(), log_service)
+
+
+@progress.get(
+    "/logs/{log_id}/justification",
+    status_code=HTTPStatus.OK,
+    summary="Acompanhar a justificativa enquanto é gerada (SSE)",
+    description="Stream Server-Sent Events com os trechos da justificativa do candidato, na ordem em que o "
+                "modelo os produz. Eventos `chunk` trazem o texto; o evento `done` encerra o stream e, se o "
+                "texto não pôde ser transmitido, traz a justificativa completa salva no log.")
+async def stream_justification(
+    log_id: str,
+    last_event_id: Optional[str] = Header(None, description="ID do último evento recebido, para retomar"),
+    log_service: AsyncLogService = Depends(get_log_service),
+    justification_service: JustificationService = Depends(get_justification_service)
+):
+    """
+    Retorna um stream SSE com a justificativa gerada para a análise.
+
+    Args:
+        log_id (str): ID do log da análise.
+        last_event_id (Optional[str]): Cabeçalho Last-Event-ID enviado pelo EventSource ao reconectar.
+        log_service (AsyncLogService): Serviço de log injetado via dependência.
+        justification_service (JustificationService): Serviço da justificativa injetado via dependência.
+
+    Raises:
+        HTTPException: Se o ID for inválido ou o log não existir.
+
+    Returns:
+        StreamingResponse: Eventos `chunk`, `error` e `done` em formato text/event-stream.
+    """
+    log = await log_service.get(log_id)
+
+    async def event_stream():
+        async for item in justification_service.chunks(log, last_event_id or "0"):
+            if item is None:
+                yield ": keep-alive\n\n"
+                continue
+            entry_id, fields = item
+            # Copia: o serviço ainda lê `type` da entrada depois de repassá-la.
+            data = {key: value for key, value in fields.items() if key != "type"}
+            event_id = f"id: {entry_id}\n" if entry_id else ""
+            yield f"{event_id}event: {fields['type']}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@progress.websocket("/logs/{log_id}/ws")
+async def websocket_events(
+    websocket: WebSocket,
+    log_id: str,
+    log_service: AsyncLogService = Depends(get_log_service),
+    progress_service: ProgressService = Depends(get_progress_service)
+):
+    """Mesmos eventos do endpoint SSE, enviados como mensagens JSON por WebSocket."""
+    try:
+        log = await log_service.get(log_id)
+    except HTTPException as e:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=e.detail)
+        return
+
+    await websocket.accept()
+    try:
+        async for event in progress_service.events(log):
+            if event is not None:
+                await websocket.send_json(event)
+        await websocket.close()
+    except WebSocketDisconnect:
+        logger.debug(f"[log_id={log_id}] Cliente desconectado do progresso")
@@ -1,2 +1,9 @@
-from .analysis_schemas import SummaryResume, AnalysisOutputSchema, ResumeAnalysisStartedResponse
-from .logs_schemas import Status, LogOutputSchema, LogCreateSchema, LogUpdateSchema, PaginatedLogsSchema
+from .analysis_schemas import (
+    SummaryResume, FailedFileSchema, FileResultStatus, FileResultSchema, AnalysisOutputSchema,
+    ResumeAnalysisStartedResponse,
+)
+from .logs_schemas import (
+    Status, CacheStatsSchema, LogOutputSchema, LogCreateSchema, LogUpdateSchema, CursorPaginatedLogsSchema,
+    LogView, LogSummarySchema, LogFieldsSchema,
+)
+from .search_schemas import CandidateSearchSchema, CandidateMatchSchema, CandidateSearchResponse
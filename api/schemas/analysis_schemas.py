@@ -1,3 +1,6 @@
+import enum
+
+from datetime import datetime
 from typing import List, Optional
 from pydantic import BaseModel, Field
 
@@ -8,6 +11,10 @@ class ResumeAnalysisStartedResponse(BaseModel):
         default="Os currículos foram enviados para análises",
         description="Mensagem indicando que a análise foi iniciada com sucesso"
     )
+    duplicate: bool = Field(
+        default=False,
+        description="Se a requisição já havia sido recebida e o log existente foi devolvido"
+    )
 
 
 class SummaryResume(BaseModel):
@@ -28,6 +35,29 @@ class SummaryResume(BaseModel):
         }
 
 
+class FailedFileSchema(BaseModel):
+    filename: str = Field(..., description="Nome do arquivo que não pôde ser processado")
+    error: str = Field(..., description="Motivo da falha")
+
+
+class FileResultStatus(enum.Enum):
+    SUMMARIZED = "SUMMARIZED"
+    FAILED = "FAILED"
+
+
+class FileResultSchema(BaseModel):
+    filename: str = Field(..., description="Nome do arquivo enviado")
+    file_hash: Optional[str] = Field(None, description="Hash SHA-256 do arquivo")
+    status: FileResultStatus = Field(..., description="Situação do arquivo nesta análise")
+    summary: Optional[SummaryResume] = Field(
+        None, description="Sumário do currículo, quando já gerado")
+    error: Optional[str] = Field(None, description="Motivo da falha, se houver")
+    cached: bool = Field(
+        default=False, description="Se o sumário foi reaproveitado do cache")
+    finished_at: Optional[datetime] = Field(
+        None, description="Momento em que o arquivo terminou de ser processado")
+
+
 class AnalysisOutputSchema(BaseModel):
     resumes: List[SummaryResume] = Field(
         ..., description="Lista dos currículos analisados"
@@ -35,6 +65,9 @@ class AnalysisOutputSchema(BaseModel):
     justification: Optional[str] = Field(
         None, description="Justificativa para a seleção ou análise feita"
     )
+    failed_files: List[FailedFileSchema] = Field(
+        default_factory=list, description="Arquivos que falharam após todas as tentativas"
+    )
 
     class Config:
         json_schema_extra = {
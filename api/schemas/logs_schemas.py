@@ -1,9 +1,9 @@
 import enum
 
 from datetime import datetime, timezone
-from typing import Annotated, List, Optional
-from pydantic import BaseModel, BeforeValidator, Field
-from schemas.analysis_schemas import AnalysisOutputSchema
+from typing import Annotated, List, Optional, Union
+from pydantic import AliasChoices, BaseModel, BeforeValidator, Field, model_serializer, model_validator
+from schemas.analysis_schemas import AnalysisOutputSchema, FileResultSchema, FileResultStatus
 
 
 PyObjectId = Annotated[str, BeforeValidator(str)]
@@ -15,6 +15,13 @@ class Status(enum.Enum):
     PROCESSED = "PROCESSED"
 
 
+class CacheStatsSchema(BaseModel):
+    hits: int = Field(
+        default=0, description="Arquivos cujo sumário foi reaproveitado do cache")
+    misses: int = Field(
+        default=0, description="Arquivos que precisaram de OCR e sumarização")
+
+
 class LogCreateSchema(BaseModel):
     request_id: str = Field(..., description="ID único da requisição")
     user_id: str = Field(..., description="ID do usuário que fez a requisição")
@@ -32,6 +39,14 @@ class LogCreateSchema(BaseModel):
     feedback: Optional[bool] = Field(
         None, description="Feedback do usuário (True = gostei, False = não gostei)"
     )
+    # Gravado já zerado: o worker incrementa summary_cache.hits/misses, e o Mongo não cria
+    # subcampos dentro de um campo null.
+    summary_cache: CacheStatsSchema = Field(
+        default_factory=CacheStatsSchema, description="Acertos e falhas do cache de sumários nesta análise"
+    )
+    partial_results: List[FileResultSchema] = Field(
+        default_factory=list, description="Resultado de cada arquivo, gravado assim que ele termina"
+    )
 
     class Config:
         use_enum_values = True
@@ -74,23 +89,80 @@ class LogUpdateSchema(BaseModel):
 class LogOutputSchema(LogCreateSchema):
     id: str = Field(..., description="ID gerado para o log")
 
+    @model_validator(mode="after")
+    def fill_partial_result(self) -> "LogOutputSchema":
+        """Enquanto a análise está em andamento, `result` traz os currículos já resumidos."""
+        if self.result is None and self.partial_results and Status(self.status) == Status.PROCESSING:
+            self.result = AnalysisOutputSchema(
+                resumes=[
+                    item.summary for item in self.partial_results
+                    if item.status == FileResultStatus.SUMMARIZED and item.summary
+                ],
+                failed_files=[
+                    {"filename": item.filename, "error": item.error or ""}
+                    for item in self.partial_results if item.status == FileResultStatus.FAILED
+                ],
+            )
+        return self
+
     class Config:
         from_attributes = True
 
 
-class PaginatedLogsSchema(BaseModel):
-    total: int
-    skip: int
+class LogView(str, enum.Enum):
+    SUMMARY = "summary"
+    FULL = "full"
+
+
+class LogSummarySchema(BaseModel):
+    """Visão enxuta de um log, sem o resultado da análise."""
+    id: PyObjectId = Field(..., validation_alias=AliasChoices("_id", "id"), description="ID gerado para o log")
+    request_id: str = Field(..., description="ID único da requisição")
+    user_id: str = Field(..., description="ID do usuário que fez a requisição")
+    timestamp: datetime = Field(..., description="Data e hora da requisição")
+    query: Optional[str] = Field(None, description="Consulta feita pelo usuário")
+    status: Status
+    feedback: Optional[bool] = Field(None, description="Feedback do usuário")
+
+
+class LogFieldsSchema(BaseModel):
+    """Log com apenas os campos pedidos em `fields`; os demais não são serializados."""
+    id: PyObjectId = Field(..., validation_alias=AliasChoices("_id", "id"), description="ID gerado para o log")
+    request_id: Optional[str] = None
+    user_id: Optional[str] = None
+    timestamp: Optional[datetime] = None
+    query: Optional[str] = None
+    status: Optional[Status] = None
+    result: Optional[AnalysisOutputSchema] = None
+    feedback: Optional[bool] = None
+    summary_cache: Optional[CacheStatsSchema] = None
+    partial_results: Optional[List[FileResultSchema]] = None
+
+    @model_serializer(mode="wrap")
+    def only_requested_fields(self, handler):
+        data = handler(self)
+        return {name: value for name, value in data.items() if name in self.model_fields_set}
+
+
+class CursorPaginatedLogsSchema(BaseModel):
     limit: int
-    data: List[LogOutputSchema]
+    next_cursor: Optional[str] = Field(
+        None, description="Token opaco para buscar a próxima página; ausente na última")
+    total: Optional[int] = Field(
+        None, description="Total de logs que atendem aos filtros, quando solicitado")
+    total_is_estimate: bool = Field(
+        default=False, description="Se o total é uma estimativa (ou um limite inferior)")
+    # Do mais enxuto para o completo: na revalidação da resposta, empates ficam com o mais enxuto.
+    data: List[Union[LogSummarySchema, LogFieldsSchema, LogOutputSchema]]
 
     class Config:
         from_attributes = True
         json_schema_extra = {
             "example": {
-                "total": 150,
-                "skip": 0,
                 "limit": 10,
+                "next_cursor": "eyJ0IjoiMjAyNS0wOC0wMlQxNDowMDowMCIsImlkIjoiNjRjN2YxZjRhMWM0YzhlMWM0ZTFkMmEzIn0",
+                "total": None,
+                "total_is_estimate": False,
                 "data": [
                     {
                         "id": "64c7f1f4a1c4c8e1c4e1d2a3",
@@ -99,16 +171,6 @@ class PaginatedLogsSchema(BaseModel):
                         "timestamp": "2025-08-02T14:00:00Z",
                         "query": "engenheiro com experiência em Python e liderança",
                         "status": "PROCESSED",
-                        "result": {
-                            "resumes": [
-                                {
-                                    "candidate_name": "Maria Silva",
-                                    "summary": "Engenheira de software com 5 anos de experiência em Python e liderança de equipes.",
-                                    "score": 0.8,
-                                }
-                            ],
-                            "justification": "Maria Silva apresentou maior aderência aos critérios de liderança e domínio em Python."
-                        },
                         "feedback": True
                     }
                 ]
@@ -0,0 +1,54 @@
+from typing import List, Optional
+from pydantic import BaseModel, Field
+
+
+class CandidateSearchSchema(BaseModel):
+    query: str = Field(..., description="Descrição da vaga ou perfil desejado")
+    k: int = Field(
+        default=10, ge=1, le=100, description="Quantidade máxima de candidatos retornados")
+    threshold: float = Field(
+        default=0.5, ge=-1, le=1, description="Similaridade mínima para um candidato ser retornado")
+    nprobe: Optional[int] = Field(
+        default=None, ge=1, le=4096,
+        description="Partições do índice IVF comparadas com a query (maior = mais recall e mais latência)")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "query": "engenheiro com experiência em Python e liderança",
+                "k": 5,
+                "threshold": 0.5
+            }
+        }
+
+
+class CandidateMatchSchema(BaseModel):
+    candidate_name: str = Field(..., description="Nome do candidato")
+    summary: str = Field(..., description="Resumo extraído do currículo")
+    score: float = Field(...,
+                         description="Similaridade do candidato com a vaga")
+    log_id: str = Field(...,
+                        description="ID do log da análise em que o currículo foi processado")
+    file_hash: str = Field(..., description="Hash SHA-256 do arquivo do currículo")
+
+
+class CandidateSearchResponse(BaseModel):
+    total_indexed: int = Field(...,
+                               description="Quantidade de currículos no índice")
+    results: List[CandidateMatchSchema]
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "total_indexed": 1520,
+                "results": [
+                    {
+                        "candidate_name": "Maria Silva",
+                        "summary": "Engenheira de software com 5 anos de experiência em Python e liderança de equipes.",
+                        "score": 0.82,
+                        "log_id": "64c7f1f4a1c4c8e1c4e1d2a3",
+                        "file_hash": "9f86d081884c7d659a2feaa0c55ad015a3bf4f1b2b0b822cd15d6c15b0f00a08"
+                    }
+                ]
+            }
+        }
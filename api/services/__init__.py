@@ -1 +1,5 @@
 from .log_service import *
+from .upload_service import *
+from .blob_store import *
+from .progress_service import *
+from .justification_service import *
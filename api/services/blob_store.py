@@ -0,0 +1,40 @@
+import os
+import uuid
+
+from config import settings
+from typing import Optional
+from shared.blob_layout import BlobLayout
+
+
+class LocalBlobStore(BlobLayout):
+    """
+    Lado de escrita do blob store local compartilhado com os workers; como o endereço é o hash,
+    uploads idênticos ocupam um só arquivo.
+    """
+
+    def staging_path(self) -> str:
+        staging = self.staging_dir()
+        os.makedirs(staging, exist_ok=True)
+        return os.path.join(staging, f"{uuid.uuid4()}.part")
+
+    def commit(self, staging_path: str, file_hash: str) -> None:
+        """Move o upload concluído para o endereço do hash; se o blob já existe, o conteúdo é o mesmo."""
+        final_path = self.path(file_hash)
+        os.makedirs(os.path.dirname(final_path), exist_ok=True)
+        os.replace(staging_path, final_path)
+
+    def discard(self, staging_path: str) -> None:
+        try:
+            os.remove(staging_path)
+        except FileNotFoundError:
+            pass
+
+
+_blob_store: Optional[LocalBlobStore] = None
+
+
+def get_blob_store() -> LocalBlobStore:
+    global _blob_store
+    if _blob_store is None:
+        _blob_store = LocalBlobStore(settings.blob_store_dir)
+    return _blob_store
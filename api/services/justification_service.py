@@ -0,0 +1,69 @@
+import re
+import redis.asyncio as redis
+
+from config import settings
+from schemas import LogOutputSchema, Status
+from services.log_service import AsyncLogService
+from typing import AsyncIterator, Optional, Tuple
+
+TERMINAL_TYPES = ("done", "error")
+STREAM_ID = re.compile(r"^\d+(-\d+)?$")
+
+
+def justification_key(log_id: str) -> str:
+    return f"justification:{log_id}"
+
+
+class JustificationService:
+    """
+    Repassa os trechos da justificativa gravados pelo worker no stream Redis
+    `justification:<log_id>`, a partir do início ou do último ID já recebido pelo cliente.
+    """
+
+    def __init__(self, redis_client: redis.Redis, log_service: AsyncLogService):
+        self.redis = redis_client
+        self.log_service = log_service
+
+    @staticmethod
+    def _persisted(log) -> Tuple[Optional[str], dict]:
+        justification = log.result.justification if log.result else None
+        return None, {"type": "done", "justification": justification}
+
+    async def chunks(self, log: LogOutputSchema, last_id: str = "0") -> AsyncIterator[Optional[Tuple[Optional[str], dict]]]:
+        """
+        Emite (id, entrada) até a entrada `done` ou `error`; entradas montadas a partir do log,
+        e não lidas do stream, vêm sem id. None indica que nada chegou dentro
+        de PROGRESS_HEARTBEAT_SECONDS, para o chamador manter a conexão viva.
+
+        Se o stream não existir mais (análise sem query, falha antes do ranqueamento ou stream
+        expirado), o `done` final traz a justificativa salva no log.
+        """
+        key = justification_key(log.id)
+        if not STREAM_ID.match(last_id):
+            last_id = "0"
+        if not log.query:
+            yield None, {"type": "done", "justification": None}
+            return
+        # LogOutputSchema guarda o status como string (use_enum_values).
+        if Status(log.status) != Status.PROCESSING and not await self.redis.exists(key):
+            yield self._persisted(log)
+            return
+
+        while True:
+            response = await self.redis.xread(
+                {key: last_id}, count=100, block=int(settings.PROGRESS_HEARTBEAT_SECONDS * 1000))
+            if not response:
+                # Nada novo: se a análise já terminou, o stream não vai mais receber entradas
+                # (o worker grava o `done` antes de salvar o status final).
+                current = await self.log_service.get(log.id, ("status", "result"))
+                if Status(current.status) != Status.PROCESSING:
+                    yield self._persisted(current)
+                    return
+                yield None
+                continue
+
+            for entry_id, fields in response[0][1]:
+                last_id = entry_id
+                yield entry_id, fields
+                if fields["type"] in TERMINAL_TYPES:
+                    return
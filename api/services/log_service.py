@@ -1,56 +1,152 @@
+import json
+
 from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
 from models import LogModel
 from pydantic import TypeAdapter
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional, Tuple, Union
 from fastapi import HTTPException, status
-from repositories import CRUDRepository, PaginatedResult
-from schemas import LogCreateSchema, LogUpdateSchema, PaginatedLogsSchema, LogOutputSchema
+from repositories import (
+    AsyncCRUDRepository, InvalidCursorError, InvalidFieldsError, KeysetPage, LogFilters, SUMMARY_FIELDS,
+    TotalMode, build_projection, decode_cursor, encode_cursor, parse_fields)
+from schemas import (
+    Status, LogCreateSchema, LogUpdateSchema, CursorPaginatedLogsSchema, LogOutputSchema, LogView, LogSummarySchema,
+    LogFieldsSchema)
+
+
+def resolve_fields(view: LogView, fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """Campos a projetar: `fields` tem precedência sobre `view`; None significa o log completo."""
+    if fields:
+        try:
+            return parse_fields(fields)
+        except InvalidFieldsError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return SUMMARY_FIELDS if view == LogView.SUMMARY else None
 
 
-class LogService:
-    def __init__(self, repo: CRUDRepository[LogModel, LogCreateSchema, LogUpdateSchema, str]):
+def project_log(doc: dict, fields: Tuple[str, ...]) -> Union[LogSummarySchema, LogFieldsSchema]:
+    """Valida um documento projetado no schema enxuto correspondente, sem passar pelo LogModel."""
+    if fields == SUMMARY_FIELDS:
+        return LogSummarySchema.model_validate(doc)
+    return LogFieldsSchema.model_validate({name: doc[name] for name in ("_id", *fields) if name in doc})
+
+
+class AsyncLogService:
+    def __init__(self, repo: AsyncCRUDRepository[LogModel, LogCreateSchema, LogUpdateSchema, str]):
         self.repo = repo
 
-    def create(self, data: LogCreateSchema) -> LogOutputSchema:
-        log = self.repo.create(data)
+    async def create(self, data: LogCreateSchema) -> LogOutputSchema:
+        log = await self.repo.create(data)
         return LogOutputSchema.model_validate(log)
 
-    def get(self, id: str) -> Optional[LogOutputSchema]:
+    async def create_once(self, data: LogCreateSchema) -> Tuple[LogOutputSchema, bool]:
+        """
+        Cria o log da requisição ou devolve o já existente para o mesmo (user_id, request_id).
+        A unicidade vem do índice único, então envios simultâneos não criam dois logs.
+
+        Um log existente em PROCESSING_FAILED é reaberto: o reenvio inicia a análise de novo no
+        mesmo log, e o worker reaproveita os sumários de arquivos que já tinham sido processados.
+
+        Returns:
+            Tuple[LogOutputSchema, bool]: O log e se a análise deve ser iniciada por esta chamada.
+        """
+        try:
+            return await self.create(data), True
+        except DuplicateKeyError:
+            log = await self.repo.reopen_failed(data.user_id, data.request_id)
+            if log:
+                return LogOutputSchema.model_validate(log), True
+            log = await self.repo.find_by_request(data.user_id, data.request_id)
+            if not log:
+                # O log foi removido entre o insert e a busca.
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="Requisição em andamento, tente novamente"
+                )
+            return LogOutputSchema.model_validate(log), False
+
+    async def get(
+        self, id: str, fields: Optional[Tuple[str, ...]] = None
+    ) -> Union[LogOutputSchema, LogSummarySchema, LogFieldsSchema]:
         if not ObjectId.is_valid(id):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="ID inválido"
             )
 
-        log = self.repo.find_one(id)
+        if fields is None:
+            log = await self.repo.find_one(id)
+        else:
+            log = await self.repo.find_one_projected(id, build_projection(fields))
         if not log:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Log não encontrado"
             )
 
+        if fields is not None:
+            return project_log(log, fields)
         return LogOutputSchema.model_validate(log)
 
-    def get_all(self) -> List[LogOutputSchema]:
-        logs = self.repo.find_all()
+    async def get_all(self) -> List[LogOutputSchema]:
+        logs = await self.repo.find_all()
         return TypeAdapter(list[LogOutputSchema]).validate_python(logs)
 
-    def get_all_paginated(self, skip: int = 0, limit: int = 10) -> PaginatedLogsSchema:
-        paginated: PaginatedResult[LogModel] = self.repo.find_all_paginated(
-            skip, limit)
-        return PaginatedLogsSchema.model_validate(paginated)
+    async def get_page(
+        self, filters: LogFilters, limit: int = 10, cursor: Optional[str] = None,
+        total_mode: TotalMode = TotalMode.NONE, fields: Optional[Tuple[str, ...]] = None
+    ) -> CursorPaginatedLogsSchema:
+        projection = build_projection(fields) if fields is not None else None
+        try:
+            page: KeysetPage = await self.repo.find_page(filters, limit, cursor, total_mode, projection)
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        if fields is not None:
+            page.data = [project_log(doc, fields) for doc in page.data]
+        return CursorPaginatedLogsSchema.model_validate(page)
+
+    # Só os campos expostos na saída; campos internos do documento não saem do Mongo.
+    EXPORT_PROJECTION = {name: 1 for name in LogModel.model_fields if name != "id"}
 
-    def update(self, id: str, data: LogUpdateSchema) -> LogOutputSchema:
-        log = self.get(id)
-        updated_log = self.repo.update(log.id, data)
+    def validate_cursor(self, cursor: Optional[str]) -> None:
+        if cursor:
+            try:
+                decode_cursor(cursor)
+            except InvalidCursorError as e:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    async def export(
+        self, filters: LogFilters, cursor: Optional[str] = None, batch_size: int = 500,
+        fields: Optional[Tuple[str, ...]] = None
+    ) -> AsyncIterator[str]:
+        """
+        Gera os logs como linhas NDJSON, um documento por vez. Cada linha traz `_cursor`, que
+        retoma a exportação logo depois dela se a conexão cair.
+        """
+        projection = self.EXPORT_PROJECTION if fields is None else build_projection(fields)
+        async for doc in self.repo.iter_page_docs(filters, cursor, projection, batch_size):
+            if fields is None:
+                log = LogOutputSchema.model_validate(LogModel(**doc))
+            else:
+                log = project_log(doc, fields)
+            line = log.model_dump(mode="json")
+            line["_cursor"] = encode_cursor(doc["timestamp"], doc["_id"])
+            yield json.dumps(line, ensure_ascii=False) + "\n"
+
+    async def update(self, id: str, data: LogUpdateSchema) -> LogOutputSchema:
+        log = await self.get(id)
+        updated_log = await self.repo.update(log.id, data)
         return LogOutputSchema.model_validate(updated_log)
 
-    def patch_feedback(self, id: str, feedback: bool) -> LogOutputSchema:
-        log = self.get(id)
-        updated_log = self.repo.update(
+    async def mark_failed(self, id: str) -> None:
+        await self.repo.update(id, LogUpdateSchema(status=Status.PROCESSING_FAILED))
+
+    async def patch_feedback(self, id: str, feedback: bool) -> LogOutputSchema:
+        log = await self.get(id)
+        updated_log = await self.repo.update(
             log.id, LogUpdateSchema(feedback=feedback))
         return LogOutputSchema.model_validate(updated_log)
 
-    def delete(self, id: str) -> None:
-        log = self.get(id)
-        self.repo.delete(log.id)
+    async def delete(self, id: str) -> None:
+        log = await self.get(id)
+        await self.repo.delete(log.id)
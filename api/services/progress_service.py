@@ -0,0 +1,63 @@
+import json
+import redis.asyncio as redis
+
+from config import settings
+from schemas import LogOutputSchema, Status
+from typing import AsyncIterator, Optional
+
+TERMINAL_STAGES = ("completed", "failed")
+
+
+def progress_key(log_id: str) -> str:
+    return f"progress:{log_id}"
+
+
+class ProgressService:
+    """Repassa os eventos de progresso publicados pelos workers no canal Redis `progress:<log_id>`."""
+
+    def __init__(self, redis_client: redis.Redis):
+        self.redis = redis_client
+
+    async def snapshot(self, log_id: str) -> Optional[dict]:
+        last_event = await self.redis.hget(progress_key(log_id), "last_event")
+        return json.loads(last_event) if last_event else None
+
+    @staticmethod
+    def _final_event(log: LogOutputSchema) -> dict:
+        stage = "completed" if Status(log.status) == Status.PROCESSED else "failed"
+        return {"log_id": log.id, "stage": stage, "progress": 1.0, "eta_seconds": 0.0}
+
+    async def events(self, log: LogOutputSchema) -> AsyncIterator[Optional[dict]]:
+        """
+        Emite o estado atual e depois cada evento novo até a análise terminar. None indica que
+        nada chegou dentro de PROGRESS_HEARTBEAT_SECONDS, para o chamador manter a conexão viva.
+        """
+        # LogOutputSchema guarda o status como string (use_enum_values).
+        if Status(log.status) != Status.PROCESSING:
+            yield self._final_event(log)
+            return
+
+        pubsub = self.redis.pubsub()
+        # A inscrição vem antes da leitura do snapshot para nenhum evento cair entre os dois.
+        await pubsub.subscribe(progress_key(log.id))
+        try:
+            snapshot = await self.snapshot(log.id)
+            if snapshot:
+                yield snapshot
+                if snapshot["stage"] in TERMINAL_STAGES:
+                    return
+
+            while True:
+                message = await pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=settings.PROGRESS_HEARTBEAT_SECONDS)
+                if message is None:
+                    yield None
+                    continue
+
+                event = json.loads(message["data"])
+                yield event
+                if event["stage"] in TERMINAL_STAGES:
+                    return
+        finally:
+            await pubsub.unsubscribe()
+            await pubsub.aclose()
@@ -0,0 +1,135 @@
+import os
+import anyio
+import asyncio
+import hashlib
+import logging
+
+from http import HTTPStatus
+from config import settings
+from dataclasses import dataclass
+from typing import List, Optional
+from fastapi import HTTPException, UploadFile
+from services.blob_store import get_blob_store
+from repositories.blob_repository_motor import BlobRepositoryMotor
+
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+# Assinaturas (magic bytes) dos formatos aceitos; o content_type enviado pelo cliente é ignorado.
+FILE_SIGNATURES = {
+    b"%PDF-": "application/pdf",
+    b"\xff\xd8\xff": "image/jpeg",
+    b"\x89PNG\r\n\x1a\n": "image/png",
+}
+
+
+def detect_content_type(head: bytes) -> Optional[str]:
+    for signature, content_type in FILE_SIGNATURES.items():
+        if head.startswith(signature):
+            return content_type
+    return None
+
+
+@dataclass
+class StoredUpload:
+    filename: str
+    file_hash: str
+    size: int
+    content_type: str
+
+    def to_task_arg(self) -> dict:
+        return {"filename": self.filename, "file_hash": self.file_hash, "content_type": self.content_type}
+
+
+class UploadBudget:
+    """Bytes ainda permitidos na requisição, compartilhados pelos uploads gravados em paralelo."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.used = 0
+
+    def consume(self, size: int) -> None:
+        self.used += size
+        if self.used > self.max_bytes:
+            raise HTTPException(
+                status_code=HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                detail=f"A requisição excede o limite de {self.max_bytes} bytes")
+
+
+def _too_large(filename: str) -> HTTPException:
+    return HTTPException(
+        status_code=HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Arquivo excede o limite de {settings.UPLOAD_MAX_FILE_BYTES} bytes: {filename}")
+
+
+async def store_upload(file: UploadFile, budget: UploadBudget, blobs: BlobRepositoryMotor) -> StoredUpload:
+    """
+    Grava o upload no blob store em blocos de tamanho fixo, calculando o SHA-256 durante a cópia.
+
+    O tipo é validado pelos primeiros bytes e os limites de tamanho são verificados a cada bloco,
+    então um arquivo inválido ou grande demais é rejeitado sem ser lido por inteiro. Conteúdos
+    já armazenados não ocupam espaço novo: o blob é endereçado pelo hash.
+    """
+    original_name = os.path.basename(file.filename or "arquivo")
+    if file.size is not None and file.size > settings.UPLOAD_MAX_FILE_BYTES:
+        raise _too_large(original_name)
+
+    blob_store = get_blob_store()
+    partial_location = await anyio.to_thread.run_sync(blob_store.staging_path)
+
+    digest = hashlib.sha256()
+    size = 0
+    content_type = None
+    try:
+        async with await anyio.open_file(partial_location, "wb") as out:
+            while chunk := await file.read(settings.UPLOAD_CHUNK_SIZE):
+                if content_type is None:
+                    content_type = detect_content_type(chunk)
+                    if content_type is None:
+                        raise HTTPException(
+                            status_code=HTTPStatus.BAD_REQUEST,
+                            detail=f"Arquivo não suportado: {original_name}")
+
+                size += len(chunk)
+                if size > settings.UPLOAD_MAX_FILE_BYTES:
+                    raise _too_large(original_name)
+                budget.consume(len(chunk))
+
+                digest.update(chunk)
+                await out.write(chunk)
+
+        if not size:
+            raise HTTPException(
+                status_code=HTTPStatus.BAD_REQUEST,
+                detail=f"Arquivo vazio: {original_name}")
+
+        file_hash = digest.hexdigest()
+        await blobs.touch(file_hash, size, content_type)
+        await anyio.to_thread.run_sync(blob_store.commit, partial_location, file_hash)
+    except BaseException:
+        await anyio.to_thread.run_sync(blob_store.discard, partial_location)
+        raise
+
+    return StoredUpload(original_name, file_hash, size, content_type)
+
+
+async def store_uploads(files: List[UploadFile], blobs: BlobRepositoryMotor) -> List[StoredUpload]:
+    """
+    Grava todos os uploads concorrentemente. Se algum falhar, os blobs já gravados ficam sem
+    referência e são removidos pelo GC dos workers, pois podem ser compartilhados com outros logs.
+    """
+    if len(files) > settings.UPLOAD_MAX_FILES:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail=f"Envie no máximo {settings.UPLOAD_MAX_FILES} arquivos por requisição")
+
+    budget = UploadBudget(settings.UPLOAD_MAX_REQUEST_BYTES)
+    results = await asyncio.gather(
+        *(store_upload(file, budget, blobs) for file in files), return_exceptions=True)
+
+    errors = [result for result in results if isinstance(result, BaseException)]
+    if errors:
+        raise errors[0]
+
+    logger.info(f"{len(results)} arquivo(s) gravado(s), {budget.used} bytes")
+    return results
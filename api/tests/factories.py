@@ -0,0 +1,10 @@
+from schemas import LogCreateSchema, Status
+
+
+def new_log(**overrides) -> LogCreateSchema:
+    return LogCreateSchema(**{
+        "request_id": "req-1",
+        "user_id": "user-1",
+        "status": Status.PROCESSING,
+        **overrides,
+    })
@@ -0,0 +1,141 @@
+import anyio
+import pytest
+
+from uuid import uuid4
+from fastapi import FastAPI
+from functools import partial
+from importlib import import_module
+from fastapi.testclient import TestClient
+from services.blob_store import LocalBlobStore
+from services.log_service import AsyncLogService
+from repositories import BlobRepositoryMotor, LogRepositoryMotor
+from tests.factories import new_log
+
+# Os pacotes reexportam os objetos com o mesmo nome dos módulos (ex.: o router `analyzer`).
+analyzer_module = import_module("routers.analyzer")
+blob_store_module = import_module("services.blob_store")
+
+PDF = ("curriculo.pdf", b"%PDF-1.4 conteudo", "application/pdf")
+
+
+class FakeCelery:
+    def __init__(self):
+        self.sent = []
+        self.error = None
+
+    def send_task(self, name, args):
+        if self.error:
+            raise self.error
+        self.sent.append((name, args))
+
+
+@pytest.fixture
+def celery(monkeypatch):
+    fake = FakeCelery()
+    monkeypatch.setattr(analyzer_module, "celery", fake)
+    return fake
+
+
+@pytest.fixture
+def log_service(log_collection):
+    repo = LogRepositoryMotor(log_collection)
+    anyio.run(repo.ensure_indexes)
+    return AsyncLogService(repo)
+
+
+@pytest.fixture
+def blobs(mongo_db):
+    return BlobRepositoryMotor(mongo_db["blobs"], 3600, 60)
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path, celery, log_service, blobs):
+    monkeypatch.setattr(blob_store_module, "_blob_store", LocalBlobStore(str(tmp_path)))
+    app = FastAPI()
+    app.include_router(analyzer_module.analyzer)
+    app.dependency_overrides[analyzer_module.get_log_service] = lambda: log_service
+    app.dependency_overrides[analyzer_module.get_blob_repository] = lambda: blobs
+    return TestClient(app, raise_server_exceptions=False)
+
+
+def analyze(client, request_id, user_id, file=PDF):
+    return client.post("/analyze-resume", files=[("files", file)],
+                       data={"request_id": str(request_id), "user_id": str(user_id), "query": "python"})
+
+
+def status_of(log_collection, user_id, request_id) -> str:
+    doc = anyio.run(partial(log_collection.find_one, {"user_id": str(user_id), "request_id": str(request_id)}))
+    return doc["status"]
+
+
+def test_repeated_request_returns_existing_log_without_dispatching(client, celery):
+    request_id, user_id = uuid4(), uuid4()
+    first = analyze(client, request_id, user_id).json()
+    second = analyze(client, request_id, user_id).json()
+
+    assert second["log_id"] == first["log_id"]
+    assert (first["duplicate"], second["duplicate"]) == (False, True)
+    assert len(celery.sent) == 1
+
+
+def test_dispatch_failure_marks_log_failed_and_resend_redispatches(client, celery, log_collection):
+    request_id, user_id = uuid4(), uuid4()
+    celery.error = ConnectionError("broker indisponível")
+    assert analyze(client, request_id, user_id).status_code == 500
+    assert status_of(log_collection, user_id, request_id) == "PROCESSING_FAILED"
+
+    celery.error = None
+    response = analyze(client, request_id, user_id).json()
+    assert response["duplicate"] is False
+    assert celery.sent[0][1][0] == response["log_id"]
+    assert status_of(log_collection, user_id, request_id) == "PROCESSING"
+
+
+def test_reference_failure_marks_log_failed(client, celery, blobs, log_collection, monkeypatch):
+    async def fail(*args):
+        raise ConnectionError("mongo indisponível")
+    monkeypatch.setattr(blobs, "add_references", fail)
+
+    request_id, user_id = uuid4(), uuid4()
+    assert analyze(client, request_id, user_id).status_code == 500
+    assert status_of(log_collection, user_id, request_id) == "PROCESSING_FAILED"
+    assert celery.sent == []
+
+
+def test_rejected_upload_can_be_resent_with_the_same_request_id(client, celery, log_collection):
+    request_id, user_id = uuid4(), uuid4()
+    assert analyze(client, request_id, user_id, file=("notas.txt", b"texto", "text/plain")).status_code == 400
+    assert status_of(log_collection, user_id, request_id) == "PROCESSING_FAILED"
+
+    assert analyze(client, request_id, user_id).json()["duplicate"] is False
+    assert len(celery.sent) == 1
+
+
+@pytest.mark.anyio
+async def test_failed_log_is_reopened_by_a_single_resend(log_collection):
+    repo = LogRepositoryMotor(log_collection)
+    await repo.ensure_indexes()
+    service = AsyncLogService(repo)
+    log = await service.create(new_log())
+    await service.mark_failed(log.id)
+
+    results = [await service.create_once(new_log()) for _ in range(2)]
+    assert [started for _, started in results] == [True, False]
+    assert {reopened.id for reopened, _ in results} == {log.id}
+
+
+@pytest.mark.anyio
+async def test_reopen_keeps_summaries_and_drops_failed_results(log_collection):
+    repo = LogRepositoryMotor(log_collection)
+    await repo.ensure_indexes()
+    service = AsyncLogService(repo)
+    log = await service.create(new_log())
+    await log_collection.update_one({}, {"$set": {"status": "PROCESSING_FAILED", "partial_results": [
+        {"filename": "a.pdf", "file_hash": "aa", "status": "SUMMARIZED",
+         "summary": {"candidate_name": "Maria", "summary": "Python"}},
+        {"filename": "b.pdf", "file_hash": "bb", "status": "FAILED", "error": "OCR"},
+    ]}})
+
+    reopened, started = await service.create_once(new_log())
+    assert started and reopened.id == log.id
+    assert [item.filename for item in reopened.partial_results] == ["a.pdf"]
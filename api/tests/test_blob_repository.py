@@ -0,0 +1,77 @@
+import anyio
+import pytest
+
+from datetime import datetime, timedelta, timezone
+from repositories import BlobRepositoryMotor
+
+TTL = 3600
+DELETE_TIMEOUT = 60
+
+
+@pytest.fixture
+def blob_collection(mongo_db):
+    return mongo_db["blobs"]
+
+
+@pytest.fixture
+def blobs(blob_collection):
+    return BlobRepositoryMotor(blob_collection, TTL, DELETE_TIMEOUT)
+
+
+def aware(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+@pytest.mark.anyio
+async def test_touch_registers_new_blob(blobs, blob_collection):
+    await blobs.touch("aa01", 10, "application/pdf")
+    doc = await blob_collection.find_one({"_id": "aa01"})
+    assert doc["refs"] == [] and doc["size"] == 10
+    assert "deleting_at" not in doc
+
+
+@pytest.mark.anyio
+async def test_touch_waits_while_gc_is_deleting_the_blob(blobs, blob_collection):
+    now = datetime.now(timezone.utc)
+    await blob_collection.insert_one({"_id": "bb01", "refs": [], "deleting_at": now})
+    touched = anyio.Event()
+
+    async def touch():
+        await blobs.touch("bb01", 10, "application/pdf")
+        touched.set()
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(touch)
+        await anyio.sleep(0.2)
+        assert not touched.is_set()
+        # GC termina: arquivo apagado e documento removido.
+        await blob_collection.delete_one({"_id": "bb01", "deleting_at": now})
+        with anyio.fail_after(1):
+            await touched.wait()
+
+    doc = await blob_collection.find_one({"_id": "bb01"})
+    assert doc["size"] == 10 and "deleting_at" not in doc
+
+
+@pytest.mark.anyio
+async def test_touch_takes_over_a_stale_mark(blobs, blob_collection):
+    stale = datetime.now(timezone.utc) - timedelta(seconds=DELETE_TIMEOUT + 1)
+    await blob_collection.insert_one({"_id": "cc01", "refs": ["log-1"], "deleting_at": stale})
+
+    with anyio.fail_after(1):
+        await blobs.touch("cc01", 10, "application/pdf")
+
+    doc = await blob_collection.find_one({"_id": "cc01"})
+    assert "deleting_at" not in doc and doc["refs"] == ["log-1"]
+
+
+@pytest.mark.anyio
+async def test_touch_extends_expired_references(blobs, blob_collection):
+    now = datetime.now(timezone.utc)
+    await blob_collection.insert_one(
+        {"_id": "dd01", "refs": ["log-1"], "updated_at": now, "expires_at": now - timedelta(days=1)})
+
+    await blobs.touch("dd01", 10, "application/pdf")
+
+    doc = await blob_collection.find_one({"_id": "dd01"})
+    assert aware(doc["expires_at"]) > now
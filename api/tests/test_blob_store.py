@@ -0,0 +1,19 @@
+from services.blob_store import LocalBlobStore
+from shared.blob_layout import BlobLayout
+
+FILE_HASH = "ab" + "0" * 62
+
+
+def test_committed_upload_is_listed_by_the_shared_layout(tmp_path):
+    store = LocalBlobStore(str(tmp_path))
+    staging_path = store.staging_path()
+    with open(staging_path, "wb") as f:
+        f.write(b"%PDF-1.4 conteudo")
+    pending = store.staging_path()
+    open(pending, "wb").close()
+
+    store.commit(staging_path, FILE_HASH)
+
+    # Os workers leem e limpam os blobs pelo mesmo layout; o upload em andamento fica de fora.
+    assert [entry.name for entry in BlobLayout(str(tmp_path)).blob_entries()] == [FILE_HASH]
+    assert store.path(FILE_HASH) == str(tmp_path / "ab" / FILE_HASH)
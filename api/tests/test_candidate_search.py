@@ -0,0 +1,51 @@
+import pytest
+
+from http import HTTPStatus
+from fastapi import FastAPI
+from importlib import import_module
+from fastapi.testclient import TestClient
+from celery.exceptions import TimeoutError
+
+candidates_module = import_module("routers.candidates")
+
+
+class FakeTask:
+    def __init__(self, error: Exception):
+        self.error = error
+
+    def get(self, timeout=None):
+        raise self.error
+
+
+class FakeCelery:
+    def __init__(self):
+        self.error = None
+
+    def send_task(self, name, args):
+        return FakeTask(self.error)
+
+
+@pytest.fixture
+def celery(monkeypatch):
+    fake = FakeCelery()
+    monkeypatch.setattr(candidates_module, "celery", fake)
+    return fake
+
+
+@pytest.fixture
+def client(celery):
+    app = FastAPI()
+    app.include_router(candidates_module.candidates)
+    return TestClient(app, raise_server_exceptions=False)
+
+
+@pytest.mark.parametrize("error, status_code", [
+    (TimeoutError(), HTTPStatus.GATEWAY_TIMEOUT),
+    (RuntimeError("modelo de embedding indisponível"), HTTPStatus.BAD_GATEWAY),
+])
+def test_embedding_failure_returns_a_gateway_error(client, celery, error, status_code):
+    celery.error = error
+
+    response = client.post("/candidates/search", json={"query": "Desenvolvedor Python"})
+    assert response.status_code == status_code
+    assert "embedding da consulta" in response.json()["detail"]
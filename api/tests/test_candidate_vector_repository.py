@@ -0,0 +1,92 @@
+import os
+import json
+import shutil
+import numpy as np
+import pytest
+
+from shared.similarity import normalize_rows
+from shared.ivf_index import IVFIndex, IVFLists
+from repositories.candidate_vector_repository import CandidateVectorRepository
+
+
+def write_store(path: str, vectors: np.ndarray) -> None:
+    """Grava os arquivos no mesmo layout do CandidateVectorStore dos workers."""
+    os.makedirs(path, exist_ok=True)
+    lines = [(json.dumps({"row": i}) + "\n").encode() for i in range(len(vectors))]
+    offsets = np.concatenate(([0], np.cumsum([len(line) for line in lines])[:-1])).astype(np.uint64)
+    vectors.astype(np.float32).tofile(os.path.join(path, "vectors.f32"))
+    offsets.tofile(os.path.join(path, "metadata.idx"))
+    with open(os.path.join(path, "metadata.jsonl"), "wb") as f:
+        f.write(b"".join(lines))
+    with open(os.path.join(path, "header.json"), "w") as f:
+        json.dump({"dim": vectors.shape[1], "count": len(vectors),
+                   "metadata_bytes": sum(len(line) for line in lines)}, f)
+
+
+@pytest.fixture
+def vectors():
+    rng = np.random.default_rng(0)
+    return normalize_rows(rng.standard_normal((400, 16), dtype=np.float32))
+
+
+@pytest.fixture
+def store(tmp_path, vectors):
+    path = str(tmp_path / "store")
+    write_store(path, vectors)
+    return path
+
+
+def brute_force_rows(vectors: np.ndarray, query: np.ndarray, k: int) -> list:
+    return np.argsort(-(vectors @ normalize_rows(query)[0]), kind="stable")[:k].tolist()
+
+
+def result_rows(results: list) -> list:
+    return [result["row"] for result in results]
+
+
+def test_search_without_ivf_is_exhaustive(store, vectors):
+    query = vectors[7]
+    results = CandidateVectorRepository(store).search(query, k=5, threshold=-1.0)
+    assert result_rows(results) == brute_force_rows(vectors, query, 5)
+    assert results[0]["score"] == pytest.approx(1.0, abs=1e-5)
+
+
+def test_search_probing_every_list_matches_brute_force(store, vectors):
+    IVFIndex(store).save(IVFLists.build(vectors, 8), len(vectors))
+    query = vectors[42]
+    results = CandidateVectorRepository(store).search(query, k=10, threshold=-1.0, nprobe=8)
+    assert result_rows(results) == brute_force_rows(vectors, query, 10)
+
+
+def test_rebuild_with_different_nlist_is_picked_up(store, vectors):
+    index = IVFIndex(store)
+    repository = CandidateVectorRepository(store)
+    index.save(IVFLists.build(vectors, 4), len(vectors))
+    repository.search(vectors[0], k=3, threshold=-1.0, nprobe=4)
+
+    index.save(IVFLists.build(vectors, 16, seed=1), len(vectors))
+    results = repository.search(vectors[0], k=3, threshold=-1.0, nprobe=16)
+    assert result_rows(results) == brute_force_rows(vectors, vectors[0], 3)
+
+
+def test_missing_generation_falls_back_to_brute_force(store, vectors):
+    index = IVFIndex(store)
+    index.save(IVFLists.build(vectors, 4), len(vectors))
+    # Ponteiro lido antes de a geração ser removida por um rebuild concorrente.
+    shutil.rmtree(os.path.join(store, IVFIndex.GENERATIONS, index.read_meta()["generation"]))
+
+    results = CandidateVectorRepository(store).search(vectors[3], k=5, threshold=-1.0)
+    assert result_rows(results) == brute_force_rows(vectors, vectors[3], 5)
+
+
+def test_pointer_ahead_of_files_falls_back_to_brute_force(store, vectors):
+    IVFIndex(store).save(IVFLists.build(vectors, 4), len(vectors))
+    meta_path = os.path.join(store, IVFIndex.META)
+    with open(meta_path) as f:
+        meta = json.load(f)
+    # nlist do ponteiro diferente do gravado na geração: antes causava erro no reshape.
+    with open(meta_path, "w") as f:
+        json.dump({**meta, "nlist": 5}, f)
+
+    results = CandidateVectorRepository(store).search(vectors[9], k=5, threshold=-1.0)
+    assert result_rows(results) == brute_force_rows(vectors, vectors[9], 5)
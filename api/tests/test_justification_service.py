@@ -0,0 +1,99 @@
+import json
+import anyio
+import pytest
+
+from bson import ObjectId
+from fastapi import FastAPI
+from config import settings
+from fakeredis import aioredis
+from functools import partial
+from importlib import import_module
+from fastapi.testclient import TestClient
+from repositories import LogRepositoryMotor
+from schemas import AnalysisOutputSchema, Status
+from services.log_service import AsyncLogService
+from services.justification_service import JustificationService, justification_key
+from tests.factories import new_log
+
+progress_module = import_module("routers.progress")
+
+QUERY = "Desenvolvedor Python"
+
+
+@pytest.fixture
+def redis_client():
+    return aioredis.FakeRedis(decode_responses=True)
+
+
+@pytest.fixture
+def log_service(log_collection):
+    return AsyncLogService(LogRepositoryMotor(log_collection))
+
+
+async def insert_log(log_collection, status: Status, justification=None) -> str:
+    result = AnalysisOutputSchema(resumes=[], justification=justification) if justification else None
+    log = new_log(status=status, query=QUERY, result=result)
+    return str((await log_collection.insert_one(log.model_dump())).inserted_id)
+
+
+@pytest.mark.anyio
+async def test_client_connected_before_the_stream_exists_receives_the_chunks(
+        redis_client, log_service, log_collection, monkeypatch):
+    monkeypatch.setattr(settings, "PROGRESS_HEARTBEAT_SECONDS", 0.01)
+    log = await log_service.get(await insert_log(log_collection, Status.PROCESSING))
+    key = justification_key(log.id)
+
+    entries = []
+    async for item in JustificationService(redis_client, log_service).chunks(log):
+        if item is None:
+            # O worker só começa a gravar depois que o cliente já está esperando.
+            if not await redis_client.exists(key):
+                await redis_client.xadd(key, {"type": "chunk", "text": "Candidato "})
+                await redis_client.xadd(key, {"type": "done"})
+            continue
+        entries.append(item[1])
+
+    assert entries == [{"type": "chunk", "text": "Candidato "}, {"type": "done"}]
+
+
+@pytest.mark.anyio
+async def test_analysis_finished_while_waiting_sends_the_persisted_justification(
+        redis_client, log_service, log_collection, monkeypatch):
+    monkeypatch.setattr(settings, "PROGRESS_HEARTBEAT_SECONDS", 0.01)
+    log_id = await insert_log(log_collection, Status.PROCESSING)
+    log = await log_service.get(log_id)
+    await log_collection.update_one(
+        {"_id": ObjectId(log_id)}, {"$set": {"status": Status.PROCESSED.value,
+                                   "result": {"resumes": [], "justification": "Texto salvo"}}})
+
+    items = [item async for item in JustificationService(redis_client, log_service).chunks(log)]
+    assert items == [(None, {"type": "done", "justification": "Texto salvo"})]
+
+
+@pytest.fixture
+def client(log_collection, redis_client):
+    app = FastAPI()
+    app.include_router(progress_module.progress)
+    app.dependency_overrides[progress_module.get_log_service] = lambda: AsyncLogService(LogRepositoryMotor(log_collection))
+    app.dependency_overrides[progress_module.get_justification_service] = \
+        lambda: JustificationService(redis_client, AsyncLogService(LogRepositoryMotor(log_collection)))
+    return TestClient(app)
+
+
+def test_reconnecting_with_last_event_id_resumes_after_that_entry(client, log_collection, redis_client):
+    log_id = anyio.run(insert_log, log_collection, Status.PROCESSING)
+    key = justification_key(log_id)
+    first_id = anyio.run(redis_client.xadd, key, {"type": "chunk", "text": "Candidato "})
+    second_id = anyio.run(redis_client.xadd, key, {"type": "chunk", "text": "mais adequado"})
+    done_id = anyio.run(redis_client.xadd, key, {"type": "done"})
+
+    body = client.get(f"/logs/{log_id}/justification", headers={"Last-Event-ID": first_id}).text
+    assert body == (f"id: {second_id}\nevent: chunk\ndata: {json.dumps({'text': 'mais adequado'})}\n\n"
+                    f"id: {done_id}\nevent: done\ndata: {{}}\n\n")
+
+
+def test_finished_analysis_with_expired_stream_sends_the_persisted_justification(client, log_collection):
+    log_id = anyio.run(partial(insert_log, log_collection, Status.PROCESSED, justification="Texto salvo"))
+
+    body = client.get(f"/logs/{log_id}/justification").text
+    assert body == f"event: done\ndata: {json.dumps({'justification': 'Texto salvo'})}\n\n"
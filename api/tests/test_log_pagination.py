@@ -0,0 +1,85 @@
+import pytest
+
+from bson import ObjectId
+from fastapi import HTTPException
+from datetime import datetime, timedelta
+from repositories import (
+    InvalidCursorError, LogFilters, LogRepositoryMotor, decode_cursor, encode_cursor, keyset_query, split_page)
+from services.log_service import AsyncLogService
+from tests.factories import new_log
+
+START = datetime(2025, 8, 2, 14, 0)
+
+
+@pytest.fixture
+def log_service(log_collection):
+    return AsyncLogService(LogRepositoryMotor(log_collection))
+
+
+async def create_logs(log_service, count: int, same_timestamp_every: int = 1) -> list:
+    """Cria `count` logs; a cada `same_timestamp_every` logs o timestamp se repete."""
+    logs = []
+    for i in range(count):
+        timestamp = START + timedelta(minutes=i // same_timestamp_every)
+        logs.append(await log_service.create(new_log(request_id=f"req-{i}", timestamp=timestamp)))
+    return logs
+
+
+def test_cursor_roundtrip():
+    id = ObjectId()
+    assert decode_cursor(encode_cursor(START, id)) == (START, id)
+
+
+@pytest.mark.parametrize("cursor", [
+    "não-é-base64",
+    "e30",  # {}
+    encode_cursor(START, ObjectId()).upper(),
+    "eyJ0IjoiMjAyNS0wOC0wMlQxNDowMDowMCIsImlkIjoieHl6In0",  # id que não é ObjectId
+])
+def test_invalid_cursor_is_rejected(cursor):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor)
+
+
+def test_keyset_query_combines_filters_and_cursor():
+    id = ObjectId()
+    query = keyset_query(LogFilters(user_id="user-1"), encode_cursor(START, id))
+    assert query == {"$and": [{"user_id": "user-1"}, {"$or": [
+        {"timestamp": {"$lt": START}},
+        {"timestamp": START, "_id": {"$lt": id}},
+    ]}]}
+
+
+def test_split_page_returns_cursor_only_when_there_is_more():
+    docs = [{"timestamp": START, "_id": ObjectId()} for _ in range(3)]
+    assert split_page(docs, 3) == (docs, None)
+
+    page, cursor = split_page(docs, 2)
+    assert page == docs[:2]
+    assert decode_cursor(cursor) == (START, docs[1]["_id"])
+
+
+@pytest.mark.anyio
+async def test_pages_cover_every_log_once_in_order(log_service):
+    logs = await create_logs(log_service, 7, same_timestamp_every=2)
+
+    seen, cursor = [], None
+    while True:
+        page = await log_service.get_page(LogFilters(), limit=3, cursor=cursor)
+        seen.extend(log.request_id for log in page.data)
+        cursor = page.next_cursor
+        if not cursor:
+            break
+
+    expected = sorted(logs, key=lambda log: (log.timestamp, ObjectId(log.id)), reverse=True)
+    assert seen == [log.request_id for log in expected]
+
+
+@pytest.mark.anyio
+async def test_invalid_cursor_returns_400(log_service):
+    with pytest.raises(HTTPException) as excinfo:
+        await log_service.get_page(LogFilters(), limit=3, cursor="não-é-base64")
+    assert excinfo.value.status_code == 400
+    with pytest.raises(HTTPException) as excinfo:
+        log_service.validate_cursor("e30")
+    assert excinfo.value.status_code == 400
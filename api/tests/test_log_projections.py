@@ -0,0 +1,83 @@
+import json
+import anyio
+import pytest
+
+from fastapi import FastAPI
+from importlib import import_module
+from fastapi.testclient import TestClient
+from repositories import InvalidFieldsError, LogRepositoryMotor, SUMMARY_FIELDS, build_projection, parse_fields
+from services.log_service import AsyncLogService
+from tests.factories import new_log
+
+logs_module = import_module("routers.logs")
+
+SUMMARY_KEYS = {"id", *SUMMARY_FIELDS}
+
+
+@pytest.fixture
+def log_service(log_collection):
+    return AsyncLogService(LogRepositoryMotor(log_collection))
+
+
+@pytest.fixture
+def log_ids(log_service):
+    async def create():
+        return [
+            (await log_service.create(new_log(request_id=f"req-{i}", query="python", feedback=True))).id
+            for i in range(3)
+        ]
+    return anyio.run(create)
+
+
+@pytest.fixture
+def client(log_service):
+    app = FastAPI()
+    app.include_router(logs_module.logs)
+    app.dependency_overrides[logs_module.get_log_service] = lambda: log_service
+    return TestClient(app)
+
+
+def test_parse_fields_keeps_order_and_drops_id():
+    assert parse_fields(" status,id,feedback,status ") == ("status", "feedback")
+    with pytest.raises(InvalidFieldsError):
+        parse_fields("status,senha")
+
+
+def test_projection_always_includes_cursor_key():
+    assert build_projection(("status",)) == {"status": 1, "timestamp": 1}
+
+
+def test_summary_view_omits_result(client, log_ids):
+    data = client.get("/logs/paginated", params={"view": "summary"}).json()["data"]
+    assert len(data) == 3
+    assert all(set(item) == SUMMARY_KEYS for item in data)
+
+
+def test_fields_return_only_requested_keys(client, log_ids):
+    data = client.get("/logs/paginated", params={"fields": "status,feedback"}).json()["data"]
+    assert data and all(set(item) == {"id", "status", "feedback"} for item in data)
+
+
+def test_fields_take_precedence_over_view(client, log_ids):
+    data = client.get("/logs/paginated", params={"view": "summary", "fields": "query"}).json()["data"]
+    assert all(set(item) == {"id", "query"} for item in data)
+
+
+def test_full_view_is_the_default(client, log_ids):
+    item = client.get("/logs/paginated").json()["data"][0]
+    assert {"result", "partial_results", "summary_cache"} <= set(item)
+
+
+def test_unknown_field_is_rejected(client, log_ids):
+    assert client.get("/logs/paginated", params={"fields": "senha"}).status_code == 400
+
+
+def test_get_one_with_fields(client, log_ids):
+    item = client.get(f"/logs/{log_ids[0]}", params={"fields": "request_id,status"}).json()
+    assert item == {"id": log_ids[0], "request_id": "req-0", "status": "PROCESSING"}
+
+
+def test_export_with_fields(client, log_ids):
+    lines = [json.loads(line) for line in client.get("/logs/export", params={"fields": "status"}).text.splitlines()]
+    assert len(lines) == 3
+    assert all(set(line) == {"id", "status", "_cursor"} for line in lines)
@@ -0,0 +1,27 @@
+import pytest
+
+from bson import ObjectId
+from repositories import LogRepositoryMotor
+from services.log_service import AsyncLogService
+from tests.factories import new_log
+
+
+@pytest.mark.anyio
+async def test_new_log_is_stored_with_zeroed_cache_counters(log_collection):
+    log = await AsyncLogService(LogRepositoryMotor(log_collection)).create(new_log())
+
+    doc = await log_collection.find_one({"_id": ObjectId(log.id)})
+    assert doc["summary_cache"] == {"hits": 0, "misses": 0}
+
+
+@pytest.mark.anyio
+async def test_worker_counters_increment_a_log_created_by_the_api(log_collection):
+    log = await AsyncLogService(LogRepositoryMotor(log_collection)).create(new_log())
+
+    # Mesmas atualizações feitas por extract_resume_text e store_summary no worker.
+    await log_collection.update_one({"_id": ObjectId(log.id)}, {"$inc": {"summary_cache.hits": 1}})
+    await log_collection.update_one({"_id": ObjectId(log.id)}, {"$inc": {"summary_cache.misses": 1}})
+    await log_collection.update_one({"_id": ObjectId(log.id)}, {"$inc": {"summary_cache.misses": 1}})
+
+    doc = await log_collection.find_one({"_id": ObjectId(log.id)})
+    assert doc["summary_cache"] == {"hits": 1, "misses": 2}
@@ -0,0 +1,112 @@
+import json
+import anyio
+import pytest
+
+from bson import ObjectId
+from fastapi import FastAPI
+from config import settings
+from fakeredis import aioredis
+from functools import partial
+from importlib import import_module
+from fastapi.testclient import TestClient
+from repositories import LogRepositoryMotor
+from schemas import LogOutputSchema, Status
+from services.log_service import AsyncLogService
+from services.progress_service import ProgressService, progress_key
+from tests.factories import new_log
+
+progress_module = import_module("routers.progress")
+
+
+def output_log(status: Status) -> LogOutputSchema:
+    return LogOutputSchema(id=str(ObjectId()), **new_log(status=status).model_dump())
+
+
+def event(log: LogOutputSchema, stage: str, progress: float) -> dict:
+    return {"log_id": log.id, "stage": stage, "progress": progress, "eta_seconds": 1.0}
+
+
+@pytest.fixture
+def redis_client():
+    return aioredis.FakeRedis(decode_responses=True)
+
+
+async def collect(service: ProgressService, log: LogOutputSchema, after_first=None) -> list:
+    """Eventos emitidos até o fim do stream, sem os heartbeats (None)."""
+    events = []
+    async for item in service.events(log):
+        if item is None:
+            continue
+        events.append(item)
+        if after_first and len(events) == 1:
+            await after_first()
+    return events
+
+
+@pytest.mark.anyio
+async def test_running_analysis_relays_snapshot_and_published_events(redis_client):
+    log = output_log(Status.PROCESSING)
+    snapshot = event(log, "ocr", 0.25)
+    await redis_client.hset(progress_key(log.id), "last_event", json.dumps(snapshot))
+
+    async def publish():
+        # Publicado depois da inscrição, como faria o worker durante a análise.
+        for stage, progress in (("ranking", 0.9), ("completed", 1.0)):
+            await redis_client.publish(progress_key(log.id), json.dumps(event(log, stage, progress)))
+
+    events = await collect(ProgressService(redis_client), log, after_first=publish)
+    assert [item["stage"] for item in events] == ["ocr", "ranking", "completed"]
+
+
+@pytest.mark.anyio
+async def test_terminal_snapshot_ends_the_stream(redis_client):
+    log = output_log(Status.PROCESSING)
+    await redis_client.hset(progress_key(log.id), "last_event", json.dumps(event(log, "failed", 1.0)))
+
+    assert [item["stage"] for item in await collect(ProgressService(redis_client), log)] == ["failed"]
+
+
+@pytest.mark.anyio
+async def test_running_analysis_without_events_sends_heartbeats(redis_client, monkeypatch):
+    monkeypatch.setattr(settings, "PROGRESS_HEARTBEAT_SECONDS", 0.01)
+    log = output_log(Status.PROCESSING)
+
+    events = ProgressService(redis_client).events(log)
+    assert [await events.__anext__() for _ in range(2)] == [None, None]
+    await events.aclose()
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("status, stage", [(Status.PROCESSED, "completed"), (Status.PROCESSING_FAILED, "failed")])
+async def test_finished_analysis_sends_a_single_final_event(redis_client, status, stage):
+    log = output_log(status)
+    assert await collect(ProgressService(redis_client), log) == [
+        {"log_id": log.id, "stage": stage, "progress": 1.0, "eta_seconds": 0.0}]
+
+
+@pytest.fixture
+def client(log_collection, redis_client):
+    app = FastAPI()
+    app.include_router(progress_module.progress)
+    app.dependency_overrides[progress_module.get_log_service] = lambda: AsyncLogService(LogRepositoryMotor(log_collection))
+    app.dependency_overrides[progress_module.get_progress_service] = lambda: ProgressService(redis_client)
+    return TestClient(app)
+
+
+def create_log(log_collection, status: Status) -> str:
+    return str(anyio.run(partial(log_collection.insert_one, new_log(status=status).model_dump())).inserted_id)
+
+
+def test_sse_endpoint_streams_progress_of_a_running_analysis(client, log_collection, redis_client):
+    log_id = create_log(log_collection, Status.PROCESSING)
+    snapshot = {"log_id": log_id, "stage": "completed", "progress": 1.0, "eta_seconds": 0.0}
+    anyio.run(partial(redis_client.hset, progress_key(log_id), "last_event", json.dumps(snapshot)))
+
+    body = client.get(f"/logs/{log_id}/events").text
+    assert body == f"event: progress\ndata: {json.dumps(snapshot)}\n\n"
+
+
+def test_websocket_reports_a_finished_analysis_as_completed(client, log_collection):
+    log_id = create_log(log_collection, Status.PROCESSED)
+    with client.websocket_connect(f"/logs/{log_id}/ws") as websocket:
+        assert websocket.receive_json()["stage"] == "completed"
@@ -0,0 +1,145 @@
+"""
+Servidor falso da API Gemini que aplica cotas de requisições e tokens por minuto.
+
+Responde generateContent, streamGenerateContent (SSE), embedContent e batchEmbedContents com
+conteúdo fixo e devolve 429 RESOURCE_EXHAUSTED quando a janela do último minuto estoura, como a
+API real. Serve para validar o limitador de cotas e a concorrência adaptativa dos workers sem
+gastar cota.
+
+Uso:
+    python -m benchmarks.fake_gemini_server --port 8090 --rpm 60 --tpm 20000
+    GEMINI_BASE_URL=http://localhost:8090 AI_SERVICE_NAME=gemini ... celery -A tasks worker ...
+
+Ao final (Ctrl+C) imprime quantas requisições foram aceitas e quantas recusadas.
+"""
+import re
+import json
+import math
+import time
+import argparse
+import threading
+
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SUMMARY = {"candidate_name": "Candidato Fictício",
+           "summary": "Resumo gerado pelo servidor falso da Gemini."}
+JUSTIFICATION = ("Candidato mais adequado: Candidato Fictício\n"
+                 "Justificativa: resposta gerada pelo servidor falso da Gemini.")
+# Intervalo entre os eventos de streamGenerateContent, depois da latência do primeiro.
+STREAM_CHUNK_INTERVAL = 0.05
+
+
+class SlidingWindowQuota:
+    def __init__(self, rpm: int, tpm: int, window: float = 60.0) -> None:
+        self.rpm = rpm
+        self.tpm = tpm
+        self.window = window
+        self.events = deque()
+        self.tokens = 0
+        self.accepted = 0
+        self.rejected = 0
+        self.lock = threading.Lock()
+
+    def admit(self, requests: int, tokens: int) -> bool:
+        now = time.monotonic()
+        with self.lock:
+            while self.events and now - self.events[0][0] > self.window:
+                _, old_requests, old_tokens = self.events.popleft()
+                self.tokens -= old_tokens
+            used_requests = sum(event[1] for event in self.events)
+            if used_requests + requests > self.rpm or self.tokens + tokens > self.tpm:
+                self.rejected += 1
+                return False
+            self.events.append((now, requests, tokens))
+            self.tokens += tokens
+            self.accepted += 1
+            return True
+
+
+def count_tokens(body: dict) -> int:
+    return math.ceil(len(json.dumps(body, ensure_ascii=False)) / 4)
+
+
+def make_handler(quota: SlidingWindowQuota, latency: float, dim: int):
+    class Handler(BaseHTTPRequestHandler):
+        def _reply(self, status: int, payload: dict) -> None:
+            data = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _stream(self, text: str) -> None:
+            """Eventos SSE com pedaços do texto, no formato de streamGenerateContent?alt=sse."""
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.end_headers()
+            words = text.split(" ")
+            pieces = [" ".join(words[i:i + 3]) for i in range(0, len(words), 3)]
+            for i, piece in enumerate(pieces):
+                last = i == len(pieces) - 1
+                if i:
+                    time.sleep(STREAM_CHUNK_INTERVAL)
+                candidate = {"content": {"role": "model", "parts": [{"text": piece if last else piece + " "}]}}
+                if last:
+                    candidate["finishReason"] = "STOP"
+                self.wfile.write(f"data: {json.dumps({'candidates': [candidate]})}\r\n\r\n".encode())
+                self.wfile.flush()
+
+        def do_POST(self) -> None:
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            match = re.search(r"models/[^:]+:(\w+)", self.path)
+            method = match.group(1) if match else ""
+            requests = len(body.get("requests", [])) or 1
+
+            if not quota.admit(requests, count_tokens(body)):
+                return self._reply(429, {"error": {
+                    "code": 429, "status": "RESOURCE_EXHAUSTED",
+                    "message": "Quota exceeded (servidor falso)"}})
+
+            time.sleep(latency)
+            if method == "generateContent":
+                json_mode = body.get("generationConfig", {}).get("responseMimeType") == "application/json"
+                text = json.dumps(SUMMARY, ensure_ascii=False) if json_mode else JUSTIFICATION
+                return self._reply(200, {"candidates": [{
+                    "content": {"role": "model", "parts": [{"text": text}]}, "finishReason": "STOP"}]})
+            if method == "streamGenerateContent":
+                return self._stream(JUSTIFICATION)
+            if method == "embedContent":
+                return self._reply(200, {"embedding": {"values": [0.1] * dim}})
+            if method == "batchEmbedContents":
+                return self._reply(200, {"embeddings": [{"values": [0.1] * dim}] * requests})
+            return self._reply(404, {"error": {"code": 404, "status": "NOT_FOUND", "message": self.path}})
+
+        def log_message(self, format, *args) -> None:
+            pass
+
+    return Handler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--rpm", type=int, default=60)
+    parser.add_argument("--tpm", type=int, default=20_000)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--dim", type=int, default=768)
+    args = parser.parse_args()
+
+    quota = SlidingWindowQuota(args.rpm, args.tpm)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(quota, args.latency, args.dim))
+    print(f"servidor falso da Gemini em {args.host}:{args.port} (rpm={args.rpm}, tpm={args.tpm})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"aceitas: {quota.accepted}, recusadas (429): {quota.rejected}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Benchmark de recall x latência do índice IVF contra a busca exaustiva.
+
+Gera vetores sintéticos agrupados (mistura de gaussianas normalizadas, parecida com a
+distribuição de embeddings de currículos), constrói o IVF e mede, para cada nprobe,
+o recall@k médio e as latências p50/p99 por consulta.
+
+Uso (dentro do container do worker):
+    python -m benchmarks.ivf_recall --vectors 200000 --dim 1024 --target-recall 0.95
+"""
+import time
+import argparse
+import numpy as np
+
+from services.similarity import normalize_rows
+from shared.ivf_index import IVFLists, ivf_search
+
+
+def synthetic_vectors(count: int, dim: int, clusters: int, spread: float, rng: np.random.Generator) -> np.ndarray:
+    centers = normalize_rows(rng.standard_normal((clusters, dim), dtype=np.float32))
+    labels = rng.integers(0, clusters, size=count)
+    noise = rng.standard_normal((count, dim), dtype=np.float32) * spread
+    return normalize_rows(centers[labels] + noise)
+
+
+def brute_force(query: np.ndarray, vectors: np.ndarray, k: int) -> np.ndarray:
+    scores = vectors @ query
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top])]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vectors", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=1024)
+    parser.add_argument("--clusters", type=int, default=200)
+    parser.add_argument("--spread", type=float, default=0.05)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--nlist", type=int, default=0)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32, 64])
+    parser.add_argument("--target-recall", type=float, default=0.95)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    vectors = synthetic_vectors(args.vectors, args.dim, args.clusters, args.spread, rng)
+    queries = synthetic_vectors(args.queries, args.dim, args.clusters, args.spread, rng)
+    nlist = args.nlist or max(int(4 * np.sqrt(args.vectors)), 1)
+
+    start = time.perf_counter()
+    lists = IVFLists.build(vectors, nlist, iterations=args.iterations, seed=args.seed)
+    print(f"build: {len(vectors)} vetores, nlist={len(lists.centroids)}, {time.perf_counter() - start:.1f}s")
+
+    exact, exact_latencies = [], []
+    for query in queries:
+        start = time.perf_counter()
+        exact.append(set(brute_force(query, vectors, args.k).tolist()))
+        exact_latencies.append(time.perf_counter() - start)
+
+    print(f"exaustiva: p50={np.percentile(exact_latencies, 50) * 1000:.2f}ms "
+          f"p99={np.percentile(exact_latencies, 99) * 1000:.2f}ms")
+    print(f"{'nprobe':>8} {'recall@' + str(args.k):>10} {'p50 (ms)':>10} {'p99 (ms)':>10}")
+
+    best = None
+    for nprobe in args.nprobe:
+        recalls, latencies = [], []
+        for query, truth in zip(queries, exact):
+            start = time.perf_counter()
+            found = ivf_search(query, vectors, lists, len(vectors), args.k, nprobe)
+            latencies.append(time.perf_counter() - start)
+            recalls.append(len(truth & {row for row, _ in found}) / args.k)
+
+        recall = float(np.mean(recalls))
+        p50, p99 = np.percentile(latencies, 50) * 1000, np.percentile(latencies, 99) * 1000
+        print(f"{nprobe:>8} {recall:>10.3f} {p50:>10.2f} {p99:>10.2f}")
+
+        if best is None and recall >= args.target_recall:
+            best = (nprobe, p99)
+
+    if best:
+        print(f"menor nprobe com recall >= {args.target_recall}: {best[0]} (p99={best[1]:.2f}ms)")
+    else:
+        print(f"nenhum nprobe testado atingiu recall >= {args.target_recall}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,7 @@
+import redis
+
 from celery import Celery
+from typing import Optional
 
 from settings import settings
 
@@ -12,6 +15,43 @@ celery_worker = Celery(
     include=['tasks']
 )
 
+ocr_tasks = ['tasks.extract_resume_text', 'tasks.ocr_health_check', 'tasks.rebuild_vector_indexes',
+             'tasks.collect_blobs']
+llm_tasks = ['tasks.summarize_resume', 'tasks.summarize_resumes_batch', 'tasks.finalize_analysis', 'tasks.embed_query']
+
 celery_worker.conf.update(
     result_expires=3600,
+    task_routes={
+        **{name: {'queue': settings.CELERY_OCR_QUEUE} for name in ocr_tasks},
+        **{name: {'queue': settings.CELERY_LLM_QUEUE} for name in llm_tasks},
+    },
+    task_annotations={
+        **{name: {
+            'time_limit': settings.CELERY_OCR_TIME_LIMIT,
+            'soft_time_limit': settings.CELERY_OCR_SOFT_TIME_LIMIT,
+        } for name in ocr_tasks},
+        **{name: {
+            'time_limit': settings.CELERY_LLM_TIME_LIMIT,
+            'soft_time_limit': settings.CELERY_LLM_SOFT_TIME_LIMIT,
+        } for name in llm_tasks},
+    },
+    beat_schedule={
+        'rebuild-vector-indexes': {
+            'task': 'tasks.rebuild_vector_indexes',
+            'schedule': settings.IVF_REBUILD_INTERVAL_SECONDS,
+        },
+        'collect-blobs': {
+            'task': 'tasks.collect_blobs',
+            'schedule': settings.BLOB_GC_INTERVAL_SECONDS,
+        },
+    },
 )
+
+_redis_client: Optional[redis.Redis] = None
+
+
+def get_redis_client() -> redis.Redis:
+    global _redis_client
+    if _redis_client is None:
+        _redis_client = redis.Redis.from_url(broker_url)
+    return _redis_client
@@ -0,0 +1,59 @@
+import threading
+
+from typing import Optional
+from pymongo import MongoClient
+from shared.mongo_pool import PoolStatsListener
+from settings import settings
+
+
+pool_stats = PoolStatsListener()
+
+_client: Optional[MongoClient] = None
+_client_lock = threading.Lock()
+
+
+def get_mongo_client() -> MongoClient:
+    """Um único MongoClient por processo; o pool é compartilhado por todas as requisições."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = MongoClient(
+                    settings.database_url,
+                    maxPoolSize=settings.MONGO_MAX_POOL_SIZE,
+                    minPoolSize=settings.MONGO_MIN_POOL_SIZE,
+                    maxIdleTimeMS=settings.MONGO_MAX_IDLE_TIME_MS,
+                    waitQueueTimeoutMS=settings.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+                    connectTimeoutMS=settings.MONGO_CONNECT_TIMEOUT_MS,
+                    socketTimeoutMS=settings.MONGO_SOCKET_TIMEOUT_MS,
+                    serverSelectionTimeoutMS=settings.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+                    event_listeners=[pool_stats],
+                )
+    return _client
+
+
+def reset_mongo_client() -> None:
+    """Descarta, sem fechar, um cliente herdado do processo pai via fork (não é fork-safe)."""
+    global _client
+    _client = None
+
+
+def close_mongo_client() -> None:
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+
+
+def get_pool_stats() -> dict:
+    return {
+        **pool_stats.stats(),
+        "max_pool_size": settings.MONGO_MAX_POOL_SIZE,
+        "min_pool_size": settings.MONGO_MIN_POOL_SIZE,
+    }
+
+
+def get_mongo_collection(collection_name: str):
+    db = get_mongo_client()[settings.MONGO_INITDB_ROOT_DBNAME]
+    return db.get_collection(collection_name)
@@ -1,5 +1,17 @@
 from .factory import *
+from .embedding_cache import *
+from .rate_limiter import *
 from .base_resume_matcher import *
+from .ocr_reader_pool import *
+from .parallel_page_ocr import *
 from .vision_text_processor import *
 from .ollama_resume_matcher import *
+from .async_ollama_resume_matcher import *
 from .resume_analyzer_service import *
+from .summary_cache import *
+from .similarity import *
+from .candidate_vector_store import *
+from .blob_store import *
+from .progress_publisher import *
+from .justification_stream import *
+from .resume_text import *
@@ -0,0 +1,108 @@
+import httpx
+import asyncio
+import logging
+import threading
+
+from config import settings
+from typing import List, Optional, Union
+from schemas import SummaryResume
+from services.resume_text import chunk_text, estimate_tokens
+from services.ollama_resume_matcher import OllamaResumeMatcher
+
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+# Um event loop e um AsyncClient por thread do worker (pool de threads na fila llm): o client
+# fica preso ao loop em que abriu as conexões, então reaproveitá-lo entre lotes exige manter o
+# mesmo loop aberto. As conexões são liberadas quando o processo do worker termina.
+_thread_state = threading.local()
+
+
+def _event_loop() -> asyncio.AbstractEventLoop:
+    loop = getattr(_thread_state, "loop", None)
+    if loop is None or loop.is_closed():
+        loop = _thread_state.loop = asyncio.new_event_loop()
+        _thread_state.clients = {}
+    return loop
+
+
+class AsyncOllamaResumeMatcher(OllamaResumeMatcher):
+    """
+    Variante do OllamaResumeMatcher que sumariza vários currículos em paralelo, com um
+    AsyncClient de conexões keep-alive e um semáforo limitando as chamadas simultâneas.
+    """
+
+    def __init__(self, max_concurrency: Optional[int] = None, timeout: Optional[float] = None) -> None:
+        # Um matcher novo é criado a cada tarefa; o client da thread é o que persiste entre elas.
+        self.max_concurrency = max_concurrency or settings.LLM_MAX_CONCURRENCY
+        self.timeout = timeout or settings.LLM_REQUEST_TIMEOUT
+
+    def _client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            base_url=settings.AI_SERVICE_KEY,
+            timeout=self.timeout,
+            limits=httpx.Limits(
+                max_connections=self.max_concurrency,
+                max_keepalive_connections=self.max_concurrency,
+            ),
+        )
+
+    def _thread_client(self) -> httpx.AsyncClient:
+        """AsyncClient do loop da thread atual, um por configuração de concorrência e timeout."""
+        key = (settings.AI_SERVICE_KEY, self.max_concurrency, self.timeout)
+        clients = _thread_state.clients
+        if key not in clients:
+            clients[key] = self._client()
+        return clients[key]
+
+    async def aextract_summary_from_resume(self, client: httpx.AsyncClient, content: str) -> SummaryResume:
+        response = await client.post("/chat", json=self._summary_payload(content))
+        response.raise_for_status()
+        return self._parse_summary(response.json())
+
+    async def acomplete(self, client: httpx.AsyncClient, prompt: str) -> str:
+        response = await client.post("/chat", json=self._complete_payload(prompt))
+        response.raise_for_status()
+        return response.json()['message']['content']
+
+    async def asummarize_resume(
+        self, client: httpx.AsyncClient, semaphore: asyncio.Semaphore, content: str
+    ) -> SummaryResume:
+        """Versão assíncrona de summarize_resume: os trechos de todos os currículos disputam o mesmo semáforo."""
+        async def call(coroutine):
+            async with semaphore:
+                return await asyncio.wait_for(coroutine, timeout=self.timeout)
+
+        tokens = estimate_tokens(content)
+        if tokens <= settings.SUMMARY_PROMPT_TOKEN_BUDGET:
+            logger.info(f"Sumário em uma chamada: ~{tokens} tokens de conteúdo no prompt")
+            return await call(self.aextract_summary_from_resume(client, content))
+
+        chunks = chunk_text(content, settings.SUMMARY_CHUNK_TOKENS)
+        prompts = [self._chunk_prompt(chunk, i + 1, len(chunks)) for i, chunk in enumerate(chunks)]
+        notes = await asyncio.gather(*(call(self.acomplete(client, prompt)) for prompt in prompts))
+
+        reduced = self._reduce_content(notes)
+        self._log_map_reduce(tokens, prompts, reduced)
+        return await call(self.aextract_summary_from_resume(client, reduced))
+
+    async def asummarize_many(
+        self, contents: List[str], client: Optional[httpx.AsyncClient] = None
+    ) -> List[Union[SummaryResume, Exception]]:
+        """
+        Sumariza os conteúdos concorrentemente, no máximo max_concurrency chamadas por vez.
+        Falhas individuais são devolvidas na posição do conteúdo, sem cancelar as demais.
+        Sem `client`, abre um só para este lote.
+        """
+        if client is None:
+            async with self._client() as client:
+                return await self.asummarize_many(contents, client)
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        return await asyncio.gather(
+            *(self.asummarize_resume(client, semaphore, content) for content in contents),
+            return_exceptions=True)
+
+    def summarize_many(self, contents: List[str]) -> List[Union[SummaryResume, Exception]]:
+        loop = _event_loop()
+        return loop.run_until_complete(self.asummarize_many(contents, self._thread_client()))
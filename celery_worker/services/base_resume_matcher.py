@@ -1,17 +1,158 @@
-from typing import List
+import logging
+import numpy as np
+
+from concurrent.futures import ThreadPoolExecutor
+from config import settings
 from schemas import SummaryResume
 from abc import ABC, abstractmethod
+from typing import Dict, Iterator, List, Optional, Union
+from services.similarity import top_k_by_similarity
+from services.resume_text import chunk_text, estimate_tokens
+from services.embedding_cache import EmbeddingCache, get_embedding_cache
+
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
 
 
 class BaseResumeMatcher(ABC):
+    name: str
+    summary_model: str
+    embedding_model: str
+
+    @property
+    def embedding_cache(self) -> Optional[EmbeddingCache]:
+        if not settings.EMBEDDING_CACHE_ENABLED:
+            return None
+        return get_embedding_cache(self.name, self.embedding_model)
+
+    def _get_embeddings(self, texts: List[str]) -> np.ndarray:
+        """Retorna uma matriz float32 com um embedding por texto, na mesma ordem."""
+        cache = self.embedding_cache
+        vectors = cache.get_many(texts) if cache else [None] * len(texts)
+
+        missing: Dict[str, List[int]] = {}
+        for i, vector in enumerate(vectors):
+            if vector is None:
+                missing.setdefault(texts[i], []).append(i)
+
+        pending = list(missing)
+        batch_size = max(settings.EMBEDDING_BATCH_SIZE, 1)
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start:start + batch_size]
+            embeddings = np.asarray(
+                self._request_embeddings(batch), dtype=np.float32)
+
+            for text, embedding in zip(batch, embeddings):
+                for i in missing[text]:
+                    vectors[i] = embedding
+
+            if cache:
+                cache.set_many(list(zip(batch, embeddings)))
+
+        if pending:
+            logger.debug(
+                f"{len(texts)} embedding(s) solicitados, {len(pending)} enviados ao serviço "
+                f"em {-(-len(pending) // batch_size)} requisição(ões)")
+
+        return np.vstack(vectors) if vectors else np.empty((0, 0), dtype=np.float32)
+
+    def _get_embedding(self, text: str) -> np.ndarray:
+        return self._get_embeddings([text])[0]
+
+    def embed_texts(self, texts: List[str]) -> np.ndarray:
+        """Retorna os embeddings dos textos, passando pelo cache."""
+        return self._get_embeddings(texts)
+
+    @abstractmethod
+    def _request_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Solicita ao serviço de IA os embeddings de um lote de textos."""
+
     @abstractmethod
     def extract_summary_from_resume(self, content: str) -> SummaryResume:
         """Extrai o nome do candidato e o resumo do currículo"""
 
     @abstractmethod
-    def rank_resumes_by_similarity(self, query: str, resumes: List[SummaryResume], k: int, threshold: float) -> List[SummaryResume]:
+    def _complete(self, prompt: str) -> str:
+        """Envia um prompt de texto livre ao modelo de sumários e devolve a resposta."""
+
+    @staticmethod
+    def _chunk_prompt(chunk: str, index: int, total: int) -> str:
+        return f"""
+        A seguir está a parte {index} de {total} do conteúdo de um currículo profissional:
+
+        {chunk}
+
+        Liste em tópicos todas as informações relevantes desta parte: nome e contato do candidato,
+        formação acadêmica, experiências profissionais (empresa, cargo, período e atividades),
+        competências, certificações e idiomas. Não invente informações e não comente a tarefa.
+        """
+
+    @staticmethod
+    def _reduce_content(notes: List[str]) -> str:
+        return "\n\n".join(f"Parte {i + 1}:\n{note.strip()}" for i, note in enumerate(notes))
+
+    @staticmethod
+    def _log_map_reduce(tokens: int, prompts: List[str], reduced: str) -> None:
+        logger.info(
+            f"Sumário em map-reduce: ~{tokens} tokens de conteúdo em {len(prompts)} trecho(s) de até "
+            f"~{max(estimate_tokens(prompt) for prompt in prompts)} tokens; prompt final com "
+            f"~{estimate_tokens(reduced)} tokens de conteúdo")
+
+    def summarize_resume(self, content: str) -> SummaryResume:
+        """
+        Sumariza o currículo em uma chamada quando o texto cabe em SUMMARY_PROMPT_TOKEN_BUDGET;
+        acima disso, resume cada trecho de até SUMMARY_CHUNK_TOKENS em paralelo (map) e extrai o
+        SummaryResume da junção dos resumos parciais (reduce).
+        """
+        tokens = estimate_tokens(content)
+        if tokens <= settings.SUMMARY_PROMPT_TOKEN_BUDGET:
+            logger.info(f"Sumário em uma chamada: ~{tokens} tokens de conteúdo no prompt")
+            return self.extract_summary_from_resume(content)
+
+        chunks = chunk_text(content, settings.SUMMARY_CHUNK_TOKENS)
+        prompts = [self._chunk_prompt(chunk, i + 1, len(chunks)) for i, chunk in enumerate(chunks)]
+        with ThreadPoolExecutor(max_workers=min(len(prompts), settings.LLM_MAX_CONCURRENCY)) as executor:
+            notes = list(executor.map(self._complete, prompts))
+
+        reduced = self._reduce_content(notes)
+        self._log_map_reduce(tokens, prompts, reduced)
+        return self.extract_summary_from_resume(reduced)
+
+    def summarize_many(self, contents: List[str]) -> List[Union[SummaryResume, Exception]]:
+        """Sumariza vários currículos; falhas individuais são devolvidas na posição do conteúdo."""
+        summaries: List[Union[SummaryResume, Exception]] = []
+        for content in contents:
+            try:
+                summaries.append(self.summarize_resume(content))
+            except Exception as e:
+                summaries.append(e)
+        return summaries
+
+    def rank_resumes_by_similarity(self, query: str, resumes: List[SummaryResume], k: int = 5, threshold: float = 0.5) -> List[SummaryResume]:
         """Ordena os currículos por similaridade com a query."""
+        if not resumes:
+            return []
+
+        query_embedding = self._get_embedding(query)
+        resume_embeddings = self._get_embeddings(
+            [resume.summary for resume in resumes])
+
+        top_k: List[SummaryResume] = []
+        for i, similarity in top_k_by_similarity(query_embedding, resume_embeddings, k, threshold):
+            resumes[i].score = similarity
+            top_k.append(resumes[i])
+
+        logger.info(
+            f"Top {len(top_k)} currículos selecionados (threshold={threshold}, k={k}): "
+            + ", ".join(f"{r.candidate_name} ({r.score}%)" for r in top_k)
+        )
+
+        return top_k
 
     @abstractmethod
+    def stream_candidate_justification(self, query: str, resumes: List[SummaryResume]) -> Iterator[str]:
+        """Gera a justificativa em trechos, à medida que o modelo os produz."""
+
     def generate_candidate_justification(self, query: str, resumes: List[SummaryResume]) -> str:
         """Gera uma justificativa textual usando os currículos mais relevantes."""
+        return "".join(self.stream_candidate_justification(query, resumes))
@@ -0,0 +1,179 @@
+import os
+import mmap
+import time
+import logging
+import pymongo
+
+from config import settings
+from pymongo.errors import DuplicateKeyError
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, Optional, Tuple
+from shared.blob_layout import BlobLayout
+
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+
+class BlobStore(ABC):
+    """Arquivos de currículos endereçados pelo SHA-256 do conteúdo."""
+
+    @abstractmethod
+    def exists(self, file_hash: str) -> bool:
+        pass
+
+    @abstractmethod
+    def open(self, file_hash: str):
+        """Context manager que expõe o conteúdo do blob como um buffer somente leitura."""
+        pass
+
+    @abstractmethod
+    def delete(self, file_hash: str) -> None:
+        pass
+
+    @abstractmethod
+    def iter_blobs(self) -> Iterator[Tuple[str, float]]:
+        """Itera (hash, mtime) de todos os blobs gravados."""
+        pass
+
+    @abstractmethod
+    def remove_stale_staging(self, older_than: float) -> int:
+        pass
+
+
+class LocalBlobStore(BlobLayout, BlobStore):
+    """Blobs no sistema de arquivos local, no layout gravado pela API (ver BlobLayout)."""
+
+    def exists(self, file_hash: str) -> bool:
+        return os.path.exists(self.path(file_hash))
+
+    @contextmanager
+    def open(self, file_hash: str):
+        # O mmap evita copiar o arquivo para a memória do processo; o memoryview é repassado
+        # ao PyMuPDF sem cópia.
+        with open(self.path(file_hash), "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(mapped)
+        try:
+            yield view
+        finally:
+            try:
+                view.release()
+                mapped.close()
+            except BufferError:
+                # Algum objeto ainda exporta o buffer; o mapeamento é liberado junto com ele.
+                pass
+
+    def delete(self, file_hash: str) -> None:
+        try:
+            os.remove(self.path(file_hash))
+        except FileNotFoundError:
+            pass
+
+    def iter_blobs(self) -> Iterator[Tuple[str, float]]:
+        for entry in self.blob_entries():
+            yield entry.name, entry.stat().st_mtime
+
+    def remove_stale_staging(self, older_than: float) -> int:
+        staging = self.staging_dir()
+        if not os.path.isdir(staging):
+            return 0
+        removed = 0
+        for entry in os.scandir(staging):
+            if entry.is_file() and entry.stat().st_mtime < older_than:
+                os.remove(entry.path)
+                removed += 1
+        return removed
+
+
+class BlobReferences:
+    """
+    Contagem de referências dos blobs na coleção `blobs`: um documento por hash com os logs
+    que ainda precisam do arquivo. Blobs sem referências há mais de BLOB_RETENTION_SECONDS
+    ou com referências expiradas (análises que nunca terminaram) são removidos pelo GC.
+
+    Antes de apagar um arquivo, o GC marca o documento com `deleting_at` (ou cria um documento
+    só com a marca, para arquivos sem documento) e só remove o documento depois do arquivo.
+    O `touch` da API não reaproveita documentos marcados: espera a remoção terminar e grava o
+    arquivo de novo, então um upload nunca é apagado depois de registrado.
+    """
+
+    _indexes_ready = False
+
+    def __init__(self, collection) -> None:
+        self.collection = collection
+        self._ensure_indexes()
+
+    def _ensure_indexes(self) -> None:
+        if BlobReferences._indexes_ready:
+            return
+        self.collection.create_index([("updated_at", pymongo.ASCENDING)])
+        self.collection.create_index("expires_at")
+        self.collection.create_index("refs")
+        BlobReferences._indexes_ready = True
+
+    def release(self, log_id: str) -> int:
+        """Remove as referências do log; os blobs continuam disponíveis até o GC."""
+        result = self.collection.update_many(
+            {"refs": log_id},
+            {"$pull": {"refs": log_id}, "$set": {"updated_at": datetime.now(timezone.utc)}},
+        )
+        return result.modified_count
+
+    def known(self, file_hash: str) -> bool:
+        return self.collection.count_documents({"_id": file_hash}, limit=1) > 0
+
+    def collectable_filter(self, now: datetime) -> dict:
+        cutoff = now - timedelta(seconds=settings.BLOB_RETENTION_SECONDS)
+        # Marcas antigas são de um GC que parou no meio da remoção; a próxima execução a conclui.
+        stale_mark = now - timedelta(seconds=settings.BLOB_DELETE_TIMEOUT_SECONDS)
+        return {"$or": [
+            {"refs": {"$size": 0}, "updated_at": {"$lt": cutoff}, "deleting_at": {"$exists": False}},
+            {"expires_at": {"$lt": now}, "deleting_at": {"$exists": False}},
+            {"deleting_at": {"$lt": stale_mark}},
+        ]}
+
+    def _remove(self, store: BlobStore, file_hash: str, marked_at: datetime) -> None:
+        store.delete(file_hash)
+        self.collection.delete_one({"_id": file_hash, "deleting_at": marked_at})
+
+    def collect(self, store: BlobStore) -> dict:
+        """Apaga documentos e arquivos de blobs não referenciados ou expirados."""
+        now = datetime.now(timezone.utc)
+        collectable = self.collectable_filter(now)
+        removed = 0
+        for doc in self.collection.find(collectable, {"_id": 1}):
+            # O filtro é reaplicado na marcação: um touch ou uma nova referência da API entre
+            # o find e a marca mantém o blob.
+            marked = self.collection.update_one({"_id": doc["_id"], **collectable}, {"$set": {"deleting_at": now}})
+            if marked.modified_count:
+                self._remove(store, doc["_id"], now)
+                removed += 1
+
+        # Arquivos sem documento (ex.: a API caiu entre gravar e registrar) seguem a mesma retenção.
+        older_than = time.time() - settings.BLOB_RETENTION_SECONDS
+        orphans = 0
+        for file_hash, mtime in store.iter_blobs():
+            if mtime >= older_than or self.known(file_hash):
+                continue
+            try:
+                self.collection.insert_one({"_id": file_hash, "refs": [], "deleting_at": now})
+            except DuplicateKeyError:
+                # A API registrou o blob depois da verificação.
+                continue
+            self._remove(store, file_hash, now)
+            orphans += 1
+
+        staging = store.remove_stale_staging(older_than)
+        return {"removed": removed, "orphans": orphans, "staging": staging}
+
+
+_blob_store: Optional[BlobStore] = None
+
+
+def get_blob_store() -> BlobStore:
+    global _blob_store
+    if _blob_store is None:
+        _blob_store = LocalBlobStore(settings.blob_store_dir)
+    return _blob_store
@@ -0,0 +1,222 @@
+import os
+import re
+import json
+import fcntl
+import logging
+import threading
+import numpy as np
+
+from config import settings
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Set, Tuple
+from services.similarity import normalize_rows
+from shared.ivf_index import IVFIndex, IVFLists, assign_to_centroids
+
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+
+class CandidateVectorStore:
+    """
+    Armazena os embeddings de todos os currículos processados em arquivos somente-anexação.
+
+    Layout do diretório:
+        header.json     dimensão, quantidade de linhas confirmadas e tamanho dos metadados
+        vectors.f32     matriz float32 (count x dim) com vetores normalizados
+        metadata.jsonl  uma linha JSON por vetor (nome do candidato, log, hash, resumo)
+        metadata.idx    offsets uint64 de cada linha de metadata.jsonl
+
+    O header é gravado por último e de forma atômica, então leitores que abrem os arquivos
+    via mmap só enxergam linhas completas, mesmo com workers anexando em paralelo.
+    """
+
+    HEADER = "header.json"
+    VECTORS = "vectors.f32"
+    METADATA = "metadata.jsonl"
+    OFFSETS = "metadata.idx"
+    LOCK = ".lock"
+
+    def __init__(self, path: str, backend: Optional[str] = None, model: Optional[str] = None) -> None:
+        self.path = path
+        self.backend = backend
+        self.model = model
+        self._hashes: Set[str] = set()
+        self._scanned_bytes = 0
+        self.ivf = IVFIndex(path)
+        os.makedirs(path, exist_ok=True)
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def read_header(self) -> dict:
+        try:
+            with open(self._file(self.HEADER)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {
+                "dim": None,
+                "count": 0,
+                "metadata_bytes": 0,
+                "backend": self.backend,
+                "model": self.model,
+            }
+
+    def _write_header(self, header: dict) -> None:
+        tmp = self._file(self.HEADER + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump(header, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self._file(self.HEADER))
+
+    @contextmanager
+    def _locked(self):
+        with open(self._file(self.LOCK), "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _write_at(self, name: str, position: int, data: bytes) -> None:
+        # Descarta restos de um append interrompido antes da gravação do header.
+        with open(self._file(name), "ab") as f:
+            f.truncate(position)
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _refresh_hashes(self, header: dict) -> None:
+        end = header["metadata_bytes"]
+        if end <= self._scanned_bytes:
+            return
+
+        with open(self._file(self.METADATA), "rb") as f:
+            f.seek(self._scanned_bytes)
+            data = f.read(end - self._scanned_bytes)
+
+        for line in data.splitlines():
+            file_hash = json.loads(line).get("file_hash")
+            if file_hash:
+                self._hashes.add(file_hash)
+        self._scanned_bytes = end
+
+    def append(self, vectors: np.ndarray, metadata: List[dict]) -> int:
+        """Anexa vetores e metadados, ignorando arquivos cujo hash já está indexado."""
+        vectors = normalize_rows(vectors)
+
+        with self._locked():
+            header = self.read_header()
+            if header["dim"] is None:
+                header["dim"] = int(vectors.shape[1])
+            elif header["dim"] != vectors.shape[1]:
+                raise ValueError(
+                    f"Dimensão do embedding ({vectors.shape[1]}) diferente da do índice ({header['dim']})")
+
+            self._refresh_hashes(header)
+
+            rows: List[int] = []
+            seen: Set[str] = set()
+            for i, meta in enumerate(metadata):
+                file_hash = meta.get("file_hash")
+                if file_hash and (file_hash in self._hashes or file_hash in seen):
+                    continue
+                if file_hash:
+                    seen.add(file_hash)
+                rows.append(i)
+
+            if not rows:
+                return 0
+
+            lines = [
+                (json.dumps(metadata[i], ensure_ascii=False) + "\n").encode() for i in rows]
+            sizes = np.array([len(line) for line in lines], dtype=np.uint64)
+            offsets = header["metadata_bytes"] + np.concatenate(
+                ([0], np.cumsum(sizes[:-1]))).astype(np.uint64)
+
+            count, dim = header["count"], header["dim"]
+            self._write_at(self.VECTORS, count * dim * 4,
+                           vectors[rows].tobytes())
+            self._write_at(self.METADATA, header["metadata_bytes"], b"".join(lines))
+            self._write_at(self.OFFSETS, count * 8, offsets.tobytes())
+            self.ivf.add(count, vectors[rows])
+
+            header["count"] = count + len(rows)
+            header["metadata_bytes"] += int(sizes.sum())
+            self._write_header(header)
+
+            self._hashes.update(seen)
+            self._scanned_bytes = header["metadata_bytes"]
+
+        return len(rows)
+
+    def vectors(self, header: Optional[dict] = None) -> np.ndarray:
+        """Retorna os vetores confirmados como uma matriz mapeada em memória."""
+        header = header or self.read_header()
+        if not header["count"]:
+            return np.empty((0, header["dim"] or 0), dtype=np.float32)
+        return np.memmap(self._file(self.VECTORS), dtype=np.float32, mode="r",
+                         shape=(header["count"], header["dim"]))
+
+    def needs_ivf_rebuild(self, min_vectors: int, max_tail_ratio: float) -> bool:
+        count = self.read_header()["count"]
+        if count < min_vectors:
+            return False
+        meta = self.ivf.read_meta()
+        if not meta:
+            return True
+        return (count - meta["built_count"]) / count > max_tail_ratio
+
+    def rebuild_ivf(self, nlist: int, iterations: int = 20) -> int:
+        """
+        Treina novas partições sobre um snapshot dos vetores, fora do lock, e só adquire o
+        lock para atribuir as linhas anexadas durante o treino e trocar os arquivos.
+        """
+        header = self.read_header()
+        built_count = header["count"]
+        if not built_count:
+            return 0
+
+        lists = IVFLists.build(self.vectors(header), nlist, iterations=iterations)
+
+        with self._locked():
+            header = self.read_header()
+            if header["count"] > built_count:
+                tail = self.vectors(header)[built_count:]
+                lists.assignments = np.concatenate(
+                    (lists.assignments, assign_to_centroids(tail, lists.centroids)))
+            self.ivf.save(lists, built_count)
+
+        logger.info(
+            f"Índice IVF de {self.path} reconstruído: {built_count} vetor(es), "
+            f"{len(lists.centroids)} partição(ões)")
+        return built_count
+
+
+def vector_store_path(backend: str, model: str) -> str:
+    return os.path.join(settings.vector_index_dir, re.sub(r"[^\w.-]", "_", f"{backend}-{model}"))
+
+
+_stores: Dict[Tuple[str, str], CandidateVectorStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_candidate_vector_store(backend: str, model: str) -> CandidateVectorStore:
+    with _stores_lock:
+        store = _stores.get((backend, model))
+        if store is None:
+            store = CandidateVectorStore(
+                vector_store_path(backend, model), backend, model)
+            _stores[(backend, model)] = store
+        return store
+
+
+def list_candidate_vector_stores() -> List[CandidateVectorStore]:
+    root = settings.vector_index_dir
+    if not os.path.isdir(root):
+        return []
+    return [
+        CandidateVectorStore(os.path.join(root, name))
+        for name in sorted(os.listdir(root))
+        if os.path.exists(os.path.join(root, name, CandidateVectorStore.HEADER))
+    ]
@@ -0,0 +1,155 @@
+import redis
+import hashlib
+import logging
+import threading
+import numpy as np
+
+from config import settings, get_redis_client
+from typing import Dict, List, Optional, Sequence, Tuple
+from cachetools import Cache, LFUCache, LRUCache, TTLCache
+
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+
+def _build_local_cache(policy: str, size: int, ttl: int) -> Cache:
+    policy = policy.lower()
+    if policy == "lru":
+        return LRUCache(maxsize=size)
+    if policy == "lfu":
+        return LFUCache(maxsize=size)
+    if policy == "ttl":
+        return TTLCache(maxsize=size, ttl=ttl)
+    raise ValueError(f"Política de cache não suportada: {policy}")
+
+
+class EmbeddingCache:
+    """
+    Cache de embeddings em dois níveis: LRU/LFU/TTL no processo e Redis compartilhado.
+
+    Os vetores são guardados como float32 binário e as chaves incluem o backend e o
+    modelo, então trocar o modelo de embedding nunca reaproveita vetores antigos.
+    """
+
+    def __init__(
+        self,
+        backend: str,
+        model: str,
+        redis_client: Optional[redis.Redis] = None,
+        local_size: Optional[int] = None,
+        policy: Optional[str] = None,
+        ttl: Optional[int] = None,
+    ) -> None:
+        self.backend = backend
+        self.model = model
+        self.ttl = ttl or settings.EMBEDDING_CACHE_TTL_SECONDS
+        self.namespace = f"emb:v{settings.EMBEDDING_CACHE_VERSION}:{backend}:{model}"
+        self._redis = redis_client
+        self._local = _build_local_cache(
+            policy or settings.EMBEDDING_CACHE_POLICY,
+            local_size or settings.EMBEDDING_CACHE_LOCAL_SIZE,
+            self.ttl,
+        )
+        self._lock = threading.Lock()
+
+    @property
+    def redis(self) -> redis.Redis:
+        if self._redis is None:
+            self._redis = get_redis_client()
+        return self._redis
+
+    def _key(self, text: str) -> str:
+        return f"{self.namespace}:{hashlib.sha256(text.encode()).hexdigest()}"
+
+    def get_many(self, texts: Sequence[str]) -> List[Optional[np.ndarray]]:
+        keys = [self._key(text) for text in texts]
+        with self._lock:
+            vectors: List[Optional[np.ndarray]] = [self._local.get(key) for key in keys]
+
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if not missing:
+            return vectors
+
+        try:
+            payloads = self.redis.mget([keys[i] for i in missing])
+        except redis.RedisError as e:
+            logger.warning(f"Cache de embeddings indisponível: {e}")
+            return vectors
+
+        with self._lock:
+            for i, payload in zip(missing, payloads):
+                if payload is not None:
+                    vectors[i] = np.frombuffer(payload, dtype=np.float32)
+                    self._local[keys[i]] = vectors[i]
+
+        return vectors
+
+    def get(self, text: str) -> Optional[np.ndarray]:
+        return self.get_many([text])[0]
+
+    def set_many(self, items: Sequence[Tuple[str, np.ndarray]]) -> None:
+        entries = [
+            (self._key(text), np.asarray(vector, dtype=np.float32)) for text, vector in items]
+
+        with self._lock:
+            for key, vector in entries:
+                self._local[key] = vector
+
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for key, vector in entries:
+                pipe.set(key, vector.tobytes(), ex=self.ttl)
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Cache de embeddings indisponível: {e}")
+
+    def set(self, text: str, vector: np.ndarray) -> None:
+        self.set_many([(text, vector)])
+
+    def invalidate(self) -> int:
+        """Remove todos os vetores deste backend/modelo dos dois níveis."""
+        with self._lock:
+            self._local.clear()
+
+        removed = 0
+        for key in self.redis.scan_iter(match=f"{self.namespace}:*", count=1000):
+            removed += self.redis.delete(key)
+        return removed
+
+    def invalidate_stale_models(self) -> int:
+        """
+        Registra este modelo como o ativo do backend e apaga os vetores do modelo anterior.
+        """
+        active_key = f"emb:active:{self.backend}"
+        try:
+            previous = self.redis.set(active_key, self.namespace, get=True)
+        except redis.RedisError as e:
+            logger.warning(f"Cache de embeddings indisponível: {e}")
+            return 0
+
+        previous = previous.decode() if previous else None
+        if not previous or previous == self.namespace:
+            return 0
+
+        removed = 0
+        for key in self.redis.scan_iter(match=f"{previous}:*", count=1000):
+            removed += self.redis.delete(key)
+        logger.info(
+            f"Modelo de embedding alterado ({previous} -> {self.namespace}); "
+            f"{removed} vetor(es) invalidado(s)")
+        return removed
+
+
+_caches: Dict[Tuple[str, str], EmbeddingCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_embedding_cache(backend: str, model: str) -> EmbeddingCache:
+    """Retorna o cache do processo para o par backend/modelo."""
+    with _caches_lock:
+        cache = _caches.get((backend, model))
+        if cache is None:
+            cache = EmbeddingCache(backend, model)
+            cache.invalidate_stale_models()
+            _caches[(backend, model)] = cache
+        return cache
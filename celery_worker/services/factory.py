@@ -3,16 +3,20 @@ import enum
 from services.base_resume_matcher import BaseResumeMatcher
 from services.gemini_resume_matcher import GeminiResumeMatcher
 from services.ollama_resume_matcher import OllamaResumeMatcher
+from services.async_ollama_resume_matcher import AsyncOllamaResumeMatcher
 
 
 class ResumeMatcherStrategy(enum.Enum):
     OLLAMA = "ollama"
+    OLLAMA_ASYNC = "ollama-async"
     GEMINI = "gemini"
 
 
 def get_matcher(strategy: str = "ollama") -> BaseResumeMatcher:
     if strategy.lower() == ResumeMatcherStrategy.OLLAMA.value:
         return OllamaResumeMatcher()
+    elif strategy.lower() == ResumeMatcherStrategy.OLLAMA_ASYNC.value:
+        return AsyncOllamaResumeMatcher()
     elif strategy.lower() == ResumeMatcherStrategy.GEMINI.value:
         return GeminiResumeMatcher()
     raise ValueError(f"Estratégia não suportada: {strategy}")
@@ -1,28 +1,57 @@
 import logging
-import numpy as np
 
-from typing import List
+from typing import Iterator, List
 from google import genai
 from config import settings
-from google.genai import types
+from google.genai import types, errors
 from schemas import SummaryResume
 from services.base_resume_matcher import BaseResumeMatcher
+from services.resume_text import estimate_tokens
+from services.rate_limiter import get_quota_limiter
 
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
 
-class GeminiResumeMatcher(BaseResumeMatcher):
-    def __init__(self) -> None:
-        self.client = genai.Client(api_key=settings.AI_SERVICE_KEY)
+def is_overload_error(e: Exception) -> bool:
+    return isinstance(e, errors.APIError) and e.code in (429, 503)
 
-    def _cosine_similarity(self, vec1: List[float], vec2: List[float]) -> float:
-        v1 = np.array(vec1)
-        v2 = np.array(vec2)
-        return float(np.dot(v1, v2) / (np.linalg.norm(v1) * np.linalg.norm(v2)))
 
-    def _get_embedding(self, text: str) -> List[float]:
-        return self.client.models.embed_content(model="text-embedding-004", contents=text).embeddings[0].values
+class GeminiResumeMatcher(BaseResumeMatcher):
+    name = "gemini"
+    summary_model = "gemini-2.5-flash"
+    embedding_model = "text-embedding-004"
+
+    def __init__(self) -> None:
+        self.client = genai.Client(
+            api_key=settings.AI_SERVICE_KEY,
+            http_options=types.HttpOptions(
+                base_url=settings.GEMINI_BASE_URL,
+                timeout=int(settings.LLM_REQUEST_TIMEOUT * 1000)),
+        )
+        self.generation_limiter = get_quota_limiter(
+            f"gemini:{self.summary_model}", settings.GEMINI_RPM, settings.GEMINI_TPM, is_overload_error)
+        self.embedding_limiter = get_quota_limiter(
+            f"gemini:{self.embedding_model}", settings.GEMINI_EMBEDDING_RPM,
+            settings.GEMINI_EMBEDDING_TPM, is_overload_error)
+
+    def _generate(self, contents: str, config) -> types.GenerateContentResponse:
+        tokens = estimate_tokens(contents) + settings.GEMINI_EXPECTED_OUTPUT_TOKENS
+        return self.generation_limiter.call(
+            lambda: self.client.models.generate_content(
+                model=self.summary_model, contents=contents, config=config),
+            tokens)
+
+    def _request_embeddings(self, texts: List[str]) -> List[List[float]]:
+        tokens = sum(estimate_tokens(text) for text in texts)
+        response = self.embedding_limiter.call(
+            lambda: self.client.models.embed_content(
+                model=self.embedding_model, contents=texts),
+            tokens, requests=len(texts))
+        return [embedding.values for embedding in response.embeddings]
+
+    def _complete(self, prompt: str) -> str:
+        return self._generate(prompt, config=None).text
 
     def extract_summary_from_resume(self, content: str) -> SummaryResume:
         prompt = f"""
@@ -40,9 +69,8 @@ class GeminiResumeMatcher(BaseResumeMatcher):
         Por favor, retorne apenas um JSON que siga esse esquema.
         """
 
-        response = self.client.models.generate_content(
-            model='gemini-2.5-flash',
-            contents=prompt,
+        response = self._generate(
+            prompt,
             config={
                 "response_mime_type": "application/json",
                 'response_schema': {
@@ -63,32 +91,7 @@ class GeminiResumeMatcher(BaseResumeMatcher):
         )
         return SummaryResume(**response.parsed)
 
-    def rank_resumes_by_similarity(self, query: str, resumes: List[SummaryResume], k: int = 5, threshold: float = 0.5) -> List[SummaryResume]:
-        scored_resumes: List[SummaryResume] = []
-        query_embedding = self._get_embedding(query)
-
-        for resume in resumes:
-
-            resume_embedding = self._get_embedding(resume.summary)
-
-            similarity = self._cosine_similarity(
-                query_embedding, resume_embedding)
-
-            if similarity >= threshold:
-                resume.score = similarity
-                scored_resumes.append(resume)
-
-        scored_resumes.sort(key=lambda x: x.score or 0, reverse=True)
-        top_k = scored_resumes[:k]
-
-        logger.info(
-            f"Top {len(top_k)} currículos selecionados (threshold={threshold}, k={k}): "
-            + ", ".join(f"{r.candidate_name} ({r.score}%)" for r in top_k)
-        )
-
-        return top_k
-
-    def generate_candidate_justification(self, query: str, resumes: List[SummaryResume]) -> str:
+    def stream_candidate_justification(self, query: str, resumes: List[SummaryResume]) -> Iterator[str]:
         summaries = chr(10).join(
             [f"{i+1}. Nome: {r.candidate_name}\nResumo: {r.summary}" for i, r in enumerate(resumes)])
 
@@ -114,12 +117,15 @@ class GeminiResumeMatcher(BaseResumeMatcher):
         - Justificativa: <Texto detalhado explicando por que este candidato é o mais adequado em comparação aos demais>
         """
         logger.info(f'{contents}')
-        response = self.client.models.generate_content(
-            model="gemini-2.5-flash",
-            contents=contents,
-            config=types.GenerateContentConfig(
-                system_instruction="Você é uma especialista em análise de currículos com foco em identificar o"
-                "candidato mais adequado com base em uma necessidade específica.",
-            ),
+        config = types.GenerateContentConfig(
+            system_instruction="Você é uma especialista em análise de currículos com foco em identificar o"
+            "candidato mais adequado com base em uma necessidade específica.",
         )
-        return response.text
+        tokens = estimate_tokens(contents) + settings.GEMINI_EXPECTED_OUTPUT_TOKENS
+        chunks = self.generation_limiter.stream(
+            lambda: self.client.models.generate_content_stream(
+                model=self.summary_model, contents=contents, config=config),
+            tokens)
+        for chunk in chunks:
+            if chunk.text:
+                yield chunk.text
@@ -0,0 +1,78 @@
+import time
+import redis
+import logging
+
+from typing import Iterable, Optional
+from config import settings, get_redis_client
+
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+
+def justification_key(log_id: str) -> str:
+    return f"justification:{log_id}"
+
+
+class JustificationStream:
+    """
+    Repassa os trechos da justificativa, conforme o LLM os gera, para o stream Redis
+    `justification:<log_id>`. Entradas `chunk` trazem o texto e a última é `done` ou `error`;
+    por ser um stream (e não pub/sub), quem conecta depois recebe o texto desde o início.
+
+    Falhas do Redis não interrompem a geração: o texto completo continua sendo devolvido
+    e persistido no log.
+    """
+
+    def __init__(self, log_id: str, redis_client: Optional[redis.Redis] = None) -> None:
+        self.log_id = log_id
+        self.key = justification_key(log_id)
+        self.redis = redis_client or get_redis_client()
+        self.enabled = True
+
+    def _add(self, fields: dict) -> None:
+        if not self.enabled:
+            return
+        try:
+            pipe = self.redis.pipeline()
+            pipe.xadd(self.key, fields)
+            pipe.expire(self.key, settings.JUSTIFICATION_STREAM_TTL_SECONDS)
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"[log_id={self.log_id}] Falha ao publicar a justificativa: {e}")
+            self.enabled = False
+
+    def reset(self) -> None:
+        """Descarta trechos de uma tentativa anterior da mesma análise."""
+        try:
+            self.redis.delete(self.key)
+        except redis.RedisError as e:
+            logger.warning(f"[log_id={self.log_id}] Falha ao publicar a justificativa: {e}")
+            self.enabled = False
+
+    def write(self, chunks: Iterable[str]) -> str:
+        """
+        Publica os trechos e devolve o texto completo. O primeiro trecho sai imediatamente; os
+        seguintes são agrupados por JUSTIFICATION_STREAM_FLUSH_INTERVAL para não gerar uma
+        entrada por token.
+        """
+        self.reset()
+        parts = []
+        pending = []
+        last_flush = 0.0
+        try:
+            for chunk in chunks:
+                parts.append(chunk)
+                pending.append(chunk)
+                now = time.monotonic()
+                if now - last_flush >= settings.JUSTIFICATION_STREAM_FLUSH_INTERVAL:
+                    self._add({"type": "chunk", "text": "".join(pending)})
+                    pending.clear()
+                    last_flush = now
+        except Exception as e:
+            self._add({"type": "error", "error": str(e)})
+            raise
+
+        if pending:
+            self._add({"type": "chunk", "text": "".join(pending)})
+        self._add({"type": "done"})
+        return "".join(parts)
@@ -0,0 +1,78 @@
+import time
+import queue
+import easyocr
+import logging
+import threading
+import numpy as np
+
+from typing import List, Optional
+from config import settings
+from contextlib import contextmanager
+
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+
+class OCRReaderPool:
+    def __init__(self, size: int = 1, languages: Optional[List[str]] = None) -> None:
+        self.size = max(size, 1)
+        self.languages = languages or ['pt']
+        self.load_time: Optional[float] = None
+        self._readers: "queue.Queue[easyocr.Reader]" = queue.Queue()
+
+    def load(self) -> float:
+        """Carrega os leitores do pool e retorna o tempo total de carregamento."""
+        start = time.perf_counter()
+        for _ in range(self.size):
+            reader = easyocr.Reader(self.languages)
+            self._warm_up(reader)
+            self._readers.put(reader)
+        self.load_time = time.perf_counter() - start
+        return self.load_time
+
+    def _warm_up(self, reader: easyocr.Reader) -> None:
+        # A primeira inferência aloca os buffers do modelo; fazemos isso no start.
+        dummy = np.full((64, 256, 3), 255, dtype=np.uint8)
+        reader.readtext(dummy)
+
+    @contextmanager
+    def acquire(self, timeout: Optional[float] = None):
+        reader = self._readers.get(timeout=timeout)
+        try:
+            yield reader
+        finally:
+            self._readers.put(reader)
+
+    def health_check(self, timeout: float = 30.0) -> dict:
+        start = time.perf_counter()
+        try:
+            with self.acquire(timeout=timeout) as reader:
+                self._warm_up(reader)
+            healthy = True
+        except Exception as e:
+            logger.exception(f"Falha no health check do OCR: {e}")
+            healthy = False
+        return {
+            "healthy": healthy,
+            "readers": self.size,
+            "available": self._readers.qsize(),
+            "load_time": self.load_time,
+            "latency": time.perf_counter() - start,
+        }
+
+
+_pool: Optional[OCRReaderPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_reader_pool() -> OCRReaderPool:
+    """Retorna o pool de leitores do processo, carregando-o na primeira chamada."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            pool = OCRReaderPool(size=settings.OCR_READERS_PER_PROCESS)
+            load_time = pool.load()
+            logger.info(
+                f"{pool.size} leitor(es) EasyOCR carregado(s) em {load_time:.2f}s")
+            _pool = pool
+        return _pool
@@ -1,9 +1,8 @@
 import json
 import logging
 import requests
-import numpy as np
 
-from typing import List
+from typing import Iterator, List
 from config import settings
 from schemas import SummaryResume
 from services.base_resume_matcher import BaseResumeMatcher
@@ -13,19 +12,18 @@ logger = logging.getLogger(__name__)
 
 
 class OllamaResumeMatcher(BaseResumeMatcher):
-    def _cosine_similarity(self, vec1: List[float], vec2: List[float]) -> float:
-        v1 = np.array(vec1)
-        v2 = np.array(vec2)
-        return float(np.dot(v1, v2) / (np.linalg.norm(v1) * np.linalg.norm(v2)))
+    name = "ollama"
+    summary_model = "llama3.2:latest"
+    embedding_model = "bge-m3"
 
-    def _get_embedding(self, text: str) -> List[float]:
+    def _request_embeddings(self, texts: List[str]) -> List[List[float]]:
         response = requests.post(f"{settings.AI_SERVICE_KEY}/embed", json={
-            "model": "bge-m3",
-            "input": text
-        })
-        return response.json()['embeddings'][0]
+            "model": self.embedding_model,
+            "input": texts
+        }, timeout=settings.LLM_REQUEST_TIMEOUT)
+        return response.json()['embeddings']
 
-    def extract_summary_from_resume(self, content: str) -> SummaryResume:
+    def _summary_payload(self, content: str) -> dict:
         prompt = f"""
         Você é uma especialista em elaborar resumos de currículos, com grande habilidade para captar o máximo de informações relevantes de cada documento.
 
@@ -41,8 +39,8 @@ class OllamaResumeMatcher(BaseResumeMatcher):
         Por favor, retorne apenas um JSON que siga esse esquema.
         """
 
-        response = requests.post(f"{settings.AI_SERVICE_KEY}/chat", json={
-            "model": "llama3.2:latest",
+        return {
+            "model": self.summary_model,
             "messages": [{"role": "user", "content": prompt}],
             "stream": False,
             "format":  {
@@ -62,35 +60,31 @@ class OllamaResumeMatcher(BaseResumeMatcher):
                     "summary"
                 ]
             }
-        })
-        return SummaryResume(**json.loads(response.json()['message']['content']))
-
-    def rank_resumes_by_similarity(self, query: str, resumes: List[SummaryResume], k: int = 5, threshold: float = 0.5) -> List[SummaryResume]:
-        scored_resumes: List[SummaryResume] = []
-        query_embedding = self._get_embedding(query)
-
-        for resume in resumes:
-
-            resume_embedding = self._get_embedding(resume.summary)
-
-            similarity = self._cosine_similarity(
-                query_embedding, resume_embedding)
+        }
 
-            if similarity >= threshold:
-                resume.score = similarity
-                scored_resumes.append(resume)
+    def _parse_summary(self, response: dict) -> SummaryResume:
+        return SummaryResume(**json.loads(response['message']['content']))
 
-        scored_resumes.sort(key=lambda x: x.score or 0, reverse=True)
-        top_k = scored_resumes[:k]
+    def extract_summary_from_resume(self, content: str) -> SummaryResume:
+        response = requests.post(f"{settings.AI_SERVICE_KEY}/chat", json=self._summary_payload(content),
+                                 timeout=settings.LLM_REQUEST_TIMEOUT)
+        return self._parse_summary(response.json())
 
-        logger.info(
-            f"Top {len(top_k)} currículos selecionados (threshold={threshold}, k={k}): "
-            + ", ".join(f"{r.candidate_name} ({r.score}%)" for r in top_k)
-        )
+    def _complete_payload(self, prompt: str) -> dict:
+        return {
+            "model": self.summary_model,
+            "messages": [{"role": "user", "content": prompt}],
+            "stream": False,
+            "options": {"temperature": 0.2},
+        }
 
-        return top_k
+    def _complete(self, prompt: str) -> str:
+        response = requests.post(f"{settings.AI_SERVICE_KEY}/chat", json=self._complete_payload(prompt),
+                                 timeout=settings.LLM_REQUEST_TIMEOUT)
+        response.raise_for_status()
+        return response.json()['message']['content']
 
-    def generate_candidate_justification(self, query: str, resumes: List[SummaryResume]) -> str:
+    def stream_candidate_justification(self, query: str, resumes: List[SummaryResume]) -> Iterator[str]:
         summaries = chr(10).join(
             [f"{i+1}. Nome: {r.candidate_name}\nResumo: {r.summary}" for i, r in enumerate(resumes)])
 
@@ -118,13 +112,24 @@ class OllamaResumeMatcher(BaseResumeMatcher):
         - Justificativa: <Texto detalhado explicando por que este candidato é o mais adequado em comparação aos demais>
         """
         logger.info(f'{prompt}')
-        response = requests.post(f"{settings.AI_SERVICE_KEY}/generate", json={
+        # Com stream, o Ollama responde uma linha JSON por token; o timeout vale entre linhas.
+        with requests.post(f"{settings.AI_SERVICE_KEY}/generate", json={
             "prompt": prompt,
-            "stream": False,
-            "model": "llama3.2:latest",
+            "stream": True,
+            "model": self.summary_model,
             "options": {
                 "temperature": 0.2,
                 "repeat_penalty": 1,
             }
-        })
-        return response.json()['response']
+        }, stream=True, timeout=settings.LLM_REQUEST_TIMEOUT) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                if chunk.get("error"):
+                    raise RuntimeError(chunk["error"])
+                if chunk.get("response"):
+                    yield chunk["response"]
+                if chunk.get("done"):
+                    break
@@ -0,0 +1,119 @@
+import billiard
+import easyocr
+import logging
+import numpy as np
+
+from collections import deque
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Any, Deque, Iterable, Iterator, List, Optional, Tuple
+
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+_reader: Optional[easyocr.Reader] = None
+
+
+def _init_ocr_process(languages: List[str], threads: int) -> None:
+    global _reader
+    import torch
+
+    # Cada processo do pool recebe uma página; limitar as threads do torch evita
+    # que N processos disputem todos os núcleos entre si.
+    torch.set_num_threads(max(threads, 1))
+    _reader = easyocr.Reader(languages)
+
+
+def _ocr_shared_page(name: str, shape: Tuple[int, ...]) -> List[str]:
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        image = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf)
+        results = _reader.readtext(image)
+        del image
+        return [text for _, text, _ in results]
+    finally:
+        shm.close()
+
+
+@dataclass
+class SharedPage:
+    key: Any
+    shm: shared_memory.SharedMemory
+    shape: Tuple[int, ...]
+
+    @classmethod
+    def from_buffer(cls, key: Any, buffer: memoryview, shape: Tuple[int, ...]) -> "SharedPage":
+        shm = shared_memory.SharedMemory(create=True, size=max(buffer.nbytes, 1))
+        shm.buf[:buffer.nbytes] = buffer
+        return cls(key=key, shm=shm, shape=shape)
+
+    def release(self) -> None:
+        self.shm.close()
+        self.shm.unlink()
+
+
+class ParallelPageOCR:
+    """Executa OCR de páginas em um pool de processos com número limitado de páginas em voo."""
+
+    def __init__(
+        self,
+        processes: int,
+        max_inflight: int = 0,
+        languages: Optional[List[str]] = None,
+        threads_per_process: int = 1,
+        start_method: str = "spawn",
+    ) -> None:
+        self.processes = max(processes, 1)
+        self.max_inflight = max_inflight or self.processes * 2
+        self.languages = languages or ['pt']
+        self.threads_per_process = threads_per_process
+        self.start_method = start_method
+        self._pool = None
+
+    @property
+    def pool(self):
+        if self._pool is None:
+            context = billiard.get_context(self.start_method)
+            self._pool = context.Pool(
+                processes=self.processes,
+                initializer=_init_ocr_process,
+                initargs=(self.languages, self.threads_per_process),
+            )
+        return self._pool
+
+    def ocr(self, pages: Iterable[SharedPage]) -> Iterator[Tuple[Any, List[str]]]:
+        """
+        Consome o gerador de páginas e devolve (chave, linhas) na ordem de entrada.
+
+        O gerador só avança quando há espaço na janela de páginas em voo, então a
+        memória fica limitada a max_inflight páginas renderizadas.
+        """
+        inflight: Deque[Tuple[SharedPage, Any]] = deque()
+
+        try:
+            for page in pages:
+                inflight.append((page, self.pool.apply_async(
+                    _ocr_shared_page, (page.shm.name, page.shape))))
+
+                if len(inflight) >= self.max_inflight:
+                    yield self._collect(inflight.popleft())
+
+            while inflight:
+                yield self._collect(inflight.popleft())
+
+        finally:
+            for page, _ in inflight:
+                page.release()
+
+    def _collect(self, item: Tuple[SharedPage, Any]) -> Tuple[Any, List[str]]:
+        page, async_result = item
+        try:
+            return page.key, async_result.get()
+        finally:
+            page.release()
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
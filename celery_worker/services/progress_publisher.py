@@ -0,0 +1,100 @@
+import json
+import time
+import redis
+import logging
+
+from typing import Optional
+from config import settings, get_redis_client
+
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+
+class ProgressStage:
+    STARTED = "started"
+    OCR = "ocr"
+    SUMMARY = "summary"
+    RANKING = "ranking"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+TERMINAL_STAGES = (ProgressStage.COMPLETED, ProgressStage.FAILED)
+
+
+def progress_key(log_id: str) -> str:
+    return f"progress:{log_id}"
+
+
+class ProgressPublisher:
+    """
+    Publica o andamento de uma análise no canal Redis `progress:<log_id>`.
+
+    Cada arquivo vale duas unidades (extração e sumário) e a finalização vale uma; o contador
+    fica em um hash Redis com o mesmo nome do canal, incrementado atomicamente pelas tarefas
+    em qualquer worker, e serve de snapshot para quem se inscreve depois do início.
+    """
+
+    def __init__(self, log_id: str, redis_client: Optional[redis.Redis] = None) -> None:
+        self.log_id = log_id
+        self.key = progress_key(log_id)
+        self.redis = redis_client or get_redis_client()
+
+    def start(self, files: int) -> None:
+        now = time.time()
+        total = 2 * files + 1
+        try:
+            pipe = self.redis.pipeline()
+            pipe.delete(self.key)
+            pipe.hset(self.key, mapping={
+                "total": total, "done": 0, "started_at": now, "stage": ProgressStage.STARTED,
+            })
+            pipe.expire(self.key, settings.PROGRESS_TTL_SECONDS)
+            pipe.execute()
+            self._publish(ProgressStage.STARTED, done=0, total=total, started_at=now, files=files)
+        except redis.RedisError as e:
+            logger.warning(f"[log_id={self.log_id}] Falha ao publicar progresso: {e}")
+
+    def advance(self, stage: str, filename: Optional[str] = None, **details) -> None:
+        """Conta uma unidade concluída e publica o evento com fração e ETA atualizadas."""
+        self._emit(stage, 1, filename, **details)
+
+    def notify(self, stage: str, **details) -> None:
+        """Publica um evento sem avançar o contador (ex.: início do ranqueamento)."""
+        self._emit(stage, 0, None, **details)
+
+    def _emit(self, stage: str, units: int, filename: Optional[str], **details) -> None:
+        try:
+            pipe = self.redis.pipeline()
+            pipe.hincrby(self.key, "done", units)
+            pipe.hset(self.key, "stage", stage)
+            pipe.hmget(self.key, "total", "started_at")
+            done, _, (total, started_at) = pipe.execute()
+            if total is None:
+                # A análise começou antes de o progresso existir ou o hash expirou.
+                self.redis.delete(self.key)
+                return
+            self._publish(stage, done=done, total=int(total), started_at=float(started_at),
+                          filename=filename, **details)
+        except redis.RedisError as e:
+            logger.warning(f"[log_id={self.log_id}] Falha ao publicar progresso: {e}")
+
+    def _publish(self, stage: str, done: int, total: int, started_at: float, **details) -> None:
+        elapsed = time.time() - started_at
+        fraction = min(done / total, 1.0) if total else 0.0
+        eta = elapsed * (1 - fraction) / fraction if 0 < fraction < 1 else (0.0 if fraction >= 1 else None)
+        event = {
+            "log_id": self.log_id,
+            "stage": stage,
+            "done": done,
+            "total": total,
+            "progress": round(fraction, 4),
+            "elapsed_seconds": round(elapsed, 2),
+            "eta_seconds": round(eta, 2) if eta is not None else None,
+            **{name: value for name, value in details.items() if value is not None},
+        }
+        payload = json.dumps(event)
+        pipe = self.redis.pipeline()
+        pipe.hset(self.key, "last_event", payload)
+        pipe.publish(self.key, payload)
+        pipe.execute()
@@ -0,0 +1,228 @@
+import time
+import redis
+import random
+import logging
+import threading
+
+from contextlib import contextmanager
+from config import settings, get_redis_client
+from typing import Callable, Dict, Iterable, Iterator, Optional, Sequence, Tuple
+
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+# Consome de todos os buckets ou de nenhum. Cada bucket recebe (capacidade, taxa de
+# reposição por segundo, quantidade pedida) e a resposta é o tempo de espera em segundos
+# até que todos tenham saldo suficiente (0 quando o consumo foi aceito). O relógio é o do
+# Redis, então workers em máquinas diferentes compartilham a mesma noção de tempo.
+TOKEN_BUCKET_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+local wait = 0
+local tokens = {}
+
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[(i - 1) * 3 + 1])
+    local rate = tonumber(ARGV[(i - 1) * 3 + 2])
+    local requested = tonumber(ARGV[(i - 1) * 3 + 3])
+    local state = redis.call('HMGET', key, 'tokens', 'ts')
+    local available = tonumber(state[1]) or capacity
+    local ts = tonumber(state[2]) or now
+    available = math.min(capacity, available + math.max(0, now - ts) * rate)
+    tokens[i] = available
+    if available < requested then
+        wait = math.max(wait, (requested - available) / rate)
+    end
+end
+
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[(i - 1) * 3 + 1])
+    local rate = tonumber(ARGV[(i - 1) * 3 + 2])
+    local requested = tonumber(ARGV[(i - 1) * 3 + 3])
+    local available = tokens[i]
+    if wait == 0 then
+        available = available - requested
+    end
+    redis.call('HSET', key, 'tokens', available, 'ts', now)
+    redis.call('EXPIRE', key, math.ceil(capacity / rate) * 2 + 1)
+end
+
+return tostring(wait)
+"""
+
+
+class RedisTokenBucket:
+    """Token buckets compartilhados entre processos, consumidos atomicamente via Lua."""
+
+    def __init__(self, redis_client: redis.Redis, namespace: str) -> None:
+        self.redis = redis_client
+        self.namespace = namespace
+        self._script = redis_client.register_script(TOKEN_BUCKET_SCRIPT)
+
+    def try_acquire(self, buckets: Sequence[Tuple[str, float, float, float]]) -> float:
+        """
+        Tenta consumir (nome, capacidade, por_minuto, quantidade) de cada bucket.
+        Retorna 0 se consumiu ou o tempo de espera sugerido em segundos.
+        """
+        keys, args = [], []
+        for name, capacity, per_minute, amount in buckets:
+            keys.append(f"{self.namespace}:{name}")
+            args.extend((capacity, per_minute / 60, min(amount, capacity)))
+        return float(self._script(keys=keys, args=args))
+
+    def acquire(self, buckets: Sequence[Tuple[str, float, float, float]], max_wait: Optional[float] = None) -> float:
+        """Bloqueia até conseguir consumir os buckets e retorna o tempo total esperado."""
+        waited = 0.0
+        while True:
+            wait = self.try_acquire(buckets)
+            if wait <= 0:
+                return waited
+            if max_wait is not None and waited + wait > max_wait:
+                raise TimeoutError(f"Cota indisponível após {waited:.1f}s")
+            # Um pouco de jitter evita que processos acordem juntos e disputem o mesmo saldo.
+            wait *= 1 + random.random() * 0.1
+            time.sleep(wait)
+            waited += wait
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Limite de chamadas simultâneas no processo com ajuste AIMD: cresce ~1 a cada janela de
+    chamadas bem-sucedidas e cai pela metade quando o serviço sinaliza sobrecarga.
+    """
+
+    def __init__(self, initial: int, minimum: int = 1, maximum: int = 64, decrease_factor: float = 0.5) -> None:
+        self.minimum = max(minimum, 1)
+        self.maximum = max(maximum, self.minimum)
+        self.limit = float(min(max(initial, self.minimum), self.maximum))
+        self.decrease_factor = decrease_factor
+        self.inflight = 0
+        self._condition = threading.Condition()
+
+    def acquire(self) -> None:
+        with self._condition:
+            while self.inflight >= int(self.limit):
+                self._condition.wait()
+            self.inflight += 1
+
+    def release(self) -> None:
+        with self._condition:
+            self.inflight -= 1
+            self._condition.notify_all()
+
+    def on_success(self) -> None:
+        with self._condition:
+            self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._condition.notify_all()
+
+    def on_overload(self) -> None:
+        with self._condition:
+            self.limit = max(self.minimum, self.limit * self.decrease_factor)
+        logger.warning(f"Sobrecarga no serviço de IA; concorrência reduzida para {int(self.limit)}")
+
+
+class QuotaLimiter:
+    """Combina as cotas de requisições/tokens por minuto com a concorrência adaptativa."""
+
+    def __init__(
+        self,
+        bucket: RedisTokenBucket,
+        concurrency: AdaptiveConcurrencyLimiter,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        is_overload: Callable[[Exception], bool],
+        max_retries: int = 5,
+        backoff: float = 1.0,
+    ) -> None:
+        self.bucket = bucket
+        self.concurrency = concurrency
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.is_overload = is_overload
+        self.max_retries = max_retries
+        self.backoff = backoff
+
+    @contextmanager
+    def _slot(self, tokens: int, requests: int):
+        self.concurrency.acquire()
+        try:
+            self.bucket.acquire([
+                ("requests", self.requests_per_minute, self.requests_per_minute, requests),
+                ("tokens", self.tokens_per_minute, self.tokens_per_minute, tokens),
+            ])
+            yield
+        finally:
+            self.concurrency.release()
+
+    def call(self, fn: Callable[[], object], tokens: int, requests: int = 1):
+        """Executa fn respeitando as cotas e repetindo com backoff em respostas 429/503."""
+        for attempt in range(self.max_retries + 1):
+            try:
+                with self._slot(tokens, requests):
+                    result = fn()
+            except Exception as e:
+                if not self.is_overload(e) or attempt == self.max_retries:
+                    raise
+                self.concurrency.on_overload()
+                delay = self.backoff * 2 ** attempt * (1 + random.random())
+                logger.warning(f"Cota excedida ({e}); nova tentativa em {delay:.1f}s")
+                time.sleep(delay)
+                continue
+
+            self.concurrency.on_success()
+            return result
+
+    def stream(self, fn: Callable[[], Iterable], tokens: int) -> Iterator:
+        """
+        Como `call`, para respostas em streaming: repete com backoff enquanto o primeiro trecho
+        não chega (é quando 429/503 aparecem) e mantém o slot de concorrência até o fim do stream.
+        """
+        for attempt in range(self.max_retries + 1):
+            with self._slot(tokens, 1):
+                try:
+                    chunks = iter(fn())
+                    first = next(chunks, None)
+                except Exception as e:
+                    if not self.is_overload(e) or attempt == self.max_retries:
+                        raise
+                    error = e
+                else:
+                    self.concurrency.on_success()
+                    if first is not None:
+                        yield first
+                    yield from chunks
+                    return
+
+            self.concurrency.on_overload()
+            delay = self.backoff * 2 ** attempt * (1 + random.random())
+            logger.warning(f"Cota excedida ({error}); nova tentativa em {delay:.1f}s")
+            time.sleep(delay)
+
+
+_limiters: Dict[str, QuotaLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_quota_limiter(
+    namespace: str,
+    requests_per_minute: int,
+    tokens_per_minute: int,
+    is_overload: Callable[[Exception], bool],
+) -> QuotaLimiter:
+    """Um limitador por namespace e processo; o saldo das cotas fica no Redis."""
+    with _limiters_lock:
+        if namespace not in _limiters:
+            _limiters[namespace] = QuotaLimiter(
+                bucket=RedisTokenBucket(get_redis_client(), f"ratelimit:{namespace}"),
+                concurrency=AdaptiveConcurrencyLimiter(
+                    initial=settings.GEMINI_INITIAL_CONCURRENCY,
+                    minimum=settings.GEMINI_MIN_CONCURRENCY,
+                    maximum=settings.GEMINI_MAX_CONCURRENCY,
+                ),
+                requests_per_minute=requests_per_minute,
+                tokens_per_minute=tokens_per_minute,
+                is_overload=is_overload,
+                max_retries=settings.GEMINI_MAX_RETRIES,
+                backoff=settings.GEMINI_RETRY_BACKOFF,
+            )
+        return _limiters[namespace]
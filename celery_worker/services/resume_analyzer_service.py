@@ -1,4 +1,6 @@
-from typing import List
+import numpy as np
+
+from typing import Iterator, List, Union
 from schemas import SummaryResume
 from services.base_resume_matcher import BaseResumeMatcher
 
@@ -8,10 +10,19 @@ class ResumeAnalyzerService:
         self.llm_service = matcher
 
     def generate_summary(self, content: str) -> SummaryResume:
-        return self.llm_service.extract_summary_from_resume(content)
+        return self.llm_service.summarize_resume(content)
+
+    def generate_summaries(self, contents: List[str]) -> List[Union[SummaryResume, Exception]]:
+        return self.llm_service.summarize_many(contents)
+
+    def embed_resumes(self, resumes: List[SummaryResume]) -> np.ndarray:
+        return self.llm_service.embed_texts([resume.summary for resume in resumes])
 
     def rank_resumes(self, query: str, resumes: List[SummaryResume], k: int = 5, threshold: float = 0.5) -> List[SummaryResume]:
         return self.llm_service.rank_resumes_by_similarity(query, resumes, k, threshold)
 
     def generate_justification(self, query: str, resumes: List[SummaryResume]) -> str:
         return self.llm_service.generate_candidate_justification(query, resumes)
+
+    def stream_justification(self, query: str, resumes: List[SummaryResume]) -> Iterator[str]:
+        return self.llm_service.stream_candidate_justification(query, resumes)
@@ -0,0 +1,125 @@
+import re
+import math
+
+from config import settings
+from collections import Counter
+from typing import List
+
+# Linhas do topo/rodapé de cada página consideradas na busca por cabeçalhos repetidos.
+EDGE_LINES = 3
+
+# Incrementar a cada mudança em normalize_pages ou chunk_text que altere o texto enviado ao LLM,
+# para que sumários em cache gerados a partir do texto antigo deixem de ser reaproveitados.
+NORMALIZATION_VERSION = 1
+
+_SPACES = re.compile(r"[ \t\f\v\u00a0]+")
+_REPEATED_PUNCTUATION = re.compile(r"([^\w\s])\1{3,}")
+_DIGITS = re.compile(r"\d+")
+
+
+def estimate_tokens(text: str) -> int:
+    # Aproximação usual de ~4 caracteres por token para textos em português/inglês.
+    return math.ceil(len(text) / 4)
+
+
+def summary_config_signature() -> str:
+    """Identifica a normalização e os limites da sumarização, para uso em chaves de cache."""
+    return f"text-v{NORMALIZATION_VERSION}|{settings.SUMMARY_PROMPT_TOKEN_BUDGET}|{settings.SUMMARY_CHUNK_TOKENS}"
+
+
+def _clean_line(line: str) -> str:
+    line = _REPEATED_PUNCTUATION.sub(" ", line)
+    return _SPACES.sub(" ", line).strip()
+
+
+def _is_noise(line: str) -> bool:
+    """Linhas que o OCR produz a partir de bordas, ícones e traços: sem letras ou quase só símbolos."""
+    if len(line) <= 1:
+        return True
+    alnum = sum(1 for char in line if char.isalnum())
+    return alnum == 0 or (len(line) >= 3 and alnum / len(line) < 0.3)
+
+
+def _edge_key(line: str) -> str:
+    # Números mudam entre páginas ("Página 2 de 3"), então não entram na comparação.
+    return _DIGITS.sub("#", line.lower())
+
+
+def _edges(lines: List[str]) -> List[str]:
+    content = [line for line in lines if line]
+    return content[:EDGE_LINES] + content[-EDGE_LINES:]
+
+
+def normalize_pages(pages: List[str]) -> str:
+    """
+    Limpa o texto extraído de um currículo antes de enviá-lo ao LLM: remove cabeçalhos e rodapés
+    repetidos na maioria das páginas, linhas de ruído do OCR, sequências de pontuação e linhas
+    duplicadas em sequência, e colapsa espaços e linhas em branco. Linhas em branco isoladas
+    são mantidas como separadores de parágrafo.
+    """
+    pages = [[_clean_line(line) for line in page.splitlines()] for page in pages if page]
+
+    repeated = set()
+    if len(pages) >= 2:
+        counts = Counter(key for lines in pages for key in {_edge_key(line) for line in _edges(lines)})
+        min_pages = max(2, math.ceil(len(pages) / 2))
+        repeated = {key for key, count in counts.items() if count >= min_pages}
+
+    output: List[str] = []
+    kept = set()
+    for lines in pages:
+        edges = {_edge_key(line) for line in _edges(lines)}
+        for line in lines:
+            if not line:
+                if output and output[-1]:
+                    output.append("")
+                continue
+            key = _edge_key(line)
+            if key in repeated and key in edges:
+                # A primeira ocorrência fica: o cabeçalho costuma trazer o nome e o contato.
+                if key in kept:
+                    continue
+                kept.add(key)
+            if _is_noise(line) or (output and output[-1] == line):
+                continue
+            output.append(line)
+        if output and output[-1]:
+            output.append("")
+
+    return "\n".join(output).strip()
+
+
+def _split_oversized(text: str, max_tokens: int) -> List[str]:
+    size = max_tokens * 4
+    return [text[start:start + size] for start in range(0, len(text), size)]
+
+
+def chunk_text(text: str, max_tokens: int) -> List[str]:
+    """
+    Divide o texto em trechos de até ~max_tokens, preferindo quebrar entre parágrafos, depois
+    entre linhas e só em último caso no meio de uma linha.
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return [text]
+
+    units: List[str] = []
+    for paragraph in text.split("\n\n"):
+        if estimate_tokens(paragraph) <= max_tokens:
+            units.append(paragraph)
+            continue
+        for line in paragraph.splitlines():
+            units.extend(_split_oversized(line, max_tokens) if estimate_tokens(line) > max_tokens else [line])
+
+    chunks: List[str] = []
+    current: List[str] = []
+    current_tokens = 0
+    for unit in units:
+        tokens = estimate_tokens(unit) + 1
+        if current and current_tokens + tokens > max_tokens:
+            chunks.append("\n".join(current))
+            current, current_tokens = [], 0
+        current.append(unit)
+        current_tokens += tokens
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
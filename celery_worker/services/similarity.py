@@ -0,0 +1,16 @@
+import numpy as np
+
+from typing import List, Tuple
+from shared.similarity import normalize_rows, select_top_k
+
+
+def top_k_by_similarity(query: np.ndarray, matrix: np.ndarray, k: int, threshold: float) -> List[Tuple[int, float]]:
+    """
+    Calcula a similaridade do cosseno da query com cada linha da matriz e retorna os
+    índices e scores dos k mais similares acima do threshold, em ordem decrescente.
+    """
+    if len(matrix) == 0 or k <= 0:
+        return []
+
+    scores = normalize_rows(matrix) @ normalize_rows(query)[0]
+    return [(int(i), float(scores[i])) for i in select_top_k(scores, k, threshold)]
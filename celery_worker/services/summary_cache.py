@@ -0,0 +1,74 @@
+import hashlib
+import logging
+import pymongo
+
+from typing import Optional
+from config import settings
+from schemas import SummaryResume
+from datetime import datetime, timedelta, timezone
+
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+
+def hash_file(filepath: str) -> str:
+    with open(filepath, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+class SummaryCache:
+    """Cache de sumários endereçado pelo conteúdo do arquivo e pela configuração do pipeline."""
+
+    _indexes_ready = False
+
+    def __init__(self, collection, ttl_seconds: Optional[int] = None, max_entries: Optional[int] = None) -> None:
+        self.collection = collection
+        self.ttl = timedelta(
+            seconds=ttl_seconds or settings.SUMMARY_CACHE_TTL_SECONDS)
+        self.max_entries = max_entries or settings.SUMMARY_CACHE_MAX_ENTRIES
+        self._ensure_indexes()
+
+    def _ensure_indexes(self) -> None:
+        if SummaryCache._indexes_ready:
+            return
+        self.collection.create_index("expires_at", expireAfterSeconds=0)
+        self.collection.create_index("last_accessed")
+        SummaryCache._indexes_ready = True
+
+    @staticmethod
+    def make_key(file_hash: str, *config: str) -> str:
+        return hashlib.sha256(":".join((file_hash, *config)).encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[SummaryResume]:
+        now = datetime.now(timezone.utc)
+        doc = self.collection.find_one_and_update(
+            {"_id": key, "expires_at": {"$gt": now}},
+            {"$set": {"last_accessed": now}},
+        )
+        return SummaryResume(**doc["summary"]) if doc else None
+
+    def set(self, key: str, summary: SummaryResume) -> None:
+        now = datetime.now(timezone.utc)
+        self.collection.replace_one(
+            {"_id": key},
+            {
+                "summary": summary.model_dump(exclude={"score"}),
+                "created_at": now,
+                "last_accessed": now,
+                "expires_at": now + self.ttl,
+            },
+            upsert=True,
+        )
+        self._evict()
+
+    def _evict(self) -> None:
+        overflow = self.collection.estimated_document_count() - self.max_entries
+        if overflow <= 0:
+            return
+
+        stale = self.collection.find({}, {"_id": 1}).sort(
+            "last_accessed", pymongo.ASCENDING).limit(overflow)
+        ids = [doc["_id"] for doc in stale]
+        if ids:
+            self.collection.delete_many({"_id": {"$in": ids}})
+            logger.debug(f"{len(ids)} sumário(s) removido(s) do cache")
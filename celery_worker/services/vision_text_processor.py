@@ -1,38 +1,288 @@
 import os
+import time
+import enum
 import fitz
-import cv2
-import easyocr
+import logging
 import numpy as np
 
+from typing import Dict, Iterator, List, Optional, Tuple
+from config import settings
+from dataclasses import dataclass, field
+from services.ocr_reader_pool import OCRReaderPool, get_reader_pool
+from services.parallel_page_ocr import ParallelPageOCR, SharedPage
+
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+
+class ExtractionMode(enum.Enum):
+    TEXT_ONLY = "text-only"
+    AUTO = "auto"
+    OCR_ONLY = "ocr-only"
+
+
+class PageExtractionMethod(enum.Enum):
+    TEXT_LAYER = "text-layer"
+    OCR = "ocr"
+
+
+@dataclass
+class TextLayerCoverage:
+    chars_density: float
+    clean_ratio: float
+    image_ratio: float
+
+
+@dataclass
+class PageExtraction:
+    page_number: int
+    method: PageExtractionMethod
+    text: str
+    elapsed: float
+    coverage: Optional[TextLayerCoverage] = None
+
+
+@dataclass
+class ExtractionResult:
+    pages: List[PageExtraction] = field(default_factory=list)
+
+    @property
+    def text(self) -> str:
+        return "\n".join(page.text for page in self.pages if page.text).strip()
+
+    def count(self, method: PageExtractionMethod) -> int:
+        return sum(1 for page in self.pages if page.method == method)
+
 
 class VisionTextProcessor:
-    def __init__(self):
-        self.reader = easyocr.Reader(['pt'])
+    def __init__(
+        self,
+        mode: Optional[str] = None,
+        reader_pool: Optional[OCRReaderPool] = None,
+        page_parallelism: Optional[int] = None,
+    ):
+        self.mode = ExtractionMode((mode or settings.OCR_EXTRACTION_MODE).lower())
+        self._reader_pool = reader_pool
+        self.page_parallelism = page_parallelism or settings.OCR_PAGE_PARALLELISM
+        self._parallel_ocr: Optional[ParallelPageOCR] = None
 
-    def extract_content(self, filepath: str) -> str:
+    @property
+    def reader_pool(self) -> OCRReaderPool:
+        # O pool só é carregado quando alguma página realmente precisa de OCR.
+        if self._reader_pool is None:
+            self._reader_pool = get_reader_pool()
+        return self._reader_pool
+
+    @property
+    def parallel_ocr(self) -> ParallelPageOCR:
+        if self._parallel_ocr is None:
+            self._parallel_ocr = ParallelPageOCR(
+                processes=self.page_parallelism,
+                max_inflight=settings.OCR_MAX_INFLIGHT_PAGES,
+                threads_per_process=settings.OCR_THREADS_PER_PROCESS,
+                start_method=settings.OCR_PARALLEL_START_METHOD,
+            )
+        return self._parallel_ocr
+
+    @property
+    def config_signature(self) -> str:
+        """Identifica as opções que alteram o texto extraído, para uso em chaves de cache."""
+        return (
+            f"{self.mode.value}|{settings.TEXT_LAYER_MIN_CHARS_DENSITY}|"
+            f"{settings.TEXT_LAYER_MIN_CLEAN_RATIO}|{settings.TEXT_LAYER_MAX_IMAGE_RATIO}|"
+            f"{settings.OCR_MIN_DPI}|{settings.OCR_BASE_DPI}|{settings.OCR_MAX_DPI}|"
+            f"{settings.OCR_MAX_PAGE_PIXELS}|{settings.OCR_DENSE_TEXT_CHARS_DENSITY}"
+        )
+
+    def close(self) -> None:
+        if self._parallel_ocr is not None:
+            self._parallel_ocr.close()
+            self._parallel_ocr = None
+
+    def _measure_text_layer(self, page: fitz.Page, text: str) -> TextLayerCoverage:
+        page_area = max(page.rect.width * page.rect.height, 1.0)
+
+        glyphs = [char for char in text if not char.isspace()]
+        clean_glyphs = [
+            char for char in glyphs if char != "\ufffd" and char.isprintable()]
+
+        image_area = 0.0
+        for info in page.get_image_info():
+            bbox = fitz.Rect(info["bbox"]) & page.rect
+            if not bbox.is_empty:
+                image_area += bbox.width * bbox.height
+
+        return TextLayerCoverage(
+            chars_density=len(glyphs) / page_area * 10_000,
+            clean_ratio=len(clean_glyphs) / len(glyphs) if glyphs else 0.0,
+            image_ratio=min(image_area / page_area, 1.0),
+        )
+
+    def _has_usable_text_layer(self, coverage: TextLayerCoverage) -> bool:
+        if coverage.chars_density < settings.TEXT_LAYER_MIN_CHARS_DENSITY:
+            return False
+        if coverage.clean_ratio < settings.TEXT_LAYER_MIN_CLEAN_RATIO:
+            return False
+        # Páginas dominadas por imagens costumam ser digitalizações com uma camada
+        # de texto parcial; só confiamos nelas quando o texto é realmente denso.
+        if coverage.image_ratio > settings.TEXT_LAYER_MAX_IMAGE_RATIO:
+            return coverage.chars_density >= settings.TEXT_LAYER_MIN_CHARS_DENSITY * 5
+        return True
+
+    def _native_image_dpi(self, page: fitz.Page) -> Optional[float]:
+        dpis = []
+        for info in page.get_image_info():
+            bbox = fitz.Rect(info["bbox"])
+            if bbox.is_empty or info.get("width", 0) <= 0:
+                continue
+            dpis.append(info["width"] / (bbox.width / 72))
+        return max(dpis) if dpis else None
+
+    def _choose_dpi(self, page: fitz.Page, coverage: Optional[TextLayerCoverage]) -> int:
+        """Escolhe o DPI da página a partir do seu tamanho e da densidade de texto."""
+        dpi = float(settings.OCR_BASE_DPI)
+
+        if coverage and coverage.chars_density >= settings.OCR_DENSE_TEXT_CHARS_DENSITY:
+            dpi = float(settings.OCR_MAX_DPI)
+
+        # Renderizar acima da resolução da digitalização não acrescenta detalhe.
+        native_dpi = self._native_image_dpi(page)
+        if native_dpi:
+            dpi = min(dpi, native_dpi)
+
+        long_side_inches = max(page.rect.width, page.rect.height) / 72
+        if long_side_inches > 0:
+            dpi = min(dpi, settings.OCR_MAX_PAGE_PIXELS / long_side_inches)
+
+        return int(min(max(dpi, settings.OCR_MIN_DPI), settings.OCR_MAX_DPI))
+
+    def _render_page(self, page: fitz.Page, dpi: int) -> Tuple[fitz.Pixmap, np.ndarray]:
+        # Tons de cinza usam um terço da memória do RGB e o EasyOCR já converte
+        # a imagem para cinza na detecção.
+        pix = page.get_pixmap(dpi=dpi, colorspace=fitz.csGRAY, alpha=False)
+        image = np.frombuffer(pix.samples_mv, dtype=np.uint8).reshape(
+            pix.height, pix.width
+        )
+        return pix, image
+
+    def _classify_page(self, page: fitz.Page) -> PageExtraction:
+        start = time.perf_counter()
+        coverage = None
+
+        if self.mode != ExtractionMode.OCR_ONLY:
+            text = page.get_text("text")
+            coverage = self._measure_text_layer(page, text)
+
+            if self.mode == ExtractionMode.TEXT_ONLY or self._has_usable_text_layer(coverage):
+                return PageExtraction(
+                    page_number=page.number + 1,
+                    method=PageExtractionMethod.TEXT_LAYER,
+                    text=text.strip(),
+                    elapsed=time.perf_counter() - start,
+                    coverage=coverage,
+                )
+
+        return PageExtraction(
+            page_number=page.number + 1,
+            method=PageExtractionMethod.OCR,
+            text="",
+            elapsed=time.perf_counter() - start,
+            coverage=coverage,
+        )
+
+    def _ocr_pages(self, doc: fitz.Document, pending: List[PageExtraction]) -> None:
+        batch_size = max(settings.OCR_BATCH_SIZE, 1)
+
+        for batch_start in range(0, len(pending), batch_size):
+            batch = pending[batch_start:batch_start + batch_size]
+            start = time.perf_counter()
+
+            # O detector do EasyOCR empilha as imagens do lote, então só páginas
+            # com as mesmas dimensões podem ser enviadas juntas.
+            pixmaps: List[fitz.Pixmap] = []
+            groups: Dict[Tuple[int, ...], List[Tuple[PageExtraction, np.ndarray]]] = {}
+            for extraction in batch:
+                page = doc[extraction.page_number - 1]
+                pix, image = self._render_page(
+                    page, self._choose_dpi(page, extraction.coverage))
+                pixmaps.append(pix)
+                groups.setdefault(image.shape, []).append((extraction, image))
+
+            with self.reader_pool.acquire() as reader:
+                for items in groups.values():
+                    results = reader.readtext_batched(
+                        [image for _, image in items],
+                        batch_size=settings.OCR_RECOGNITION_BATCH_SIZE,
+                    )
+                    for (extraction, _), page_results in zip(items, results):
+                        extraction.text = "\n".join(
+                            text for _, text, _ in page_results).strip()
+
+            elapsed = (time.perf_counter() - start) / len(batch)
+            for extraction in batch:
+                extraction.elapsed += elapsed
+
+            del groups, pixmaps
+
+    def _shared_pages(self, doc: fitz.Document, pending: List[PageExtraction]) -> Iterator[SharedPage]:
+        for extraction in pending:
+            page = doc[extraction.page_number - 1]
+            pix, image = self._render_page(
+                page, self._choose_dpi(page, extraction.coverage))
+            yield SharedPage.from_buffer(extraction, pix.samples_mv, image.shape)
+            del pix, image
+
+    def _ocr_pages_parallel(self, doc: fitz.Document, pending: List[PageExtraction]) -> None:
+        start = time.perf_counter()
+
+        for extraction, lines in self.parallel_ocr.ocr(self._shared_pages(doc, pending)):
+            extraction.text = "\n".join(lines).strip()
+
+        elapsed = (time.perf_counter() - start) / len(pending)
+        for extraction in pending:
+            extraction.elapsed += elapsed
+
+    def _extract_document(self, doc: fitz.Document, name: str) -> ExtractionResult:
+        result = ExtractionResult()
+        result.pages = [self._classify_page(page) for page in doc]
+
+        pending = [
+            page for page in result.pages if page.method == PageExtractionMethod.OCR]
+        if len(pending) > 1 and self.page_parallelism > 1:
+            self._ocr_pages_parallel(doc, pending)
+        elif pending:
+            self._ocr_pages(doc, pending)
+
+        for extraction in result.pages:
+            logger.debug(
+                f"{name} página {extraction.page_number}: "
+                f"{extraction.method.value} ({extraction.elapsed:.2f}s)"
+            )
+
+        return result
+
+    def extract(self, filepath: str) -> ExtractionResult:
         doc = None
-        fulltext = ''
 
         try:
             doc = fitz.open(filepath)
-            for page in doc:
-                pix = page.get_pixmap(dpi=300)
-                img_array = np.frombuffer(pix.samples, dtype=np.uint8).reshape(
-                    pix.height, pix.width, pix.n
-                )
-
-                if pix.n == 4:
-                    img_array = cv2.cvtColor(img_array, cv2.COLOR_RGBA2RGB)
+            return self._extract_document(doc, os.path.basename(filepath))
 
-                results = self.reader.readtext(img_array)
+        finally:
+            if doc:
+                doc.close()
 
-                for _, text, _ in results:
-                    fulltext += text + "\n"
+    def extract_buffer(self, buffer: memoryview, name: str, filetype: Optional[str] = None) -> ExtractionResult:
+        """Extrai o texto de um documento em memória (ex.: blob mapeado via mmap), sem cópia."""
+        doc = None
 
-            return fulltext.strip()
+        try:
+            doc = fitz.open(stream=buffer, filetype=filetype)
+            return self._extract_document(doc, name)
 
         finally:
             if doc:
                 doc.close()
-            if os.path.exists(filepath):
-                os.remove(filepath)
+
+    def extract_content(self, filepath: str) -> str:
+        return self.extract(filepath).text
@@ -1,4 +1,7 @@
+import os
+
 from pathlib import Path
+from typing import Optional
 from pydantic_settings import BaseSettings
 
 BASE_DIR = Path(__file__).parent.parent.resolve()
@@ -16,6 +19,85 @@ class Settings(BaseSettings):
     MONGO_INITDB_ROOT_DBNAME: str
     MONGO_INITDB_ROOT_USERNAME: str
     MONGO_INITDB_ROOT_PASSWORD: str
+    MONGO_MAX_POOL_SIZE: int = 16
+    MONGO_MIN_POOL_SIZE: int = 0
+    MONGO_MAX_IDLE_TIME_MS: int = 60_000
+    MONGO_WAIT_QUEUE_TIMEOUT_MS: int = 10_000
+    MONGO_CONNECT_TIMEOUT_MS: int = 5_000
+    MONGO_SOCKET_TIMEOUT_MS: int = 60_000
+    MONGO_SERVER_SELECTION_TIMEOUT_MS: int = 10_000
+    CELERY_OCR_QUEUE: str = "ocr"
+    CELERY_LLM_QUEUE: str = "llm"
+    CELERY_OCR_TIME_LIMIT: int = 900
+    CELERY_OCR_SOFT_TIME_LIMIT: int = 840
+    CELERY_LLM_TIME_LIMIT: int = 600
+    CELERY_LLM_SOFT_TIME_LIMIT: int = 540
+    LLM_REQUEST_TIMEOUT: float = 300.0
+    LLM_MAX_CONCURRENCY: int = 8
+    LLM_BATCH_SUMMARIES: bool = False
+    SUMMARY_PROMPT_TOKEN_BUDGET: int = 2500
+    SUMMARY_CHUNK_TOKENS: int = 1500
+    GEMINI_BASE_URL: Optional[str] = None
+    GEMINI_RPM: int = 1000
+    GEMINI_TPM: int = 1_000_000
+    GEMINI_EMBEDDING_RPM: int = 3000
+    GEMINI_EMBEDDING_TPM: int = 1_000_000
+    GEMINI_EXPECTED_OUTPUT_TOKENS: int = 1024
+    GEMINI_MAX_RETRIES: int = 5
+    GEMINI_RETRY_BACKOFF: float = 1.0
+    GEMINI_INITIAL_CONCURRENCY: int = 4
+    GEMINI_MIN_CONCURRENCY: int = 1
+    GEMINI_MAX_CONCURRENCY: int = 32
+    RESUME_TASK_MAX_RETRIES: int = 3
+    RESUME_TASK_RETRY_BACKOFF: int = 10
+    OCR_EXTRACTION_MODE: str = "auto"
+    OCR_READERS_PER_PROCESS: int = 1
+    OCR_PRELOAD_READERS: bool = True
+    OCR_BATCH_SIZE: int = 4
+    OCR_RECOGNITION_BATCH_SIZE: int = 16
+    OCR_MIN_DPI: int = 150
+    OCR_BASE_DPI: int = 200
+    OCR_MAX_DPI: int = 300
+    OCR_MAX_PAGE_PIXELS: int = 3500
+    OCR_DENSE_TEXT_CHARS_DENSITY: float = 40.0
+    OCR_PAGE_PARALLELISM: int = 1
+    OCR_MAX_INFLIGHT_PAGES: int = 0
+    OCR_THREADS_PER_PROCESS: int = 1
+    OCR_PARALLEL_START_METHOD: str = "spawn"
+    SUMMARY_CACHE_ENABLED: bool = True
+    SUMMARY_CACHE_TTL_SECONDS: int = 30 * 24 * 3600
+    SUMMARY_CACHE_MAX_ENTRIES: int = 50_000
+    EMBEDDING_BATCH_SIZE: int = 64
+    EMBEDDING_CACHE_ENABLED: bool = True
+    EMBEDDING_CACHE_VERSION: int = 1
+    EMBEDDING_CACHE_POLICY: str = "lru"
+    EMBEDDING_CACHE_LOCAL_SIZE: int = 4096
+    EMBEDDING_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+    VECTOR_INDEX_ENABLED: bool = True
+    PROGRESS_TTL_SECONDS: int = 24 * 3600
+    JUSTIFICATION_STREAM_TTL_SECONDS: int = 3600
+    JUSTIFICATION_STREAM_FLUSH_INTERVAL: float = 0.05
+    BLOB_STORE_DIR: Optional[str] = None
+    BLOB_RETENTION_SECONDS: int = 3600
+    BLOB_GC_INTERVAL_SECONDS: int = 900
+    BLOB_DELETE_TIMEOUT_SECONDS: int = 60
+    VECTOR_INDEX_DIR: Optional[str] = None
+    IVF_NLIST: int = 0
+    IVF_MIN_VECTORS: int = 10_000
+    IVF_KMEANS_ITERATIONS: int = 20
+    IVF_REBUILD_TAIL_RATIO: float = 0.2
+    IVF_REBUILD_INTERVAL_SECONDS: int = 3600
+    TEXT_LAYER_MIN_CHARS_DENSITY: float = 1.0
+    TEXT_LAYER_MIN_CLEAN_RATIO: float = 0.9
+    TEXT_LAYER_MAX_IMAGE_RATIO: float = 0.5
+
+    @property
+    def blob_store_dir(self) -> str:
+        return self.BLOB_STORE_DIR or os.path.join(self.STORAGE, "blobs")
+
+    @property
+    def vector_index_dir(self) -> str:
+        return self.VECTOR_INDEX_DIR or os.path.join(self.STORAGE, "vector_index")
 
     @property
     def database_url(self) -> str:
@@ -0,0 +1,32 @@
+#!/bin/bash
+
+# WORKER_TYPE=ocr  -> fila de OCR/extração, pool prefork com um processo por núcleo
+# WORKER_TYPE=llm  -> fila de sumarização/embeddings/justificativa, pool de threads
+# WORKER_TYPE=all  -> todas as filas em um único worker prefork (padrão)
+
+OCR_QUEUE="${CELERY_OCR_QUEUE:-ocr}"
+LLM_QUEUE="${CELERY_LLM_QUEUE:-llm}"
+
+case "${WORKER_TYPE:-all}" in
+  ocr)
+    exec celery --app config.celery_worker worker --loglevel=info \
+      --queues="${OCR_QUEUE}" \
+      --pool=prefork \
+      --concurrency="${CELERY_OCR_CONCURRENCY:-$(nproc)}" \
+      --prefetch-multiplier="${CELERY_OCR_PREFETCH_MULTIPLIER:-1}" \
+      --hostname="ocr@%h"
+    ;;
+  llm)
+    exec celery --app config.celery_worker worker --loglevel=info \
+      --queues="${LLM_QUEUE},celery" \
+      --pool=threads \
+      --concurrency="${CELERY_LLM_CONCURRENCY:-32}" \
+      --prefetch-multiplier="${CELERY_LLM_PREFETCH_MULTIPLIER:-4}" \
+      --hostname="llm@%h"
+    ;;
+  *)
+    exec celery --app config.celery_worker worker --loglevel=info \
+      --queues="${OCR_QUEUE},${LLM_QUEUE},celery" \
+      --pool=prefork
+    ;;
+esac
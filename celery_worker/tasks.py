@@ -1,71 +1,410 @@
 import os
+import math
 import logging
 
 from bson import ObjectId
+from datetime import datetime, timezone
 from settings import settings
-from pymongo import MongoClient
+from celery import chord
 from config import celery_worker
-from typing import List, Optional
+from typing import List, Optional, Union
+from schemas import SummaryResume
 from services.factory import get_matcher
-from services.vision_text_processor import VisionTextProcessor
+from services.base_resume_matcher import BaseResumeMatcher
+from services.candidate_vector_store import get_candidate_vector_store, list_candidate_vector_stores
+from celery.signals import worker_process_init, worker_process_shutdown, worker_shutdown
+from database import get_mongo_collection, reset_mongo_client, close_mongo_client, get_pool_stats
+from services.ocr_reader_pool import get_reader_pool
+from services.vision_text_processor import VisionTextProcessor, PageExtractionMethod
+from services.summary_cache import SummaryCache, hash_file
+from services.blob_store import BlobReferences, get_blob_store
+from services.progress_publisher import ProgressPublisher, ProgressStage
+from services.justification_stream import JustificationStream
+from services.resume_text import estimate_tokens, normalize_pages, summary_config_signature
 from services.resume_analyzer_service import ResumeAnalyzerService
 
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
 
-def get_mongo_collection(collection_name: str):
-    client = MongoClient(settings.database_url)
-    db = client[settings.MONGO_INITDB_ROOT_DBNAME]
-    return db.get_collection(collection_name)
+vision_text_processor = VisionTextProcessor()
+
+
+@worker_process_init.connect
+def init_worker_process(**kwargs) -> None:
+    reset_mongo_client()
+    if settings.OCR_PRELOAD_READERS:
+        get_reader_pool()
+
+
+@worker_process_shutdown.connect
+def shutdown_worker_process(**kwargs) -> None:
+    vision_text_processor.close()
+    logger.info(f"Pool do MongoDB no encerramento: {get_pool_stats()}")
+    close_mongo_client()
+
+
+@worker_shutdown.connect
+def shutdown_worker(**kwargs) -> None:
+    close_mongo_client()
 
 
 @celery_worker.task
-def analyze_resume(log_id: str, filenames: List[str], query: Optional[str] = None) -> None:
-    database = get_mongo_collection('logs')
+def ocr_health_check() -> dict:
+    return get_reader_pool().health_check()
 
-    log = database.find_one({"_id": ObjectId(log_id)})
-    if not log:
-        logger.error(f"Log com ID {log_id} não encontrado.")
-        return
 
+@celery_worker.task
+def mongo_pool_stats() -> dict:
+    return {"pid": os.getpid(), **get_pool_stats()}
+
+
+def index_resumes(
+    log_id: str,
+    resumes: List[SummaryResume],
+    file_hashes: List[str],
+    resume_analyzer: ResumeAnalyzerService,
+    matcher: BaseResumeMatcher,
+) -> None:
     try:
+        store = get_candidate_vector_store(matcher.name, matcher.embedding_model)
+        added = store.append(
+            resume_analyzer.embed_resumes(resumes),
+            [
+                {
+                    "candidate_name": resume.candidate_name,
+                    "summary": resume.summary,
+                    "log_id": log_id,
+                    "file_hash": file_hash,
+                }
+                for resume, file_hash in zip(resumes, file_hashes)
+            ],
+        )
+        logger.info(f"[log_id={log_id}] {added} currículo(s) adicionado(s) ao índice vetorial")
+    except Exception as e:
+        logger.exception(f"[log_id={log_id}] Falha ao indexar os currículos: {e}")
+
+
+@celery_worker.task
+def embed_query(query: str) -> dict:
+    matcher = get_matcher(settings.AI_SERVICE_NAME)
+    return {
+        "backend": matcher.name,
+        "model": matcher.embedding_model,
+        "embedding": matcher.embed_texts([query])[0].tolist(),
+    }
+
+
+@celery_worker.task
+def rebuild_vector_indexes() -> dict:
+    rebuilt = {}
+    for store in list_candidate_vector_stores():
+        if not store.needs_ivf_rebuild(settings.IVF_MIN_VECTORS, settings.IVF_REBUILD_TAIL_RATIO):
+            continue
+        count = store.read_header()["count"]
+        nlist = settings.IVF_NLIST or max(int(4 * math.sqrt(count)), 1)
+        rebuilt[store.path] = store.rebuild_ivf(
+            nlist, iterations=settings.IVF_KMEANS_ITERATIONS)
+    return rebuilt
+
+
+def remove_file(filename: str) -> None:
+    filepath = os.path.join(settings.STORAGE, filename)
+    if os.path.exists(filepath):
+        os.remove(filepath)
+
+
+def record_file_result(log_id: str, result: dict, cached: bool = False) -> None:
+    """
+    Acrescenta o resultado do arquivo em `partial_results` do log assim que ele termina. O filtro
+    impede entradas duplicadas quando a mesma etapa é reexecutada (retry ou reenvio da análise).
+    """
+    entry = {
+        "filename": result["filename"],
+        "file_hash": result.get("file_hash"),
+        "status": "FAILED" if "error" in result else "SUMMARIZED",
+        "cached": cached,
+        "finished_at": datetime.now(timezone.utc),
+    }
+    if "error" in result:
+        entry["error"] = result["error"]
+    else:
+        entry["summary"] = result["summary"]
+
+    try:
+        get_mongo_collection('logs').update_one(
+            {
+                "_id": ObjectId(log_id),
+                "partial_results": {"$not": {"$elemMatch": {
+                    "filename": entry["filename"], "file_hash": entry["file_hash"]}}},
+            },
+            {"$push": {"partial_results": entry}},
+        )
+    except Exception as e:
+        logger.warning(f"[log_id={log_id}] Falha ao gravar o resultado parcial de {entry['filename']}: {e}")
+
+
+def find_file_result(log_id: str, filename: str, file_hash: Optional[str]) -> Optional[dict]:
+    """Sumário já gravado para o arquivo neste log, reaproveitado em retries e reenvios."""
+    doc = get_mongo_collection('logs').find_one(
+        {"_id": ObjectId(log_id)},
+        {"partial_results": {"$elemMatch": {
+            "filename": filename, "file_hash": file_hash, "status": "SUMMARIZED"}}},
+    )
+    entries = doc.get("partial_results") if doc else None
+    if not entries:
+        return None
+    return {"filename": filename, "file_hash": file_hash, "summary": entries[0]["summary"]}
+
+
+def retry_or_fail(task, log_id: str, filename: str, e: Exception) -> dict:
+    """
+    Reagenda a tarefa com backoff exponencial ou, esgotadas as tentativas, devolve um
+    resultado de erro para que o chord ranqueie os demais arquivos.
+    """
+    if task.request.retries < task.max_retries:
+        countdown = settings.RESUME_TASK_RETRY_BACKOFF * 2 ** task.request.retries
+        logger.warning(
+            f"[log_id={log_id}] Falha ao processar {filename}, nova tentativa em {countdown}s: {e}")
+        raise task.retry(exc=e, countdown=countdown)
+
+    logger.exception(f"[log_id={log_id}] Falha definitiva ao processar {filename}: {e}")
+    return {"filename": filename, "error": str(e)}
+
+
+@celery_worker.task(bind=True, max_retries=settings.RESUME_TASK_MAX_RETRIES)
+def extract_resume_text(
+    self,
+    log_id: str,
+    filename: str,
+    file_hash: Optional[str] = None,
+    content_type: Optional[str] = None,
+) -> dict:
+    """Etapa de CPU: consulta o cache de sumários e, se necessário, extrai o texto do arquivo."""
+    blob_store = get_blob_store()
+    # Blobs só saem do storage pelo GC, então novas tentativas sempre encontram o arquivo.
+    # Nomes sem blob vêm da entrega antiga via STORAGE e continuam sendo apagados ao final.
+    legacy = not (file_hash and blob_store.exists(file_hash))
+
+    try:
+        filepath = os.path.join(settings.STORAGE, filename)
+        file_hash = file_hash or hash_file(filepath)
+        payload = {"filename": filename, "file_hash": file_hash}
+
+        previous = find_file_result(log_id, filename, file_hash)
+        if previous:
+            logger.info(f"[log_id={log_id}] {filename}: sumário reaproveitado de uma execução anterior")
+            if legacy:
+                remove_file(filename)
+            ProgressPublisher(log_id).advance(ProgressStage.OCR, filename, cached=True)
+            return previous
+
+        if settings.SUMMARY_CACHE_ENABLED:
+            matcher = get_matcher(settings.AI_SERVICE_NAME)
+            cache_key = SummaryCache.make_key(
+                file_hash,
+                vision_text_processor.config_signature,
+                summary_config_signature(),
+                matcher.name,
+                matcher.summary_model,
+            )
+            summary = SummaryCache(get_mongo_collection('summary_cache')).get(cache_key)
+            if summary:
+                logger.info(
+                    f"[log_id={log_id}] {filename}: sumário obtido do cache")
+                get_mongo_collection('logs').update_one(
+                    {"_id": ObjectId(log_id)}, {"$inc": {"summary_cache.hits": 1}})
+                if legacy:
+                    remove_file(filename)
+                result = {**payload, "summary": summary.model_dump()}
+                record_file_result(log_id, result, cached=True)
+                ProgressPublisher(log_id).advance(ProgressStage.OCR, filename, cached=True)
+                return result
+            payload["cache_key"] = cache_key
+
+        logger.debug(f"Extraindo texto de {filename}")
+        if legacy:
+            extraction = vision_text_processor.extract(filepath)
+        else:
+            filetype = content_type.rsplit("/", 1)[-1] if content_type else None
+            with blob_store.open(file_hash) as buffer:
+                extraction = vision_text_processor.extract_buffer(buffer, filename, filetype)
         logger.info(
-            f"[log_id={log_id}] Iniciando o processamento dos arquivos")
+            f"[log_id={log_id}] {filename}: {len(extraction.pages)} página(s), "
+            f"{extraction.count(PageExtractionMethod.TEXT_LAYER)} via camada de texto, "
+            f"{extraction.count(PageExtractionMethod.OCR)} via OCR, "
+            f"{sum(page.elapsed for page in extraction.pages):.2f}s")
+    except Exception as e:
+        result = retry_or_fail(self, log_id, filename, e)
+        if legacy:
+            remove_file(filename)
+        record_file_result(log_id, result)
+        ProgressPublisher(log_id).advance(ProgressStage.OCR, filename, error=result["error"])
+        return result
+
+    if legacy:
+        remove_file(filename)
+    text = normalize_pages([page.text for page in extraction.pages])
+    logger.info(
+        f"[log_id={log_id}] {filename}: texto normalizado de ~{estimate_tokens(extraction.text)} "
+        f"para ~{estimate_tokens(text)} tokens")
+    ProgressPublisher(log_id).advance(ProgressStage.OCR, filename, pages=len(extraction.pages))
+    return {**payload, "text": text}
+
+
+@celery_worker.task(bind=True, max_retries=settings.RESUME_TASK_MAX_RETRIES)
+def summarize_resume(self, payload: dict, log_id: str) -> dict:
+    """Etapa de I/O: gera o sumário do texto extraído com o serviço de IA."""
+    if "text" not in payload:
+        publish_summary_progress(log_id, payload, cached="summary" in payload)
+        return payload
+
+    previous = find_file_result(log_id, payload["filename"], payload["file_hash"])
+    if previous:
+        publish_summary_progress(log_id, previous, cached=True)
+        return previous
+
+    try:
+        matcher = get_matcher(settings.AI_SERVICE_NAME)
+        summary = ResumeAnalyzerService(matcher).generate_summary(payload["text"])
+        result = store_summary(payload, summary, log_id)
+    except Exception as e:
+        result = retry_or_fail(self, log_id, payload["filename"], e)
+        record_file_result(log_id, result)
+
+    publish_summary_progress(log_id, result)
+    return result
+
+
+@celery_worker.task(bind=True, max_retries=settings.RESUME_TASK_MAX_RETRIES)
+def summarize_resumes_batch(self, payloads: List[dict], log_id: str) -> List[dict]:
+    """Gera de uma vez os sumários de todos os arquivos extraídos, com chamadas concorrentes."""
+    # Em um retry, os sumários já gravados no log não são gerados de novo.
+    payloads = [
+        find_file_result(log_id, payload["filename"], payload["file_hash"]) or payload
+        if "text" in payload else payload
+        for payload in payloads
+    ]
+    pending = [i for i, payload in enumerate(payloads) if "text" in payload]
+    if not pending:
+        for payload in payloads:
+            publish_summary_progress(log_id, payload, cached="summary" in payload)
+        return payloads
 
-        resumes = []
-        vision_text_processor = VisionTextProcessor()
+    try:
+        matcher = get_matcher(settings.AI_SERVICE_NAME)
+        summaries = ResumeAnalyzerService(matcher).generate_summaries(
+            [payloads[i]["text"] for i in pending])
+    except Exception as e:
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=e, countdown=settings.RESUME_TASK_RETRY_BACKOFF * 2 ** self.request.retries)
+        raise
+
+    results = list(payloads)
+    for i, summary in zip(pending, summaries):
+        if isinstance(summary, Exception):
+            logger.error(f"[log_id={log_id}] Falha ao resumir {payloads[i]['filename']}: {summary}")
+            results[i] = {"filename": payloads[i]["filename"], "error": str(summary)}
+            record_file_result(log_id, results[i])
+        else:
+            results[i] = store_summary(payloads[i], summary, log_id)
+
+    for i, result in enumerate(results):
+        publish_summary_progress(log_id, result, cached=i not in pending and "summary" in result)
+    return results
+
+
+def publish_summary_progress(log_id: str, result: dict, cached: bool = False) -> None:
+    ProgressPublisher(log_id).advance(
+        ProgressStage.SUMMARY, result["filename"], error=result.get("error"), cached=cached or None)
+
+
+def store_summary(payload: dict, summary: SummaryResume, log_id: str) -> dict:
+    if payload.get("cache_key"):
+        SummaryCache(get_mongo_collection('summary_cache')).set(payload["cache_key"], summary)
+        get_mongo_collection('logs').update_one(
+            {"_id": ObjectId(log_id)}, {"$inc": {"summary_cache.misses": 1}})
+
+    result = {"filename": payload["filename"], "file_hash": payload["file_hash"], "summary": summary.model_dump()}
+    record_file_result(log_id, result)
+    return result
+
+
+def release_blobs(log_id: str) -> None:
+    try:
+        BlobReferences(get_mongo_collection('blobs')).release(log_id)
+    except Exception as e:
+        logger.warning(f"[log_id={log_id}] Falha ao liberar as referências dos arquivos: {e}")
+
+
+@celery_worker.task
+def collect_blobs() -> dict:
+    """Remove do storage os blobs sem referências ou com referências expiradas."""
+    collected = BlobReferences(get_mongo_collection('blobs')).collect(get_blob_store())
+    logger.info(f"GC de blobs: {collected}")
+    return collected
+
+
+@celery_worker.task
+def finalize_analysis(results: List[dict], log_id: str, query: Optional[str] = None) -> None:
+    database = get_mongo_collection('logs')
+    progress = ProgressPublisher(log_id)
+    release_blobs(log_id)
+
+    succeeded = [result for result in results if "summary" in result]
+    failed_files = [
+        {"filename": result["filename"], "error": result["error"]}
+        for result in results if "error" in result
+    ]
+
+    if not succeeded:
+        logger.error(f"[log_id={log_id}] Nenhum currículo pôde ser processado.")
+        database.update_one(
+            {"_id": ObjectId(log_id)},
+            {"$set": {
+                "status": "PROCESSING_FAILED",
+                "result": {"resumes": [], "justification": None, "failed_files": failed_files}
+            }}
+        )
+        progress.advance(ProgressStage.FAILED, failed=len(failed_files))
+        return
+
+    try:
         matcher = get_matcher(settings.AI_SERVICE_NAME)
         resume_analyzer = ResumeAnalyzerService(matcher)
+        resumes = [SummaryResume(**result["summary"]) for result in succeeded]
 
-        for filename in filenames:
-            logger.debug(f"Extraindo texto de {filename}")
-            filepath = os.path.join(settings.STORAGE, filename)
-            content = vision_text_processor.extract_content(filepath)
-            summary = resume_analyzer.generate_summary(content)
-            resumes.append(summary)
+        if settings.VECTOR_INDEX_ENABLED:
+            index_resumes(log_id, resumes, [result["file_hash"] for result in succeeded],
+                          resume_analyzer, matcher)
 
         final_resumes = resumes
         justification = None
 
         if query:
             logger.debug(f"Analisando com query: {query}")
+            progress.notify(ProgressStage.RANKING)
             final_resumes = resume_analyzer.rank_resumes(query, resumes)
-            justification = resume_analyzer.generate_justification(
-                query, final_resumes)
+            # Os trechos vão para o stream Redis conforme chegam; o texto completo é salvo abaixo.
+            justification = JustificationStream(log_id).write(
+                resume_analyzer.stream_justification(query, final_resumes))
 
-        logger.info(f"Processamento dos currículos finalizado com sucesso.")
+        logger.info(
+            f"[log_id={log_id}] Processamento finalizado: {len(succeeded)} currículo(s) processado(s), "
+            f"{len(failed_files)} com falha.")
 
         database.update_one(
             {"_id": ObjectId(log_id)},
             {"$set": {
                 "status": "PROCESSED",
                 "result": {
-                    "resumes": [r.model_dump() if hasattr(r, 'dict') else r for r in final_resumes],
-                    "justification": justification
+                    "resumes": [r.model_dump() for r in final_resumes],
+                    "justification": justification,
+                    "failed_files": failed_files
                 }
             }}
         )
+        progress.advance(ProgressStage.COMPLETED, resumes=len(succeeded), failed=len(failed_files))
 
     except Exception as e:
         logger.exception(f"Erro ao processar os currículos {e}")
@@ -73,3 +412,51 @@ def analyze_resume(log_id: str, filenames: List[str], query: Optional[str] = Non
             {"_id": ObjectId(log_id)},
             {"$set": {"status": "PROCESSING_FAILED"}}
         )
+        progress.advance(ProgressStage.FAILED, error=str(e))
+
+
+@celery_worker.task
+def mark_analysis_failed(request, exc, traceback, log_id: str) -> None:
+    logger.error(f"[log_id={log_id}] Falha no pipeline de análise: {exc}")
+    release_blobs(log_id)
+    get_mongo_collection('logs').update_one(
+        {"_id": ObjectId(log_id)},
+        {"$set": {"status": "PROCESSING_FAILED"}}
+    )
+    ProgressPublisher(log_id).notify(ProgressStage.FAILED, error=str(exc))
+
+
+@celery_worker.task
+def analyze_resume(log_id: str, files: List[Union[str, dict]], query: Optional[str] = None) -> None:
+    database = get_mongo_collection('logs')
+    # Aceita {"filename", "file_hash", "content_type"} enviados pela API e nomes simples de versões anteriores.
+    files = [file if isinstance(file, dict) else {"filename": file} for file in files]
+
+    log = database.find_one({"_id": ObjectId(log_id)})
+    if not log:
+        logger.error(f"Log com ID {log_id} não encontrado.")
+        return
+
+    logger.info(
+        f"[log_id={log_id}] Iniciando o processamento de {len(files)} arquivo(s)")
+    ProgressPublisher(log_id).start(len(files))
+
+    if settings.LLM_BATCH_SUMMARIES:
+        # O OCR continua distribuído por arquivo; os sumários são gerados em uma única
+        # tarefa que mantém várias chamadas ao serviço de IA em andamento ao mesmo tempo.
+        header = [
+            extract_resume_text.s(
+                log_id, file["filename"], file.get("file_hash"), file.get("content_type"))
+            for file in files
+        ]
+        callback = summarize_resumes_batch.s(log_id) | finalize_analysis.s(log_id, query)
+    else:
+        header = [
+            extract_resume_text.s(
+                log_id, file["filename"], file.get("file_hash"), file.get("content_type"))
+            | summarize_resume.s(log_id)
+            for file in files
+        ]
+        callback = finalize_analysis.s(log_id, query)
+
+    chord(header)(callback.on_error(mark_analysis_failed.s(log_id)))
@@ -0,0 +1,17 @@
+import os
+
+# As settings são lidas na importação dos módulos do worker; os testes não dependem de um .env.
+for name, value in {
+    "STORAGE": "/tmp/resume-ranker-tests",
+    "REDIS_DB": "0",
+    "REDIS_HOST": "localhost",
+    "REDIS_PORT": "6379",
+    "AI_SERVICE_KEY": "test",
+    "AI_SERVICE_NAME": "ollama",
+    "MONGO_INITDB_ROOT_PORT": "27017",
+    "MONGO_INITDB_ROOT_HOST": "localhost",
+    "MONGO_INITDB_ROOT_DBNAME": "test",
+    "MONGO_INITDB_ROOT_USERNAME": "test",
+    "MONGO_INITDB_ROOT_PASSWORD": "test",
+}.items():
+    os.environ.setdefault(name, value)
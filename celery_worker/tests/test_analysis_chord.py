@@ -0,0 +1,124 @@
+import os
+import config
+import fakeredis
+import mongomock
+import pytest
+import tasks
+
+from bson import ObjectId
+from schemas import SummaryResume
+from services.blob_store import LocalBlobStore
+from services.vision_text_processor import ExtractionResult, PageExtraction, PageExtractionMethod
+
+
+class FakeMatcher:
+    name = "fake"
+    summary_model = "fake-model"
+
+    def summarize_resume(self, content: str) -> SummaryResume:
+        if "timeout" in content:
+            raise TimeoutError("serviço de IA indisponível")
+        return SummaryResume(candidate_name=content.split()[0], summary=content)
+
+    def summarize_many(self, contents):
+        results = []
+        for content in contents:
+            try:
+                results.append(self.summarize_resume(content))
+            except Exception as e:
+                results.append(e)
+        return results
+
+    def rank_resumes_by_similarity(self, query, resumes, k, threshold):
+        return resumes
+
+    def stream_candidate_justification(self, query, resumes):
+        yield "Candidato mais adequado: "
+        yield resumes[0].candidate_name
+
+
+class FakeTextProcessor:
+    config_signature = "fake"
+
+    def extract_buffer(self, buffer, filename, filetype):
+        content = bytes(buffer).decode()
+        if content == "corrompido":
+            raise ValueError("PDF inválido")
+        return ExtractionResult(pages=[PageExtraction(1, PageExtractionMethod.TEXT_LAYER, content, 0.0)])
+
+
+@pytest.fixture
+def db(monkeypatch, tmp_path):
+    database = mongomock.MongoClient()["test"]
+    store = LocalBlobStore(str(tmp_path))
+    monkeypatch.setattr(tasks, "get_mongo_collection", lambda name: database[name])
+    monkeypatch.setattr(tasks, "get_blob_store", lambda: store)
+    monkeypatch.setattr(tasks, "get_matcher", lambda name: FakeMatcher())
+    monkeypatch.setattr(tasks, "vision_text_processor", FakeTextProcessor())
+    monkeypatch.setattr(config, "_redis_client", fakeredis.FakeRedis(decode_responses=True))
+    monkeypatch.setattr(tasks.settings, "SUMMARY_CACHE_ENABLED", False)
+    monkeypatch.setattr(tasks.settings, "VECTOR_INDEX_ENABLED", False)
+    # Sem novas tentativas: a falha definitiva de um arquivo é o que está em teste.
+    for task in (tasks.extract_resume_text, tasks.summarize_resume):
+        monkeypatch.setattr(task, "max_retries", 0)
+    monkeypatch.setattr(config.celery_worker.conf, "task_always_eager", True)
+    database.store = store
+    return database
+
+
+def start_analysis(db, contents: dict, query="python") -> str:
+    log_id = db["logs"].insert_one({"status": "PROCESSING", "partial_results": []}).inserted_id
+    files = []
+    for i, (filename, content) in enumerate(contents.items()):
+        file_hash = f"{i:02d}" + "a" * 62
+        path = db.store.path(file_hash)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(content)
+        db["blobs"].insert_one({"_id": file_hash, "refs": [str(log_id)]})
+        files.append({"filename": filename, "file_hash": file_hash, "content_type": "application/pdf"})
+    tasks.analyze_resume(str(log_id), files, query)
+    return str(log_id)
+
+
+@pytest.mark.parametrize("batch", [False, True])
+def test_partial_failure_ranks_the_files_that_succeeded(db, monkeypatch, batch):
+    monkeypatch.setattr(tasks.settings, "LLM_BATCH_SUMMARIES", batch)
+    log_id = start_analysis(db, {
+        "maria.pdf": "Maria Python",
+        "corrompido.pdf": "corrompido",
+        "joao.pdf": "João timeout",
+    })
+
+    log = db["logs"].find_one({"_id": ObjectId(log_id)})
+    assert log["status"] == "PROCESSED"
+    assert [resume["candidate_name"] for resume in log["result"]["resumes"]] == ["Maria"]
+    assert log["result"]["justification"] == "Candidato mais adequado: Maria"
+    assert {item["filename"]: item["error"] for item in log["result"]["failed_files"]} == {
+        "corrompido.pdf": "PDF inválido", "joao.pdf": "serviço de IA indisponível"}
+    assert {item["filename"]: item["status"] for item in log["partial_results"]} == {
+        "maria.pdf": "SUMMARIZED", "corrompido.pdf": "FAILED", "joao.pdf": "FAILED"}
+    # As referências aos blobs são liberadas ao final, com ou sem falhas.
+    assert db["blobs"].count_documents({"refs": log_id}) == 0
+
+
+def test_all_files_failing_marks_the_analysis_failed(db):
+    log_id = start_analysis(db, {"corrompido.pdf": "corrompido", "joao.pdf": "João timeout"})
+
+    log = db["logs"].find_one({"_id": ObjectId(log_id)})
+    assert log["status"] == "PROCESSING_FAILED"
+    assert log["result"]["resumes"] == []
+    assert len(log["result"]["failed_files"]) == 2
+
+
+def test_rerun_reuses_summaries_already_recorded(db, monkeypatch):
+    log_id = start_analysis(db, {"maria.pdf": "Maria Python"}, query=None)
+    calls = []
+    monkeypatch.setattr(FakeMatcher, "summarize_resume", lambda self, content: calls.append(content))
+
+    files = [{"filename": "maria.pdf", "file_hash": "00" + "a" * 62, "content_type": "application/pdf"}]
+    tasks.analyze_resume(log_id, files, None)
+
+    log = db["logs"].find_one({"_id": ObjectId(log_id)})
+    assert calls == []
+    assert log["status"] == "PROCESSED" and len(log["partial_results"]) == 1
@@ -0,0 +1,111 @@
+import json
+import httpx
+import pytest
+import asyncio
+import threading
+
+from schemas import SummaryResume
+from services.async_ollama_resume_matcher import AsyncOllamaResumeMatcher
+
+NAMES = ["Ana", "Bruno", "Carla", "Davi", "Eva", "Fábio"]
+
+
+def summary_response(name: str) -> httpx.Response:
+    content = json.dumps({"candidate_name": name, "summary": f"Resumo de {name}"})
+    return httpx.Response(200, json={"message": {"content": content}})
+
+
+def resume_name(request: httpx.Request) -> str:
+    # O conteúdo do currículo vai no prompt; nos testes ele é só o nome do candidato.
+    prompt = json.loads(request.content)["messages"][-1]["content"]
+    return next(name for name in NAMES if name in prompt)
+
+
+class MockOllama:
+    """Servidor Ollama falso: conta as chamadas simultâneas e deixa cada teste decidir a resposta."""
+
+    def __init__(self, respond):
+        self.respond = respond
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.clients = 0
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            return await self.respond(resume_name(request))
+        finally:
+            self.in_flight -= 1
+
+    def client(self) -> httpx.AsyncClient:
+        self.clients += 1
+        return httpx.AsyncClient(base_url="http://ollama", transport=httpx.MockTransport(self.handler))
+
+
+def matcher_for(server: MockOllama, max_concurrency: int = 2, timeout: float = 1.0) -> AsyncOllamaResumeMatcher:
+    matcher = AsyncOllamaResumeMatcher(max_concurrency=max_concurrency, timeout=timeout)
+    matcher._client = server.client
+    return matcher
+
+
+def run_in_new_thread(function):
+    """Cada thread tem o próprio loop e client; uma thread nova isola o teste dos demais."""
+    result = {}
+    thread = threading.Thread(target=lambda: result.setdefault("value", function()))
+    thread.start()
+    thread.join()
+    return result["value"]
+
+
+def test_concurrency_is_bounded_by_the_semaphore():
+    async def respond(name):
+        await asyncio.sleep(0.01)
+        return summary_response(name)
+
+    server = MockOllama(respond)
+    summaries = run_in_new_thread(lambda: matcher_for(server, max_concurrency=2).summarize_many(NAMES))
+
+    assert [summary.candidate_name for summary in summaries] == NAMES
+    assert server.max_in_flight == 2
+
+
+def test_slow_call_times_out_in_its_own_position():
+    async def respond(name):
+        if name == "Bruno":
+            await asyncio.sleep(1)
+        return summary_response(name)
+
+    server = MockOllama(respond)
+    summaries = run_in_new_thread(lambda: matcher_for(server, timeout=0.05).summarize_many(["Ana", "Bruno", "Carla"]))
+
+    assert isinstance(summaries[1], asyncio.TimeoutError)
+    assert [summaries[0].candidate_name, summaries[2].candidate_name] == ["Ana", "Carla"]
+
+
+def test_single_failure_does_not_cancel_the_others():
+    async def respond(name):
+        if name == "Carla":
+            return httpx.Response(500, json={"error": "modelo indisponível"})
+        return summary_response(name)
+
+    server = MockOllama(respond)
+    summaries = run_in_new_thread(lambda: matcher_for(server).summarize_many(NAMES))
+
+    assert isinstance(summaries[2], httpx.HTTPStatusError)
+    assert all(isinstance(summary, SummaryResume) for i, summary in enumerate(summaries) if i != 2)
+
+
+def test_batches_in_the_same_thread_reuse_one_client():
+    async def respond(name):
+        return summary_response(name)
+
+    server = MockOllama(respond)
+
+    def two_tasks():
+        # Cada tarefa cria o próprio matcher, como em get_matcher.
+        return [matcher_for(server).summarize_many(NAMES[:2]) for _ in range(2)]
+
+    first, second = run_in_new_thread(two_tasks)
+    assert [summary.candidate_name for summary in first + second] == NAMES[:2] * 2
+    assert server.clients == 1
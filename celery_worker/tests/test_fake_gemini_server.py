@@ -0,0 +1,69 @@
+import time
+import threading
+import pytest
+
+from google import genai
+from google.genai import types, errors
+from http.server import ThreadingHTTPServer
+from benchmarks.fake_gemini_server import JUSTIFICATION, SlidingWindowQuota, make_handler
+
+
+def start_server(quota: SlidingWindowQuota):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(quota, latency=0, dim=8))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = genai.Client(api_key="test", http_options=types.HttpOptions(
+        base_url=f"http://127.0.0.1:{server.server_address[1]}"))
+    return server, client
+
+
+@pytest.fixture
+def quota():
+    return SlidingWindowQuota(rpm=2, tpm=1_000_000)
+
+
+@pytest.fixture
+def client(quota):
+    server, client = start_server(quota)
+    yield client
+    server.shutdown()
+    server.server_close()
+
+
+def test_stream_generate_content_emits_chunks(client):
+    chunks = [chunk.text for chunk in client.models.generate_content_stream(
+        model="gemini-2.5-flash", contents="vaga")]
+    assert len(chunks) > 1
+    assert "".join(chunks) == JUSTIFICATION
+
+
+def test_stream_generate_content_counts_against_quota(client, quota):
+    client.models.generate_content(model="gemini-2.5-flash", contents="vaga")
+    list(client.models.generate_content_stream(model="gemini-2.5-flash", contents="vaga"))
+
+    with pytest.raises(errors.APIError) as excinfo:
+        list(client.models.generate_content_stream(model="gemini-2.5-flash", contents="vaga"))
+    assert excinfo.value.code == 429
+    assert (quota.accepted, quota.rejected) == (2, 1)
+
+
+def test_quota_rejects_requests_over_rpm():
+    quota = SlidingWindowQuota(rpm=3, tpm=1_000_000)
+    assert [quota.admit(1, 10) for _ in range(4)] == [True, True, True, False]
+    assert quota.admit(2, 10) is False
+    assert (quota.accepted, quota.rejected) == (3, 2)
+
+
+def test_quota_counts_batched_requests_and_tokens():
+    quota = SlidingWindowQuota(rpm=10, tpm=100)
+    assert quota.admit(8, 50)
+    assert not quota.admit(3, 10)
+    assert not quota.admit(1, 51)
+    assert quota.admit(2, 50)
+
+
+def test_quota_window_slides():
+    quota = SlidingWindowQuota(rpm=1, tpm=100, window=0.05)
+    assert quota.admit(1, 100)
+    assert not quota.admit(1, 1)
+    time.sleep(0.06)
+    assert quota.admit(1, 100)
@@ -0,0 +1,115 @@
+import os
+import numpy as np
+import pytest
+
+from shared.similarity import normalize_rows
+from shared.ivf_index import IVFIndex, IVFLists, ivf_search
+
+
+@pytest.fixture
+def vectors():
+    rng = np.random.default_rng(0)
+    return normalize_rows(rng.standard_normal((500, 16), dtype=np.float32))
+
+
+def brute_force(vectors: np.ndarray, query: np.ndarray, k: int) -> list:
+    return np.argsort(-(vectors @ query), kind="stable")[:k].tolist()
+
+
+def generations(path: str) -> list:
+    return sorted(os.listdir(os.path.join(path, IVFIndex.GENERATIONS)))
+
+
+def test_build_partitions_every_row_once(vectors):
+    lists = IVFLists.build(vectors, 8)
+    assert lists.offsets[0] == 0 and lists.offsets[-1] == len(vectors)
+    assert sorted(lists.order.tolist()) == list(range(len(vectors)))
+    for p in range(len(lists.centroids)):
+        rows = lists.order[lists.offsets[p]:lists.offsets[p + 1]]
+        assert (lists.assignments[rows] == p).all()
+
+
+def test_search_probing_every_list_is_exact(vectors):
+    lists = IVFLists.build(vectors, 8)
+    results = ivf_search(vectors[10], vectors, lists, len(vectors), k=10, nprobe=8)
+    assert [row for row, _ in results] == brute_force(vectors, vectors[10], 10)
+    assert results[0][1] == pytest.approx(1.0, abs=1e-5)
+
+
+def test_search_covers_rows_added_after_build(vectors):
+    lists = IVFLists.build(vectors[:400], 8)
+    tail = IVFLists(lists.centroids, lists.order, lists.offsets, np.concatenate(
+        (lists.assignments, np.argmax(vectors[400:] @ lists.centroids.T, axis=1).astype(np.int32))))
+    results = ivf_search(vectors[450], vectors, tail, 400, k=1, nprobe=1)
+    assert results[0][0] == 450
+
+
+def test_search_respects_threshold(vectors):
+    lists = IVFLists.build(vectors, 4)
+    results = ivf_search(vectors[0], vectors, lists, len(vectors), k=10, nprobe=4, threshold=0.99)
+    assert [row for row, _ in results] == [0]
+
+
+def test_save_and_load_roundtrip(tmp_path, vectors):
+    index = IVFIndex(str(tmp_path))
+    lists = IVFLists.build(vectors, 8)
+    index.save(lists, len(vectors))
+
+    meta, loaded = index.load(len(vectors))
+    assert meta["nlist"] == 8 and meta["built_count"] == len(vectors)
+    np.testing.assert_array_equal(loaded.order, lists.order)
+    np.testing.assert_array_equal(loaded.offsets, lists.offsets)
+    np.testing.assert_array_equal(loaded.assignments, lists.assignments)
+
+
+def test_rebuild_writes_new_generation_and_keeps_previous(tmp_path, vectors):
+    index = IVFIndex(str(tmp_path))
+    for nlist in (4, 8, 16):
+        index.save(IVFLists.build(vectors, nlist), len(vectors))
+
+    assert len(generations(str(tmp_path))) == IVFIndex.KEEP_GENERATIONS
+    assert generations(str(tmp_path))[-1] == index.read_meta()["generation"]
+    assert index.load(len(vectors))[0]["nlist"] == 16
+
+
+def test_reader_of_previous_generation_is_not_affected_by_rebuild(tmp_path, vectors):
+    index = IVFIndex(str(tmp_path))
+    index.save(IVFLists.build(vectors, 4), len(vectors))
+    old_meta, old_lists = index.load(len(vectors))
+
+    index.save(IVFLists.build(vectors, 8), len(vectors))
+    results = ivf_search(vectors[5], vectors, old_lists, old_meta["built_count"], k=5, nprobe=4)
+    assert [row for row, _ in results] == brute_force(vectors, vectors[5], 5)
+
+
+def test_load_returns_none_without_pointer_or_with_legacy_layout(tmp_path, vectors):
+    index = IVFIndex(str(tmp_path))
+    assert index.load(len(vectors)) is None
+
+    (tmp_path / IVFIndex.META).write_text('{"nlist": 4, "dim": 16, "built_count": 500}')
+    assert index.load(len(vectors)) is None
+
+
+def test_load_returns_none_when_assignments_lag_behind(tmp_path, vectors):
+    index = IVFIndex(str(tmp_path))
+    index.save(IVFLists.build(vectors[:400], 4), 400)
+    # Store já tem mais linhas do que as atribuições gravadas (inserção ainda em andamento).
+    assert index.load(len(vectors)) is None
+
+
+def test_add_appends_assignments_to_current_generation(tmp_path, vectors):
+    index = IVFIndex(str(tmp_path))
+    index.save(IVFLists.build(vectors[:400], 4), 400)
+    index.add(400, vectors[400:])
+
+    meta, lists = index.load(len(vectors))
+    assert len(lists.assignments) == len(vectors)
+    expected = np.argmax(vectors[400:] @ lists.centroids.T, axis=1)
+    np.testing.assert_array_equal(lists.assignments[400:], expected)
+
+
+def test_save_removes_legacy_files(tmp_path, vectors):
+    for name in IVFIndex.LEGACY_FILES:
+        (tmp_path / name).write_bytes(b"")
+    IVFIndex(str(tmp_path)).save(IVFLists.build(vectors, 4), len(vectors))
+    assert not any((tmp_path / name).exists() for name in IVFIndex.LEGACY_FILES)
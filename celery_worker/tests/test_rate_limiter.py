@@ -0,0 +1,92 @@
+import fakeredis
+import pytest
+
+from services.rate_limiter import AdaptiveConcurrencyLimiter, QuotaLimiter, RedisTokenBucket
+
+
+class Overloaded(Exception):
+    pass
+
+
+@pytest.fixture
+def bucket():
+    return RedisTokenBucket(fakeredis.FakeRedis(), "ratelimit:test")
+
+
+def make_limiter(bucket, rpm=60, tpm=10_000, initial=4):
+    return QuotaLimiter(
+        bucket=bucket,
+        concurrency=AdaptiveConcurrencyLimiter(initial=initial, minimum=1, maximum=8),
+        requests_per_minute=rpm,
+        tokens_per_minute=tpm,
+        is_overload=lambda e: isinstance(e, Overloaded),
+        max_retries=2,
+        backoff=0.001,
+    )
+
+
+def test_bucket_consumes_until_empty_then_suggests_wait(bucket):
+    assert bucket.try_acquire([("requests", 2, 60, 1)]) == 0
+    assert bucket.try_acquire([("requests", 2, 60, 1)]) == 0
+    # Reposição de 1 por segundo: falta ~1 s para a próxima requisição.
+    assert 0 < bucket.try_acquire([("requests", 2, 60, 1)]) <= 1
+
+
+def test_bucket_consumes_all_or_nothing(bucket):
+    assert bucket.try_acquire([("requests", 10, 60, 1), ("tokens", 100, 60, 90)]) == 0
+    # Sem saldo de tokens, a requisição também não é consumida.
+    assert bucket.try_acquire([("requests", 10, 60, 1), ("tokens", 100, 60, 50)]) > 0
+    assert bucket.try_acquire([("requests", 10, 60, 9)]) == 0
+
+
+def test_acquire_gives_up_after_max_wait(bucket):
+    bucket.try_acquire([("tokens", 10, 1, 10)])
+    with pytest.raises(TimeoutError):
+        bucket.acquire([("tokens", 10, 1, 10)], max_wait=0.01)
+
+
+def test_call_retries_on_overload_and_halves_concurrency(bucket):
+    limiter = make_limiter(bucket)
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise Overloaded()
+        return "ok"
+
+    assert limiter.call(flaky, tokens=10) == "ok"
+    assert len(attempts) == 3
+    assert limiter.concurrency.limit < 4
+    assert limiter.concurrency.inflight == 0
+
+
+def test_call_does_not_retry_other_errors(bucket):
+    limiter = make_limiter(bucket)
+    with pytest.raises(ValueError):
+        limiter.call(lambda: (_ for _ in ()).throw(ValueError("erro")), tokens=10)
+    assert limiter.concurrency.limit == 4
+
+
+def test_stream_retries_until_first_chunk(bucket):
+    limiter = make_limiter(bucket)
+    attempts = []
+
+    def stream():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise Overloaded()
+        return iter(["a", "b"])
+
+    assert list(limiter.stream(stream, tokens=10)) == ["a", "b"]
+    assert len(attempts) == 2
+    assert limiter.concurrency.inflight == 0
+
+
+def test_concurrency_grows_with_successes():
+    limiter = AdaptiveConcurrencyLimiter(initial=2, minimum=1, maximum=3)
+    for _ in range(10):
+        limiter.on_success()
+    assert limiter.limit == 3
+    limiter.on_overload()
+    assert limiter.limit == 1.5
@@ -0,0 +1,52 @@
+import pytest
+
+from config import settings
+from services import resume_text
+from services.summary_cache import SummaryCache
+from services.resume_text import chunk_text, estimate_tokens, normalize_pages, summary_config_signature
+
+
+def test_normalize_removes_repeated_headers_but_keeps_the_first():
+    pages = [
+        "Maria Silva - maria@exemplo.com\nExperiência\nEmpresa A\nPágina 1 de 2",
+        "Maria Silva - maria@exemplo.com\nFormação\nUniversidade B\nPágina 2 de 2",
+    ]
+    text = normalize_pages(pages)
+    assert text.count("Maria Silva") == 1
+    assert "Página" in text and text.count("Página") == 1
+    assert "Empresa A" in text and "Universidade B" in text
+
+
+def test_normalize_drops_ocr_noise_and_collapses_whitespace():
+    text = normalize_pages(["Nome:   Maria\t Silva\n|\n-----\n~~~~~\n\n\n\nPython  ........ avançado\nPython  ........ avançado"])
+    assert text == "Nome: Maria Silva\n\nPython avançado"
+
+
+def test_chunk_text_respects_budget_and_keeps_content():
+    paragraphs = [f"Parágrafo {i}: " + "experiência " * 30 for i in range(10)]
+    text = "\n\n".join(paragraphs)
+    chunks = chunk_text(text, 200)
+    assert len(chunks) > 1
+    assert all(estimate_tokens(chunk) <= 200 for chunk in chunks)
+    assert "".join("".join(chunks).split()) == "".join(text.split())
+
+
+def test_chunk_text_splits_oversized_lines():
+    chunks = chunk_text("x" * 4000, 100)
+    assert all(estimate_tokens(chunk) <= 100 for chunk in chunks)
+    assert "".join(chunks) == "x" * 4000
+
+
+def test_short_text_is_a_single_chunk():
+    assert chunk_text("curto", 100) == ["curto"]
+
+
+@pytest.mark.parametrize("change", [
+    lambda monkeypatch: monkeypatch.setattr(resume_text, "NORMALIZATION_VERSION", resume_text.NORMALIZATION_VERSION + 1),
+    lambda monkeypatch: monkeypatch.setattr(settings, "SUMMARY_PROMPT_TOKEN_BUDGET", settings.SUMMARY_PROMPT_TOKEN_BUDGET + 1),
+    lambda monkeypatch: monkeypatch.setattr(settings, "SUMMARY_CHUNK_TOKENS", settings.SUMMARY_CHUNK_TOKENS + 1),
+])
+def test_summary_cache_key_changes_with_summarization_config(monkeypatch, change):
+    before = SummaryCache.make_key("hash", summary_config_signature())
+    change(monkeypatch)
+    assert SummaryCache.make_key("hash", summary_config_signature()) != before
@@ -0,0 +1,33 @@
+import os
+
+from typing import Iterator
+
+
+class BlobLayout:
+    """
+    Layout do blob store local compartilhado entre a API e os workers: os arquivos ficam em
+    root/<2 primeiros caracteres do hash>/<hash> e uploads em andamento em root/staging, de
+    onde só saem para o lugar definitivo via rename.
+    """
+
+    STAGING = "staging"
+
+    def __init__(self, root: str) -> None:
+        self.root = root
+
+    def path(self, file_hash: str) -> str:
+        return os.path.join(self.root, file_hash[:2], file_hash)
+
+    def staging_dir(self) -> str:
+        return os.path.join(self.root, self.STAGING)
+
+    def blob_entries(self) -> Iterator[os.DirEntry]:
+        """Arquivos de blobs gravados, sem os uploads em andamento."""
+        if not os.path.isdir(self.root):
+            return
+        for prefix in os.scandir(self.root):
+            if not prefix.is_dir() or prefix.name == self.STAGING:
+                continue
+            for entry in os.scandir(prefix.path):
+                if entry.is_file():
+                    yield entry
@@ -0,0 +1,234 @@
+import os
+import json
+import time
+import shutil
+import logging
+import numpy as np
+
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+from shared.similarity import normalize_rows, select_top_k
+
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+ASSIGN_CHUNK = 65_536
+
+
+def assign_to_centroids(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Retorna a partição (centroide mais similar) de cada vetor, processando em blocos."""
+    assignments = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), ASSIGN_CHUNK):
+        chunk = np.asarray(vectors[start:start + ASSIGN_CHUNK], dtype=np.float32)
+        assignments[start:start + len(chunk)] = np.argmax(chunk @ centroids.T, axis=1)
+    return assignments
+
+
+def train_centroids(
+    vectors: np.ndarray,
+    nlist: int,
+    iterations: int = 20,
+    sample_size: int = 100_000,
+    seed: int = 0,
+) -> np.ndarray:
+    """K-means esférico: os centroides são renormalizados, já que a busca usa o cosseno."""
+    rng = np.random.default_rng(seed)
+    sample_rows = np.sort(rng.choice(len(vectors), size=min(sample_size, len(vectors)), replace=False))
+    sample = np.asarray(vectors[sample_rows], dtype=np.float32)
+
+    nlist = min(nlist, len(sample))
+    centroids = sample[rng.choice(len(sample), size=nlist, replace=False)].copy()
+
+    for _ in range(iterations):
+        assignments = assign_to_centroids(sample, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, sample)
+        counts = np.bincount(assignments, minlength=nlist)
+
+        # Partições vazias recebem um ponto aleatório para não desperdiçar listas.
+        empty = np.flatnonzero(counts == 0)
+        if len(empty):
+            sums[empty] = sample[rng.choice(len(sample), size=len(empty), replace=False)]
+
+        centroids = normalize_rows(sums)
+
+    return centroids
+
+
+@dataclass
+class IVFLists:
+    centroids: np.ndarray
+    order: np.ndarray
+    offsets: np.ndarray
+    assignments: np.ndarray
+
+    @classmethod
+    def build(cls, vectors: np.ndarray, nlist: int, iterations: int = 20, seed: int = 0) -> "IVFLists":
+        centroids = train_centroids(vectors, nlist, iterations=iterations, seed=seed)
+        assignments = assign_to_centroids(vectors, centroids)
+        order = np.argsort(assignments, kind="stable").astype(np.int64)
+        offsets = np.concatenate(
+            ([0], np.cumsum(np.bincount(assignments, minlength=len(centroids))))).astype(np.int64)
+        return cls(centroids=centroids, order=order, offsets=offsets, assignments=assignments)
+
+
+def ivf_search(
+    query: np.ndarray,
+    vectors: np.ndarray,
+    lists: IVFLists,
+    built_count: int,
+    k: int,
+    nprobe: int,
+    threshold: float = -1.0,
+) -> List[Tuple[int, float]]:
+    """
+    Busca aproximada: compara a query apenas com os vetores das nprobe partições mais
+    próximas. Linhas inseridas depois do último build (>= built_count) são filtradas
+    pela sua atribuição incremental.
+    """
+    count = len(vectors)
+    if count == 0 or k <= 0:
+        return []
+
+    query = normalize_rows(query)[0]
+    nprobe = min(max(nprobe, 1), len(lists.centroids))
+    probe = np.argpartition(-(lists.centroids @ query), nprobe - 1)[:nprobe]
+
+    candidates = [lists.order[lists.offsets[p]:lists.offsets[p + 1]] for p in probe]
+    if count > built_count:
+        tail = np.asarray(lists.assignments[built_count:count])
+        candidates.append(built_count + np.flatnonzero(np.isin(tail, probe)))
+
+    rows = np.sort(np.concatenate(candidates))
+    if len(rows) == 0:
+        return []
+
+    scores = np.asarray(vectors[rows], dtype=np.float32) @ query
+    return [(int(rows[i]), float(scores[i])) for i in select_top_k(scores, k, threshold)]
+
+
+class IVFIndex:
+    """
+    Persistência das listas IVF ao lado do CandidateVectorStore.
+
+    Cada build é gravado em um diretório próprio, ivf/<geração>/, e só passa a valer quando o
+    ponteiro ivf.json é trocado (um único os.replace). Leitores sempre abrem os arquivos da
+    geração indicada pelo ponteiro, então nunca misturam dois builds; a geração anterior é
+    mantida para quem ainda a estiver lendo durante a troca.
+
+    ivf.json                 geração atual, nlist, dimensão e linhas cobertas pelo build
+    ivf/<geração>/
+        centroids.f32        centroides normalizados (nlist x dim)
+        order.i64            ids das linhas agrupados por partição
+        offsets.i64          início de cada partição em order (nlist + 1)
+        assign.i32           partição de cada linha; cresce a cada inserção incremental
+    """
+
+    META = "ivf.json"
+    GENERATIONS = "ivf"
+    CENTROIDS = "centroids.f32"
+    ORDER = "order.i64"
+    OFFSETS = "offsets.i64"
+    ASSIGNMENTS = "assign.i32"
+    # Arquivos do layout anterior, sem gerações, apagados no primeiro build novo.
+    LEGACY_FILES = ("ivf_centroids.f32", "ivf_order.i64", "ivf_offsets.i64", "ivf_assign.i32")
+    KEEP_GENERATIONS = 2
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def _generation_dir(self, generation: str) -> str:
+        return os.path.join(self.path, self.GENERATIONS, generation)
+
+    def _file(self, meta: dict, name: str) -> str:
+        return os.path.join(self._generation_dir(meta["generation"]), name)
+
+    def read_meta(self) -> Optional[dict]:
+        """Ponteiro da geração atual; None sem build (ou com um build do layout anterior)."""
+        try:
+            with open(os.path.join(self.path, self.META)) as f:
+                meta = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        return meta if "generation" in meta else None
+
+    def centroids(self, meta: dict) -> np.ndarray:
+        return np.fromfile(self._file(meta, self.CENTROIDS), dtype=np.float32).reshape(meta["nlist"], meta["dim"])
+
+    def load(self, count: int) -> Optional[Tuple[dict, IVFLists]]:
+        """
+        Abre a geração atual cobrindo `count` linhas. Retorna None se não houver build ou se os
+        arquivos não baterem com o ponteiro (geração removida entre a leitura do ponteiro e a
+        abertura, ou atribuições incrementais ainda não gravadas); o chamador faz busca exaustiva.
+        """
+        meta = self.read_meta()
+        if not meta:
+            return None
+        try:
+            offsets = np.fromfile(self._file(meta, self.OFFSETS), dtype=np.int64)
+            lists = IVFLists(
+                centroids=self.centroids(meta),
+                order=np.memmap(self._file(meta, self.ORDER), dtype=np.int64, mode="r",
+                                shape=(meta["built_count"],)),
+                offsets=offsets,
+                assignments=np.memmap(self._file(meta, self.ASSIGNMENTS), dtype=np.int32, mode="r",
+                                      shape=(count,)),
+            )
+        except (OSError, ValueError) as e:
+            logger.warning(f"Índice IVF de {self.path} indisponível ({e}); usando busca exaustiva")
+            return None
+        if len(offsets) != meta["nlist"] + 1 or offsets[-1] != meta["built_count"]:
+            logger.warning(f"Índice IVF de {self.path} inconsistente; usando busca exaustiva")
+            return None
+        return meta, lists
+
+    @staticmethod
+    def _write_file(path: str, data: bytes) -> None:
+        with open(path, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def save(self, lists: IVFLists, built_count: int) -> None:
+        """Grava um build completo. Deve ser chamado com o lock do store adquirido."""
+        generation = f"{time.time_ns():x}"
+        directory = self._generation_dir(generation)
+        os.makedirs(directory)
+        self._write_file(os.path.join(directory, self.CENTROIDS), lists.centroids.astype(np.float32).tobytes())
+        self._write_file(os.path.join(directory, self.ORDER), lists.order.astype(np.int64).tobytes())
+        self._write_file(os.path.join(directory, self.OFFSETS), lists.offsets.astype(np.int64).tobytes())
+        self._write_file(os.path.join(directory, self.ASSIGNMENTS), lists.assignments.astype(np.int32).tobytes())
+
+        meta_path = os.path.join(self.path, self.META)
+        self._write_file(meta_path + ".tmp", json.dumps({
+            "generation": generation,
+            "nlist": int(len(lists.centroids)),
+            "dim": int(lists.centroids.shape[1]),
+            "built_count": int(built_count),
+        }).encode())
+        os.replace(meta_path + ".tmp", meta_path)
+        self._prune(generation)
+
+    def _prune(self, current: str) -> None:
+        root = os.path.join(self.path, self.GENERATIONS)
+        # Nomes são o relógio em hexadecimal de mesmo tamanho, então a ordem textual é a cronológica.
+        old = [name for name in sorted(os.listdir(root)) if name != current]
+        for name in old[:max(len(old) - (self.KEEP_GENERATIONS - 1), 0)]:
+            shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+        for name in self.LEGACY_FILES:
+            try:
+                os.remove(os.path.join(self.path, name))
+            except FileNotFoundError:
+                pass
+
+    def add(self, start_row: int, vectors: np.ndarray) -> None:
+        """Atribui novas linhas às partições da geração atual (inserção incremental)."""
+        meta = self.read_meta()
+        if not meta:
+            return
+        assignments = assign_to_centroids(vectors, self.centroids(meta))
+        with open(self._file(meta, self.ASSIGNMENTS), "ab") as f:
+            f.truncate(start_row * 4)
+            f.write(assignments.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
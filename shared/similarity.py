@@ -0,0 +1,18 @@
+import numpy as np
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    matrix = np.atleast_2d(np.asarray(matrix, dtype=np.float32))
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def select_top_k(scores: np.ndarray, k: int, threshold: float) -> np.ndarray:
+    """Índices dos k maiores scores acima do threshold, em ordem decrescente de score."""
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    selected = np.flatnonzero(scores >= threshold)
+    if len(selected) > k:
+        selected = selected[np.argpartition(-scores[selected], k - 1)[:k]]
+    return selected[np.argsort(-scores[selected], kind="stable")]